@@ -32,6 +32,8 @@ def main():
         logger.info("Running data pipeline...")
         pipeline = DataPipeline(db_config_path="config/database.yaml")
         df_clean = pipeline.run_pipeline(all_products)
+        # the products are stored now, so the next incremental run may stop at them
+        orchestrator.commit_seen()
 
         logger.info(f"Cleaned DataFrame shape: {df_clean.shape}")
         if df_clean.empty:
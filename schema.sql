@@ -10,6 +10,7 @@ CREATE TABLE IF NOT EXISTS public.products_raw (
     review_count BIGINT,
     url TEXT,
     img_url TEXT,
+    product_key TEXT,
     scraped_at TIMESTAMP DEFAULT NOW()
 );
 
@@ -23,9 +24,32 @@ CREATE TABLE IF NOT EXISTS public.products (
     review_count BIGINT,
     url TEXT NOT NULL,
     img_url TEXT,
+    product_key TEXT,
     scraped_at TIMESTAMP DEFAULT NOW()
 );
 
+ALTER TABLE public.products_raw ADD COLUMN IF NOT EXISTS product_key TEXT;
+ALTER TABLE public.products ADD COLUMN IF NOT EXISTS product_key TEXT;
+CREATE INDEX IF NOT EXISTS ix_products_raw_product_key ON public.products_raw (product_key);
+CREATE INDEX IF NOT EXISTS ix_products_product_key ON public.products (product_key);
+
+CREATE TABLE IF NOT EXISTS public.product_details (
+    id SERIAL PRIMARY KEY,
+    url TEXT NOT NULL,
+    source VARCHAR(255),
+    seller TEXT,
+    shipping TEXT,
+    condition TEXT,
+    availability TEXT,
+    in_stock BOOLEAN,
+    specs JSONB,
+    status VARCHAR(32),
+    enriched_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uix_details_url UNIQUE (url)
+);
+
+CREATE INDEX IF NOT EXISTS ix_product_details_enriched_at ON public.product_details (enriched_at);
+
 CREATE TABLE IF NOT EXISTS public.analysis_summary (
     id SERIAL PRIMARY KEY,
     run_id UUID NOT NULL,
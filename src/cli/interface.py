@@ -1,6 +1,18 @@
 import argparse
 
-from src.pipeline.entrypoints import run_scrapers, process_pipeline, analyze_and_report
+from src.pipeline.entrypoints import (
+    run_scrapers, process_pipeline, analyze_and_report, enqueue_jobs, run_worker, collect_results, show_crawl_plan,
+    replay_pages, enrich_products
+)
+
+# ======================================================================
+# ===============<<<<<>>>>> (MUST INCLUDE) <<<<<>>>>>===================
+from src.scrapers.selenium.amazon_scraper import AmazonSeleniumScraper
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from src.scrapers.static_scraper import MicroCenterStaticScraper
+from src.scrapers.scrapy_crawler.newegg_crawler.spriders.newegg_scrapy import NeweggScrapyScraper
+# ===============<<<<<>>>>> (MUST INCLUDE) <<<<<>>>>>===================
+# ======================================================================
 
 
 def main():
@@ -11,6 +23,14 @@ def main():
     sp_scrape.add_argument("--scrapers-config", default="config/scrapers.yaml")
     sp_scrape.add_argument("--out", default="data_output/raw/products_raw.json")
     sp_scrape.add_argument("--max-workers", type=int, default=4)
+    sp_scrape.add_argument("--schedule", action="store_true",
+                           help="Only recrawl categories that are due, to the depth that still changes")
+    sp_scrape.add_argument("--plan-only", action="store_true", help="Print the recrawl plan and exit")
+    sp_scrape.add_argument("--state", default="data_output/state/recrawl.json", help="Recrawl scheduler state file")
+    sp_scrape.add_argument("--checkpoint-dir", default="data_output/checkpoints",
+                           help="Per-page checkpoints of the crawl")
+    sp_scrape.add_argument("--resume", action="store_true",
+                           help="Continue an interrupted crawl: skip the pages and categories already checkpointed")
 
     sp_process = subparsers.add_parser("process", help="Process raw scraped data and save clean results")
     sp_process.add_argument("--in", dest="input", required=True, help="Input raw JSON file from scrapers")
@@ -22,19 +42,79 @@ def main():
 
     sp_all = subparsers.add_parser("all", help="Run scrapers, process, and analyze all in one go")
 
+    sp_enqueue = subparsers.add_parser("enqueue", help="Distributed mode: enqueue (source, category, page-range) jobs")
+    sp_enqueue.add_argument("--scrapers-config", default="config/scrapers.yaml")
+    sp_enqueue.add_argument("--queue", default="data_output/queue/jobs.sqlite")
+    sp_enqueue.add_argument("--pages-per-job", type=int, default=5)
+
+    sp_worker = subparsers.add_parser("worker", help="Distributed mode: lease and run jobs from the queue")
+    sp_worker.add_argument("--scrapers-config", default="config/scrapers.yaml")
+    sp_worker.add_argument("--queue", default="data_output/queue/jobs.sqlite")
+    sp_worker.add_argument("--results-dir", default="data_output/distributed")
+    sp_worker.add_argument("--worker-id", default=None)
+    sp_worker.add_argument("--visibility-timeout", type=float, default=600)
+    sp_worker.add_argument("--idle-timeout", type=float, default=0,
+                           help="Seconds to keep polling an empty queue before exiting")
+
+    sp_collect = subparsers.add_parser("collect", help="Distributed mode: merge worker results into one raw JSON")
+    sp_collect.add_argument("--results-dir", default="data_output/distributed")
+    sp_collect.add_argument("--out", default="data_output/raw/products_raw.json")
+
+    sp_replay = subparsers.add_parser("replay", help="Re-parse archived raw pages offline (no network)")
+    sp_replay.add_argument("--archive-dir", default="data_output/archive")
+    sp_replay.add_argument("--scrapers-config", default="config/scrapers.yaml")
+    sp_replay.add_argument("--out", default="data_output/raw/products_replay.json")
+    sp_replay.add_argument("--source", default=None)
+    sp_replay.add_argument("--category", default=None)
+    sp_replay.add_argument("--max-workers", type=int, default=None)
+
+    sp_enrich = subparsers.add_parser("enrich", help="Fetch detail pages of stored products into product_details")
+    sp_enrich.add_argument("--scrapers-config", default="config/scrapers.yaml")
+    sp_enrich.add_argument("--db-config", default="config/database.yaml")
+    sp_enrich.add_argument("--max-workers", type=int, default=16)
+    sp_enrich.add_argument("--max-age-hours", type=float, default=72,
+                           help="Skip products enriched more recently than this")
+    sp_enrich.add_argument("--limit", type=int, default=None)
+    sp_enrich.add_argument("--source", action="append", default=None, help="Only this source (repeatable)")
+    sp_enrich.add_argument("--batch-size", type=int, default=200, help="Rows per bulk upsert")
+
     args = parser.parse_args()
 
-    if args.command == "scrape":
-        run_scrapers(scrapers_config=args.scrapers_config, max_workers=args.max_workers, save_path=args.out)
+    if args.command == "scrape" and args.plan_only:
+        show_crawl_plan(scrapers_config=args.scrapers_config, state_path=args.state)
+    elif args.command == "scrape":
+        run_scrapers(scrapers_config=args.scrapers_config, max_workers=args.max_workers, save_path=args.out,
+                     schedule_state=args.state if args.schedule else None, checkpoint_dir=args.checkpoint_dir,
+                     resume=args.resume)
     elif args.command == "process":
         process_pipeline(raw_json_path=args.input, db_config=args.db_config)
     elif args.command == "analyze":
         import pandas as pd
         df_clean = pd.read_json(args.input)
         analyze_and_report(df_clean, output_dir=args.out_dir)
+    elif args.command == "enqueue":
+        enqueue_jobs(scrapers_config=args.scrapers_config, queue_path=args.queue, pages_per_job=args.pages_per_job)
+    elif args.command == "worker":
+        run_worker(scrapers_config=args.scrapers_config, queue_path=args.queue, results_dir=args.results_dir,
+                   worker_id=args.worker_id, visibility_timeout=args.visibility_timeout,
+                   idle_timeout=args.idle_timeout)
+    elif args.command == "collect":
+        collect_results(results_dir=args.results_dir, save_path=args.out)
+    elif args.command == "replay":
+        replay_pages(archive_dir=args.archive_dir, scrapers_config=args.scrapers_config, save_path=args.out,
+                     source=args.source, category=args.category, max_workers=args.max_workers)
+    elif args.command == "enrich":
+        enrich_products(scrapers_config=args.scrapers_config, db_config=args.db_config, max_workers=args.max_workers,
+                        max_age_hours=args.max_age_hours, limit=args.limit, sources=args.source,
+                        batch_size=args.batch_size)
     elif args.command == "all":
-        all_products = run_scrapers()
-        df_clean = process_pipeline(products=all_products)
-        analyze_and_report(df_clean)
+        cleaned = []
+        # seen-url keys are committed once the pipeline has stored the products
+        run_scrapers(persist=lambda products: cleaned.append(process_pipeline(products=products)))
+        analyze_and_report(cleaned[0])
     else:
         parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
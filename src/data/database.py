@@ -1,10 +1,13 @@
 import json
 import math
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pandas as pd
 import psycopg2
-from sqlalchemy import create_engine, Column, Integer, String, Float, UniqueConstraint, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, UniqueConstraint, DateTime, Boolean, JSON, \
+    Index, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -42,6 +45,7 @@ class ProductRaw(Base):
     review_count = Column(Integer, nullable=True)
     url = Column(String, nullable=True)
     img_url = Column(String)
+    product_key = Column(String, index=True)
     scraped_at = Column(DateTime, nullable=True, default=datetime.utcnow())
     __table_args__ = (UniqueConstraint('url', name='uix_url_raw'),)
 
@@ -57,10 +61,33 @@ class Product(Base):
     review_count = Column(Integer)
     url = Column(String, nullable=False)
     img_url = Column(String)
+    product_key = Column(String, index=True)
     scraped_at = Column(DateTime, nullable=True, default=datetime.utcnow())
     __table_args__ = (UniqueConstraint('url', name='uix_url'),)
 
 
+class ProductDetails(Base):
+    __tablename__ = 'product_details'
+    id = Column(Integer, primary_key=True)
+    url = Column(String, nullable=False)
+    source = Column(String)
+    seller = Column(String)
+    shipping = Column(String)
+    condition = Column(String)
+    availability = Column(String)
+    in_stock = Column(Boolean)
+    specs = Column(JSON)
+    status = Column(String)
+    enriched_at = Column(DateTime, nullable=False)
+    __table_args__ = (
+        UniqueConstraint('url', name='uix_details_url'),
+        Index('ix_product_details_enriched_at', 'enriched_at'),
+    )
+
+
+DETAIL_COLUMNS = ("url", "source", "seller", "shipping", "condition", "availability", "in_stock", "specs", "status",
+                  "enriched_at")
+
 _engine = None
 _Session = None
 _db_params = {}
@@ -128,10 +155,20 @@ def init_db_with_sql(schema_path="schema.sql"):
         raise
 
 
+def _find_existing(session, model, p):
+    """
+    the stored row for a product: same product_key (same item behind another URL) or same URL
+    """
+    key = p.get('product_key')
+    if key:
+        return session.query(model).filter(or_(model.product_key == key, model.url == p.get('url'))).first()
+    return session.query(model).filter_by(url=p.get('url')).first()
+
+
 def save_products_raw(products):
     """
     Saves a list of raw products to the products_raw table.
-    Skips products that already exist (by URL).
+    Skips products that already exist (by product_key when set, else by URL).
 
     Args:
         products (list): List of product dicts or objects.
@@ -145,7 +182,7 @@ def save_products_raw(products):
         p = prod.__dict__ if hasattr(prod, "__dict__") else prod
         p = sanitize_dict_for_db(p)
         try:
-            existing = session.query(ProductRaw).filter_by(url=p.get('url')).first()
+            existing = _find_existing(session, ProductRaw, p)
             if not existing:
                 product_obj = ProductRaw(**p)
                 session.add(product_obj)
@@ -187,7 +224,7 @@ def load_products_raw(as_dataframe=True):
 def save_products(products):
     """
     Saves a list of cleaned products to the products table.
-    Skips products that already exist (by URL).
+    Skips products that already exist (by product_key when set, else by URL).
 
     Args:
         products (list): List of product dicts or objects.
@@ -201,7 +238,7 @@ def save_products(products):
         p = prod.__dict__ if hasattr(prod, "__dict__") else prod
         p = sanitize_dict_for_db(p)
         try:
-            existing = session.query(Product).filter_by(url=p.get('url')).first()
+            existing = _find_existing(session, Product, p)
             if not existing:
                 product_obj = Product(**p)
                 session.add(product_obj)
@@ -240,6 +277,95 @@ def load_products(as_dataframe=True):
     return df.to_dict(orient='records')
 
 
+def ensure_details_table():
+    """
+    Creates the product_details table when missing, without running schema.sql (which resets products).
+    """
+    if _engine is None:
+        logger.error("config not loaded")
+        raise Exception("db engine not configured.")
+    ProductDetails.__table__.create(_engine, checkfirst=True)
+
+
+def load_enrichment_targets(sources=None, max_age_hours=72, limit=None):
+    """
+    Lists the products whose detail page was never enriched or was enriched more than
+    max_age_hours ago, never-enriched ones first.
+
+    Args:
+        sources (list, optional): Only these sources.
+        max_age_hours (float): Details younger than this are skipped.
+        limit (int, optional): At most this many targets.
+
+    Returns:
+        list: {'source', 'url'} dicts.
+    """
+    if _Session is None:
+        logger.error("Sessionmaker not configured! Call configure_engine() first.")
+        raise Exception("Database session not configured.")
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    session = _Session()
+    try:
+        q = (session.query(Product.source, Product.url)
+             .outerjoin(ProductDetails, ProductDetails.url == Product.url)
+             .filter(or_(ProductDetails.id.is_(None), ProductDetails.enriched_at < cutoff))
+             .order_by(ProductDetails.enriched_at.asc().nulls_first()))
+        if sources:
+            q = q.filter(Product.source.in_(list(sources)))
+        if limit:
+            q = q.limit(limit)
+        targets = [{"source": source, "url": url} for source, url in q]
+    finally:
+        session.close()
+    logger.info(f"Found {len(targets)} products to enrich (details older than {max_age_hours}h or missing).")
+    return targets
+
+
+def upsert_product_details(rows, chunk_size=500):
+    """
+    Inserts or updates product_details rows by url, one multi-row INSERT ... ON CONFLICT per chunk.
+
+    Args:
+        rows (list): Dicts with the DETAIL_COLUMNS keys (missing keys are stored as NULL).
+        chunk_size (int): Rows per statement.
+
+    Returns:
+        int: Rows written.
+    """
+    if _Session is None:
+        logger.error("Sessionmaker not configured!")
+        raise Exception("db session not configured.")
+    # one row per url: ON CONFLICT cannot touch the same row twice in one statement
+    by_url = {}
+    for row in rows:
+        row = sanitize_dict_for_db({col: row.get(col) for col in DETAIL_COLUMNS})
+        row["enriched_at"] = row["enriched_at"] or datetime.utcnow()
+        by_url[row["url"]] = row
+    rows = list(by_url.values())
+    if not rows:
+        return 0
+    session = _Session()
+    insert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+    table = ProductDetails.__table__
+    try:
+        for start in range(0, len(rows), chunk_size):
+            stmt = insert(table).values(rows[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["url"],
+                set_={col: stmt.excluded[col] for col in DETAIL_COLUMNS if col != "url"},
+            )
+            session.execute(stmt)
+        session.commit()
+    except Exception as e:
+        logger.error(f"Upserting product details failed: {e}")
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    logger.info(f"Upserted {len(rows)} product details.")
+    return len(rows)
+
+
 def convert_tuple_keys_to_str(obj):
     """
     Converts tuple dict keys to underscore-joined strings (recursively).
@@ -14,3 +14,4 @@ class Product:
     url: str
     img_url: Optional[str]
     scraped_at: Optional[datetime]
+    product_key: Optional[str] = None
@@ -13,7 +13,7 @@ class ProductDataProcessor:
             - Converts 'price', 'rating', and 'review_count' columns to numeric types.
             - Fills missing 'review_count' with zero.
             - Converts 'source' and 'category' to lowercase (if present).
-            - Removes duplicate URLs.
+            - Removes duplicate URLs and duplicate product keys (same item under several URLs).
             - Resets the DataFrame index.
 
         Returns:
@@ -30,6 +30,8 @@ class ProductDataProcessor:
         if 'category' in self.df:
             self.df['category'] = self.df['category'].str.lower()
         self.df = self.df.drop_duplicates(subset=['url'])
+        if 'product_key' in self.df:
+            self.df = self.df[~self.df['product_key'].fillna(self.df['url']).duplicated()]
         self.df = self.df.reset_index(drop=True)
         return self
 
@@ -0,0 +1,231 @@
+import json
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+MAGIC = b"PBT1"
+_LEN = struct.Struct("<Q")
+_INT64_MIN, _INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def _column_kind(values):
+    """
+    Picks the most compact encoding that round-trips every value of a column exactly.
+    """
+    kinds = set()
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, bool):
+            return "obj"
+        if isinstance(v, int):
+            if not _INT64_MIN <= v <= _INT64_MAX:
+                return "obj"
+            kinds.add("int")
+        elif isinstance(v, float):
+            kinds.add("float")
+        elif isinstance(v, str):
+            kinds.add("str")
+        else:
+            return "obj"
+        if len(kinds) > 1:
+            return "obj"
+    return kinds.pop() if kinds else "null"
+
+
+def _encode_strings(values):
+    encoded = [v.encode("utf-8") if v is not None else b"" for v in values]
+    lengths = np.fromiter((len(e) for e in encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    dtype = np.int32 if offsets[-1] <= np.iinfo(np.int32).max else np.int64
+    return offsets.astype(dtype).tobytes(), b"".join(encoded), np.dtype(dtype).str
+
+
+def _decode_strings(offsets_buf, data_buf, dtype, n):
+    offsets = np.frombuffer(offsets_buf, dtype=dtype).tolist()
+    data = bytes(data_buf)
+    return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n)]
+
+
+def encode_products(products, compress=True):
+    """
+    Encodes a list of product dicts into one compact columnar blob.
+
+    Layout: MAGIC, uint64 header length, JSON header, then the column buffers in header order
+    (zlib-compressed as one body by default). Strings are stored as one UTF-8 buffer plus
+    offsets, repetitive strings (source, category, ...) as a dictionary plus small integer codes,
+    numbers as packed int64/float64 arrays, and None/missing keys as bit masks. A page of
+    products therefore costs a handful of contiguous buffers instead of one pickled object
+    graph per product.
+
+    Args:
+        products (list): Product dicts (values may be str, int, float or None).
+        compress (bool): Compress the column buffers with zlib (level 1).
+
+    Returns:
+        bytes: Encoded batch, see decode_products().
+    """
+    names = []
+    seen = set()
+    for product in products:
+        for key in product:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+
+    header = {"n": len(products), "columns": []}
+    buffers = []
+    for name in names:
+        present = np.fromiter((name in p for p in products), dtype=bool, count=len(products))
+        values = [p.get(name) for p in products]
+        kind = _column_kind(values)
+        column = {"name": name, "kind": kind, "buffers": []}
+
+        if not present.all():
+            column["present"] = True
+            buffers.append(np.packbits(present).tobytes())
+            column["buffers"].append(len(buffers[-1]))
+
+        if kind == "obj":
+            buffers.append(pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL))
+            column["buffers"].append(len(buffers[-1]))
+        elif kind != "null":
+            nulls = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+            if nulls.any():
+                column["nulls"] = True
+                buffers.append(np.packbits(nulls).tobytes())
+                column["buffers"].append(len(buffers[-1]))
+            if kind == "str":
+                uniques = list(dict.fromkeys(v for v in values if v is not None))
+                if len(uniques) <= len(values) // 2 and len(uniques) <= np.iinfo(np.uint16).max:
+                    column["kind"] = kind = "dict"
+                    codes = {v: i for i, v in enumerate(uniques)}
+                    code_dtype = np.uint8 if len(uniques) <= np.iinfo(np.uint8).max else np.uint16
+                    column["codes"] = np.dtype(code_dtype).str
+                    column["size"] = len(uniques)
+                    buffers.append(np.array([codes.get(v, 0) for v in values], dtype=code_dtype).tobytes())
+                    column["buffers"].append(len(buffers[-1]))
+                    values = uniques
+                offsets, data, offsets_dtype = _encode_strings(values)
+                column["offsets"] = offsets_dtype
+                buffers.append(offsets)
+                column["buffers"].append(len(buffers[-1]))
+                buffers.append(data)
+                column["buffers"].append(len(buffers[-1]))
+            else:
+                dtype = np.int64 if kind == "int" else np.float64
+                fill = 0 if kind == "int" else np.nan
+                array = np.array([fill if v is None else v for v in values], dtype=dtype)
+                buffers.append(array.tobytes())
+                column["buffers"].append(len(buffers[-1]))
+        header["columns"].append(column)
+
+    body = b"".join(buffers)
+    if compress:
+        header["compressed"] = True
+        body = zlib.compress(body, 1)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return b"".join([MAGIC, _LEN.pack(len(header_bytes)), header_bytes, body])
+
+
+def decode_products(blob):
+    """
+    Decodes a blob produced by encode_products() back into a list of product dicts.
+    """
+    if blob[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not an encoded product batch.")
+    pos = len(MAGIC)
+    (header_len,) = _LEN.unpack_from(blob, pos)
+    pos += _LEN.size
+    header = json.loads(blob[pos:pos + header_len].decode("utf-8"))
+    pos += header_len
+    n = header["n"]
+    body = blob[pos:]
+    if header.get("compressed"):
+        body = zlib.decompress(body)
+    view = memoryview(body)
+    pos = 0
+    records = [{} for _ in range(n)]
+
+    for column in header["columns"]:
+        sizes = iter(column["buffers"])
+
+        def take():
+            nonlocal pos
+            size = next(sizes)
+            chunk = view[pos:pos + size]
+            pos += size
+            return chunk
+
+        present = np.unpackbits(np.frombuffer(take(), dtype=np.uint8), count=n).astype(bool).tolist() \
+            if column.get("present") else None
+        kind = column["kind"]
+        if kind == "null":
+            values = [None] * n
+        elif kind == "obj":
+            values = pickle.loads(take())
+        else:
+            nulls = np.unpackbits(np.frombuffer(take(), dtype=np.uint8), count=n).astype(bool) \
+                if column.get("nulls") else np.zeros(n, dtype=bool)
+            nulls = nulls.tolist()
+            if kind == "str":
+                strings = _decode_strings(take(), take(), column["offsets"], n)
+                values = [None if nulls[i] else strings[i] for i in range(n)]
+            elif kind == "dict":
+                codes = np.frombuffer(take(), dtype=column["codes"]).tolist()
+                uniques = _decode_strings(take(), take(), column["offsets"], column["size"])
+                values = [None if nulls[i] else uniques[codes[i]] for i in range(n)]
+            else:
+                array = np.frombuffer(take(), dtype=np.int64 if kind == "int" else np.float64).tolist()
+                values = [None if nulls[i] else array[i] for i in range(n)]
+
+        name = column["name"]
+        for i, record in enumerate(records):
+            if present is None or present[i]:
+                record[name] = values[i]
+    return records
+
+
+def iter_encoded_chunks(products, chunk_size=500):
+    """
+    Yields encoded blobs of at most chunk_size products each.
+    """
+    for start in range(0, len(products), chunk_size):
+        yield encode_products(products[start:start + chunk_size])
+
+
+def spill_chunks(chunks, spill_dir=None):
+    """
+    Writes encoded chunks into one length-prefixed temp file and returns its path,
+    so a worker process can hand back a file name instead of the data itself.
+    """
+    if spill_dir:
+        os.makedirs(spill_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix="products-", suffix=".pbt", dir=spill_dir)
+    with os.fdopen(fd, "wb") as f:
+        for chunk in chunks:
+            f.write(_LEN.pack(len(chunk)))
+            f.write(chunk)
+    return path
+
+
+def iter_spilled_chunks(path, remove=True):
+    """
+    Yields the encoded chunks stored by spill_chunks(), deleting the file afterwards by default.
+    """
+    try:
+        with open(path, "rb") as f:
+            while True:
+                prefix = f.read(_LEN.size)
+                if not prefix:
+                    break
+                (size,) = _LEN.unpack(prefix)
+                yield f.read(size)
+    finally:
+        if remove and os.path.exists(path):
+            os.remove(path)
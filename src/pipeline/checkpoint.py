@@ -0,0 +1,172 @@
+import json
+import os
+import re
+import threading
+import time
+
+from src.utils.logger import get_logger
+
+logger = get_logger("checkpoint")
+
+
+class CheckpointStore:
+    """
+    Crash-safe per-page progress of a crawl.
+
+    Every parsed page is appended (and fsynced) to a JSONL segment per (source, category), then a
+    small state file records the last completed page, the next-page URL when the scraper knows it,
+    and whether the category finished. A page therefore only counts as completed once its products
+    are on disk, and a crash loses at most the page in flight.
+
+    With resume=True, completed categories are served from their segments without scraping, and
+    interrupted ones replay their stored pages and continue at the next page. Without it, a
+    category's old checkpoint is discarded when it starts.
+
+    Typical usage:
+        store = CheckpointStore("data_output/checkpoints", resume=True)
+        for page, products in store.iter_pages("amazon", "laptops",
+                                               lambda start: scraper.iter_pages(url, start_page=start)):
+            ...
+
+    Args:
+        checkpoint_dir (str): Directory holding <source>/<category>.jsonl and .state.json files.
+        resume (bool): Continue from existing checkpoints instead of starting over.
+    """
+
+    def __init__(self, checkpoint_dir, resume=False):
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+        self._lock = threading.Lock()
+
+    def _paths(self, source, category):
+        name = re.sub(r"[^\w.-]", "_", str(category))
+        directory = os.path.join(self.checkpoint_dir, str(source))
+        return os.path.join(directory, f"{name}.jsonl"), os.path.join(directory, f"{name}.state.json")
+
+    def state(self, source, category):
+        """
+        Returns {'last_page', 'next_url', 'done', 'products', 'updated'} of a category.
+        """
+        _, state_path = self._paths(source, category)
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"last_page": 0, "next_url": None, "done": False, "products": 0, "updated": None}
+
+    def _write_state(self, source, category, state):
+        _, state_path = self._paths(source, category)
+        state["updated"] = time.time()
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_path)
+
+    def reset(self, source, category):
+        """
+        Discards the checkpoint of a category.
+        """
+        for path in self._paths(source, category):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def record_page(self, source, category, page, products, next_url=None):
+        """
+        Appends one parsed page and marks it completed.
+        """
+        segment_path, _ = self._paths(source, category)
+        line = json.dumps({"page": page, "products": products}, ensure_ascii=False, default=str)
+        with self._lock:
+            os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+            with open(segment_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            state = self.state(source, category)
+            state["last_page"] = max(state["last_page"], page)
+            state["next_url"] = next_url
+            state["products"] += len(products)
+            self._write_state(source, category, state)
+
+    def mark_done(self, source, category):
+        """
+        Marks a category as finished, so a resumed run does not scrape it again.
+        """
+        with self._lock:
+            state = self.state(source, category)
+            state["done"] = True
+            state["next_url"] = None
+            os.makedirs(os.path.dirname(self._paths(source, category)[1]), exist_ok=True)
+            self._write_state(source, category, state)
+
+    def completed_pages(self, source, category):
+        """
+        Yields (page, products) of the completed pages, in the order they were recorded.
+        Lines past the last completed page (a crash between the two writes) are ignored.
+        """
+        segment_path, _ = self._paths(source, category)
+        last_page = self.state(source, category)["last_page"]
+        if not os.path.exists(segment_path):
+            return
+        seen_pages = set()
+        with open(segment_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping truncated checkpoint line in {segment_path}")
+                    continue
+                if entry["page"] > last_page or entry["page"] in seen_pages:
+                    continue
+                seen_pages.add(entry["page"])
+                yield entry["page"], entry["products"]
+
+    def iter_pages(self, source, category, scrape_pages):
+        """
+        Yields (page, products) for a category, checkpointing each scraped page.
+
+        Args:
+            source (str): Scraper name.
+            category (str): Category name.
+            scrape_pages (callable): scrape_pages(start_page) -> iterator of (page, products); only
+                called when there is something left to scrape.
+        """
+        start_page = 1
+        if self.resume:
+            state = self.state(source, category)
+            yield from self.completed_pages(source, category)
+            if state["done"]:
+                logger.info(f"[{source}/{category}] Already completed, {state['products']} products from checkpoint.")
+                return
+            start_page = state["last_page"] + 1
+            if start_page > 1:
+                logger.info(f"[{source}/{category}] Resuming at page {start_page}.")
+        else:
+            self.reset(source, category)
+        for page, products in scrape_pages(start_page):
+            self.record_page(source, category, page, products)
+            yield page, products
+        self.mark_done(source, category)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_checkpoint_store(config=None):
+    """
+    Returns the process-wide CheckpointStore for a 'checkpoint' config section, or None when disabled.
+    """
+    config = config or {}
+    if not config.get("enabled"):
+        return None
+    checkpoint_dir = config.get("dir", "data_output/checkpoints")
+    resume = bool(config.get("resume"))
+    key = (os.path.abspath(checkpoint_dir), resume)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = CheckpointStore(checkpoint_dir, resume=resume)
+        return store
@@ -0,0 +1,423 @@
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import closing
+from dataclasses import dataclass, asdict
+from functools import partial
+
+from src.pipeline.checkpoint import get_checkpoint_store
+from src.pipeline.parse_pool import close_parse_pool, get_parse_pool
+from src.scrapers.factory import ScraperFactory
+from src.scrapers.seen_filter import commit_staged, reset_seen_runs
+from src.utils.config import ConfigLoader
+from src.utils.executor import commit_seen, new_scraper, stage_seen
+from src.utils.logger import get_logger
+
+logger = get_logger("distributed")
+
+
+@dataclass
+class ScrapeJob:
+    """
+    One unit of distributed work: a page range of one (source, category).
+    """
+    source: str
+    category: str
+    path: str
+    start_page: int
+    end_page: int
+    job_id: int = None
+    attempts: int = 0
+
+
+class JobQueue(ABC):
+    """
+    Pluggable job queue used by the coordinator and the workers.
+
+    Leased jobs become visible again once their visibility timeout expires,
+    so jobs held by a crashed worker are eventually picked up by another one.
+    """
+
+    @abstractmethod
+    def enqueue(self, jobs):
+        """
+        adds jobs to the queue, returns the number of jobs enqueued
+        """
+        pass
+
+    @abstractmethod
+    def lease(self, worker_id, visibility_timeout, max_attempts=None):
+        """
+        leases the next available job for worker_id, returns a ScrapeJob or None.
+        Expired leases that already used max_attempts are marked failed instead of leased again.
+        """
+        pass
+
+    @abstractmethod
+    def extend(self, job_id, worker_id, visibility_timeout):
+        """
+        pushes the lease deadline of a job forward while it is still being worked on
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, job_id, worker_id):
+        """
+        marks a leased job as done
+        """
+        pass
+
+    @abstractmethod
+    def fail(self, job_id, worker_id, error, max_attempts=3):
+        """
+        releases a failed job back to the queue, or marks it failed after max_attempts
+        """
+        pass
+
+    @abstractmethod
+    def stats(self):
+        """
+        returns a dict of job counts per status
+        """
+        pass
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    SQLite-backed job queue for local runs and tests.
+
+    Several worker processes (or nodes sharing the file over a network mount) may use
+    the same database; leases are taken inside an IMMEDIATE transaction so a job is
+    handed to exactly one worker at a time.
+
+    Args:
+        path (str): Path to the SQLite database file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrape_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    start_page INTEGER NOT NULL,
+                    end_page INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_scrape_jobs_status ON scrape_jobs (status, lease_expires)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, jobs):
+        now = time.time()
+        rows = [(j.source, j.category, j.path, j.start_page, j.end_page, now) for j in jobs]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO scrape_jobs (source, category, path, start_page, end_page, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        logger.info(f"Enqueued {len(rows)} jobs into {self.path}")
+        return len(rows)
+
+    def lease(self, worker_id, visibility_timeout, max_attempts=None):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if max_attempts is not None:
+                # the worker holding these crashed or hung on every attempt
+                conn.execute(
+                    "UPDATE scrape_jobs SET status = 'failed', lease_owner = NULL, lease_expires = NULL, "
+                    "error = 'lease expired after ' || attempts || ' attempts', updated_at = ? "
+                    "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                    (now, now, max_attempts),
+                )
+            row = conn.execute(
+                "SELECT * FROM scrape_jobs "
+                "WHERE status = 'pending' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE scrape_jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + visibility_timeout, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return ScrapeJob(
+            source=row["source"],
+            category=row["category"],
+            path=row["path"],
+            start_page=row["start_page"],
+            end_page=row["end_page"],
+            job_id=row["id"],
+            attempts=row["attempts"] + 1,
+        )
+
+    def extend(self, job_id, worker_id, visibility_timeout):
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "UPDATE scrape_jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (time.time() + visibility_timeout, time.time(), job_id, worker_id),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_id, worker_id):
+        with closing(self._connect()) as conn:
+            cur = conn.execute(
+                "UPDATE scrape_jobs SET status = 'done', lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ?",
+                (time.time(), job_id, worker_id),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id, worker_id, error, max_attempts=3):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT attempts FROM scrape_jobs WHERE id = ?", (job_id,)).fetchone()
+            status = "failed" if row is not None and row["attempts"] >= max_attempts else "pending"
+            conn.execute(
+                "UPDATE scrape_jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, error = ?, "
+                "updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (status, str(error), time.time(), job_id, worker_id),
+            )
+        return status
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM scrape_jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+class FileResultStore:
+    """
+    Shared result storage: one JSONL file per finished job under results_dir.
+
+    Files are written to a temporary name and renamed into place, so readers never
+    see partial results and a re-run of the same job simply overwrites its file.
+
+    Args:
+        results_dir (str): Directory shared by all workers (local disk or network mount).
+    """
+
+    def __init__(self, results_dir):
+        self.results_dir = results_dir
+        os.makedirs(results_dir, exist_ok=True)
+
+    def write(self, job, products):
+        directory = os.path.join(self.results_dir, job.source, job.category)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"job-{job.job_id}.jsonl")
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for product in products:
+                f.write(json.dumps(product, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+    def iter_products(self):
+        """
+        Yields every stored product dict.
+        """
+        for root, _, files in os.walk(self.results_dir):
+            for name in sorted(files):
+                if not name.endswith(".jsonl"):
+                    continue
+                with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+
+
+class Coordinator:
+    """
+    Splits every configured (source, category) into page-range jobs and enqueues them.
+
+    Args:
+        scrapers_config_path (str): Path to the scrapers YAML config.
+        job_queue (JobQueue): Queue backend to fill.
+    """
+
+    def __init__(self, scrapers_config_path, job_queue):
+        self.scrapers_config = ConfigLoader(scrapers_config_path)
+        self.job_queue = job_queue
+
+    def plan_jobs(self, pages_per_job=5):
+        """
+        Returns the list of ScrapeJobs covering all registered scrapers and categories.
+
+        Scrapy scrapers get one job per category, since the spider follows its own pagination.
+        """
+        jobs = []
+        for name in ScraperFactory.available_scrapers():
+            config = self.scrapers_config.get_config(name)
+            scraper_cls = ScraperFactory._registry.get(name)
+            if not config or not scraper_cls:
+                continue
+            max_pages = config.get("max_pages", 1)
+            step = max_pages if getattr(scraper_cls, "is_scrapy", False) else max(1, pages_per_job)
+            for category, path in config.get("categories", {}).items():
+                for start in range(1, max_pages + 1, step):
+                    jobs.append(ScrapeJob(name, category, path, start, min(start + step - 1, max_pages)))
+        return jobs
+
+    def enqueue_all(self, pages_per_job=5):
+        jobs = self.plan_jobs(pages_per_job)
+        return self.job_queue.enqueue(jobs)
+
+
+def _run_scrapy_job(source, config, urls):
+    """
+    returns (products, staged seen-url keys) of a Scrapy crawl run in a fresh process
+    """
+    scraper = ScraperFactory._registry[source](config, checkpoint=get_checkpoint_store(config.get("checkpoint")))
+    products = scraper.scrape(urls)
+    seen_staged = []
+    stage_seen(scraper, seen_staged)
+    return products, seen_staged
+
+
+class DistributedWorker:
+    """
+    Leases jobs from a JobQueue, runs the registered ScraperFactory scraper for the
+    job's page range and pushes the products to the shared result store.
+
+    Args:
+        scrapers_config_path (str): Path to the scrapers YAML config.
+        job_queue (JobQueue): Queue backend to lease jobs from.
+        result_store (FileResultStore): Shared storage for job results.
+        worker_id (str, optional): Unique worker name; defaults to host-pid.
+        visibility_timeout (float): Seconds a lease stays valid without being extended.
+        max_attempts (int): Attempts before a job is marked failed.
+    """
+
+    def __init__(self, scrapers_config_path, job_queue, result_store, worker_id=None,
+                 visibility_timeout=600, max_attempts=3):
+        self.scrapers_config = ConfigLoader(scrapers_config_path)
+        self.job_queue = job_queue
+        self.result_store = result_store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    def _result_with_heartbeat(self, job, future):
+        """
+        waits for a job running in another process, extending its lease while it runs
+        """
+        interval = max(0.1, self.visibility_timeout / 3)
+        while True:
+            try:
+                return future.result(timeout=interval)
+            except FutureTimeoutError:
+                self.job_queue.extend(job.job_id, self.worker_id, self.visibility_timeout)
+
+    def run_job(self, job, persist=None):
+        """
+        Runs one job and returns its products annotated with source and category.
+
+        persist(products), when given, stores them before the scraper commits its seen-url keys,
+        so a job that fails before its results are stored is scraped in full when retried.
+        """
+        config = dict(self.scrapers_config.get_config(job.source))
+        scraper_cls = ScraperFactory._registry.get(job.source)
+        if not scraper_cls:
+            raise ValueError(f"Scraper '{job.source}' is not registered.")
+        url = config["base_url"] + job.path
+        products = []
+        reset_seen_runs()
+
+        if getattr(scraper_cls, "is_scrapy", False):
+            config["categories"] = {job.category: job.path}
+            config["max_pages"] = job.end_page
+            # the Twisted reactor cannot be restarted, so every Scrapy job gets a fresh process;
+            # its seen-url keys come back staged and are committed here once the products are stored
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(_run_scrapy_job, job.source, config, [url])
+                products, seen_staged = self._result_with_heartbeat(job, future)
+            self._annotate(job, products)
+            if persist is not None:
+                persist(products)
+            commit_staged(seen_staged)
+            return products
+
+        parse_pool = get_parse_pool(config.get("parse_pool"))
+        scraper = new_scraper(scraper_cls, {**config, "category": job.category}, parse_pool)
+        try:
+            for page, items in scraper.iter_pages(url, max_pages=job.end_page, start_page=job.start_page):
+                products.extend(items)
+                self.job_queue.extend(job.job_id, self.worker_id, self.visibility_timeout)
+            self._annotate(job, products)
+            if persist is not None:
+                persist(products)
+            commit_seen(scraper)
+        finally:
+            scraper.close()
+        return products
+
+    @staticmethod
+    def _annotate(job, products):
+        for product in products:
+            product["source"] = job.source
+            product["category"] = job.category
+        return products
+
+    def run(self, max_jobs=None, idle_timeout=0, poll_interval=5):
+        """
+        Processes jobs until the queue is drained (after waiting idle_timeout seconds)
+        or max_jobs jobs were handled. Returns the number of jobs completed.
+        """
+        completed = 0
+        idle_since = time.monotonic()
+        try:
+            while max_jobs is None or completed < max_jobs:
+                job = self.job_queue.lease(self.worker_id, self.visibility_timeout, self.max_attempts)
+                if job is None:
+                    if time.monotonic() - idle_since >= idle_timeout:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                logger.info(f"[{self.worker_id}] Leased job {job.job_id}: {asdict(job)}")
+                try:
+                    products = self.run_job(job, persist=partial(self.result_store.write, job))
+                    self.job_queue.complete(job.job_id, self.worker_id)
+                    completed += 1
+                    logger.info(f"[{self.worker_id}] Job {job.job_id} done ({len(products)} products) "
+                                f"-> {self.result_store.results_dir}")
+                except Exception as e:
+                    status = self.job_queue.fail(job.job_id, self.worker_id, e, self.max_attempts)
+                    logger.error(f"[{self.worker_id}] Job {job.job_id} failed ({status}): {e}", exc_info=True)
+                idle_since = time.monotonic()
+        finally:
+            close_parse_pool()
+        return completed
@@ -0,0 +1,197 @@
+import random
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from itertools import zip_longest
+from urllib.parse import urljoin
+
+import requests
+
+from src.data import database
+from src.scrapers.details import DETAIL_EXTRACTORS, extract_details
+from src.scrapers.http_session import acquire_session, release_session
+from src.scrapers.parser_backend import get_backend
+from src.utils.concurrency import get_controller
+from src.utils.logger import get_logger
+from src.utils.resilience import FAILURE_STATUSES, get_breaker, parse_retry_after
+
+logger = get_logger("enrichment")
+
+OK = "ok"
+GONE = "gone"
+GONE_STATUSES = {404, 410}
+
+
+def interleave(targets):
+    """
+    Reorders targets round-robin over their sources, so the fetch threads spread over all
+    domains instead of queueing behind one domain's in-flight limit.
+    """
+    by_source = defaultdict(list)
+    for target in targets:
+        by_source[target["source"]].append(target)
+    for group in zip_longest(*by_source.values()):
+        yield from (target for target in group if target is not None)
+
+
+class _Site:
+    """
+    Per-source fetch state: pooled session, in-flight limiter and the domain's circuit breaker.
+    """
+
+    def __init__(self, source, config):
+        enrichment = config.get("enrichment") or {}
+        self.base_url = config.get("base_url", "")
+        self.session = acquire_session(f"{source}-details", config.get("http_session"),
+                                       max_retries=config.get("max_retries", 3))
+        self.session.headers["User-Agent"] = random.choice(config.get("user_agents") or ["Mozilla/5.0"])
+        self.concurrency = get_controller(f"{source}-details",
+                                          enrichment.get("concurrency") or config.get("concurrency"))
+        self.breaker = get_breaker(self.base_url or source, config.get("resilience"))
+
+
+class EnrichmentCrawler:
+    """
+    Second-stage crawler that visits the detail pages of scraped products.
+
+    Search result cards carry no specs, seller, shipping or stock, and detail pages outnumber
+    search pages many times over, so this stage is built for throughput: plain pooled HTTP
+    requests on a shared thread pool, an AIMD in-flight limit per source (the sources' own
+    `enrichment.concurrency` section) and the per-domain circuit breaker. Targets are
+    interleaved across sources so threads never pile up behind one domain. Pages are parsed by
+    the per-site extractors in src.scrapers.details and written through bulk upserts of
+    batch_size rows. Pages that are gone (404/410) are stored with status 'gone' so they are
+    skipped until the refresh age passes; failed fetches are not stored and are retried next run.
+
+    Typical usage:
+        crawler = EnrichmentCrawler(ConfigLoader("config/scrapers.yaml").config)
+        stats = crawler.run(database.load_enrichment_targets(max_age_hours=72))
+
+    Args:
+        scrapers_config (dict): All scraper config sections by source name.
+        max_workers (int): Fetch threads shared by all sources.
+        batch_size (int): Detail rows buffered before one bulk upsert.
+        timeout (float): HTTP timeout in seconds.
+        save (callable, optional): save(rows) bulk writer (database.upsert_product_details by default).
+        parser (str, optional): Parser backend name.
+    """
+
+    def __init__(self, scrapers_config, max_workers=16, batch_size=200, timeout=20, save=None, parser=None):
+        self.scrapers_config = scrapers_config
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.save = save or database.upsert_product_details
+        self.backend = get_backend(parser)
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def enabled_sources(self):
+        """
+        Sources with a detail extractor whose enrichment section is not disabled.
+        """
+        return [name for name, config in self.scrapers_config.items()
+                if name in DETAIL_EXTRACTORS and isinstance(config, dict)
+                and (config.get("enrichment") or {}).get("enabled", True)]
+
+    def _site(self, source):
+        with self._lock:
+            site = self._sites.get(source)
+            if site is None:
+                site = self._sites[source] = _Site(source, self.scrapers_config.get(source) or {})
+            return site
+
+    def fetch(self, target):
+        """
+        Fetches and parses one detail page.
+
+        Returns:
+            tuple: (row or None, outcome), outcome being 'ok', 'gone', 'empty', 'error',
+                   'parse_error' or 'status_N'.
+        """
+        source = target["source"]
+        site = self._site(source)
+        url = urljoin(site.base_url + "/", target["url"])
+        site.breaker.wait()
+        try:
+            with site.concurrency.request() as outcome:
+                resp = site.session.get(url, timeout=self.timeout)
+                outcome.status = resp.status_code
+        except requests.RequestException as e:
+            site.breaker.record_failure()
+            logger.warning(f"[{source}] detail page {url} failed: {e}")
+            return None, "error"
+        if resp.status_code in FAILURE_STATUSES:
+            site.breaker.record_failure(parse_retry_after(resp.headers.get("Retry-After")))
+            return None, f"status_{resp.status_code}"
+        site.breaker.record_success()
+        if resp.status_code in GONE_STATUSES:
+            return self._row(target, {}, GONE), GONE
+        if resp.status_code != 200:
+            return None, f"status_{resp.status_code}"
+        try:
+            details = extract_details(source, resp.text, self.backend)
+        except Exception as e:
+            logger.warning(f"[{source}] could not parse detail page {url}: {e}")
+            return None, "parse_error"
+        if not details["specs"] and details["availability"] is None:
+            # a block or interstitial page, not a product: try again next run
+            return None, "empty"
+        return self._row(target, details, OK), OK
+
+    @staticmethod
+    def _row(target, details, status):
+        return {**details, "url": target["url"], "source": target["source"], "status": status,
+                "enriched_at": datetime.utcnow()}
+
+    def _iter_fetched(self, pool, targets):
+        """
+        Yields fetch() results as they complete, keeping at most two targets per thread queued.
+        """
+        pending = set()
+        for target in targets:
+            pending.add(pool.submit(self.fetch, target))
+            if len(pending) >= self.max_workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def run(self, targets):
+        """
+        Enriches the given {'source', 'url'} targets (unknown or disabled sources are skipped).
+
+        Returns:
+            dict: Outcome counts ('ok', 'gone', 'empty', 'error', 'status_N') plus 'saved'.
+        """
+        sources = set(self.enabled_sources())
+        targets = [t for t in targets if t["source"] in sources]
+        logger.info(f"Enriching {len(targets)} product detail pages with {self.max_workers} threads...")
+        counts = Counter()
+        buffer = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for row, outcome in self._iter_fetched(pool, interleave(targets)):
+                    counts[outcome] += 1
+                    if row is None:
+                        continue
+                    buffer.append(row)
+                    if len(buffer) >= self.batch_size:
+                        counts["saved"] += self.save(buffer) or 0
+                        buffer = []
+            if buffer:
+                counts["saved"] += self.save(buffer) or 0
+        finally:
+            self.close()
+        logger.info(f"Enrichment finished: {dict(counts)}")
+        return dict(counts)
+
+    def close(self):
+        with self._lock:
+            for site in self._sites.values():
+                release_session(site.session)
+            self._sites = {}
@@ -4,25 +4,124 @@ from datetime import datetime
 import pandas as pd
 
 from src.analysis.analysis_engine import AnalysisEngine
+from src.data import database
 from src.pipeline.data_pipeline import DataPipeline
+from src.pipeline.distributed import Coordinator, DistributedWorker, FileResultStore, SQLiteJobQueue
+from src.pipeline.enrichment import EnrichmentCrawler
+from src.pipeline.replay import replay_archive
+from src.pipeline.scheduler import RecrawlScheduler, plan_summary
 from src.pipeline.scraper_orchestrator import ScraperOrchestrator
+from src.scrapers.canonical import ProductDeduper
+from src.utils.config import ConfigLoader
 from src.utils.logger import get_logger
 
 logger = get_logger("main")
 
 
-def run_scrapers(scrapers_config="config/scrapers.yaml", max_workers=4, save_path=None):
-    logger.info("Starting scraper orchestrator...")
-    orchestrator = ScraperOrchestrator(scrapers_config_path=scrapers_config)
-    all_products = orchestrator.run_all(max_workers)
+def run_scrapers(scrapers_config="config/scrapers.yaml", max_workers=4, save_path=None, schedule_state=None,
+                 checkpoint_dir="data_output/checkpoints", resume=False, persist=None):
+    logger.info("Starting scraper orchestrator..." + (" (resuming from checkpoints)" if resume else ""))
+    orchestrator = ScraperOrchestrator(scrapers_config_path=scrapers_config, checkpoint_dir=checkpoint_dir,
+                                       resume=resume)
+    if schedule_state:
+        scheduler = RecrawlScheduler(schedule_state)
+        plan = scheduler.plan(orchestrator.scrapers_config, sources=orchestrator.scraper_names)
+        logger.info(f"Crawl plan: {plan_summary(plan)}")
+        all_products = []
+        deduper = ProductDeduper()
+        # the scheduler measures change per category, so it sees every page before dedup
+        for batch in orchestrator.iter_products(max_workers, plan=plan, dedupe=False):
+            scheduler.record_batch(batch['source'], batch['category'], batch['page'], batch['products'])
+            all_products.extend(deduper.filter(batch['products']))
+        scheduler.finish_run()
+        logger.info(f"Dropped {deduper.dropped} duplicate products (same product_key).")
+    else:
+        all_products = orchestrator.run_all(max_workers)
     logger.info(f"Scraping complete. {len(all_products)} products collected.")
     if save_path:
         df = pd.DataFrame(all_products)
         df.to_json(save_path, orient="records", force_ascii=False, indent=2)
         logger.info(f"Raw scraped products saved to {save_path}")
+    if persist is not None:
+        persist(all_products)
+    # seen-url keys only once the products are stored: otherwise the next incremental run would
+    # stop paginating before it reaches them
+    if save_path or persist is not None:
+        orchestrator.commit_seen()
+    return all_products
+
+
+def replay_pages(archive_dir="data_output/archive", scrapers_config="config/scrapers.yaml", save_path=None,
+                 source=None, category=None, max_workers=None):
+    logger.info("Re-parsing archived pages...")
+    all_products = replay_archive(archive_dir, scrapers_config=scrapers_config, source=source, category=category,
+                                  max_workers=max_workers)
+    if save_path:
+        pd.DataFrame(all_products).to_json(save_path, orient="records", force_ascii=False, indent=2)
+        logger.info(f"Replayed products saved to {save_path}")
+    return all_products
+
+
+def show_crawl_plan(scrapers_config="config/scrapers.yaml", state_path="data_output/state/recrawl.json"):
+    scheduler = RecrawlScheduler(state_path)
+    orchestrator = ScraperOrchestrator(scrapers_config_path=scrapers_config)
+    plan = scheduler.plan(orchestrator.scrapers_config, sources=orchestrator.scraper_names)
+    for entry in plan:
+        status = f"due, {entry.max_pages}/{entry.full_pages} pages" if entry.due else "skip"
+        print(f"{entry.source:<12} {entry.category:<20} volatility={entry.volatility:<6} {status} ({entry.reason})")
+    summary = plan_summary(plan)
+    print(f"Expected requests: {summary['expected_requests']} of {summary['full_requests']} "
+          f"({summary['savings_pct']}% saved)")
+    return plan
+
+
+def enqueue_jobs(scrapers_config="config/scrapers.yaml", queue_path="data_output/queue/jobs.sqlite",
+                 pages_per_job=5):
+    logger.info(f"Enqueuing distributed scrape jobs into {queue_path}...")
+    coordinator = Coordinator(scrapers_config, SQLiteJobQueue(queue_path))
+    count = coordinator.enqueue_all(pages_per_job=pages_per_job)
+    logger.info(f"Enqueued {count} jobs.")
+    return count
+
+
+def run_worker(scrapers_config="config/scrapers.yaml", queue_path="data_output/queue/jobs.sqlite",
+               results_dir="data_output/distributed", worker_id=None, visibility_timeout=600, idle_timeout=0):
+    job_queue = SQLiteJobQueue(queue_path)
+    worker = DistributedWorker(
+        scrapers_config,
+        job_queue,
+        FileResultStore(results_dir),
+        worker_id=worker_id,
+        visibility_timeout=visibility_timeout,
+    )
+    completed = worker.run(idle_timeout=idle_timeout)
+    logger.info(f"Worker {worker.worker_id} finished {completed} jobs. Queue: {job_queue.stats()}")
+    return completed
+
+
+def collect_results(results_dir="data_output/distributed", save_path=None):
+    deduper = ProductDeduper()
+    all_products = deduper.filter(FileResultStore(results_dir).iter_products())
+    logger.info(f"Collected {len(all_products)} products from {results_dir} "
+                f"({deduper.dropped} duplicates dropped).")
+    if save_path:
+        pd.DataFrame(all_products).to_json(save_path, orient="records", force_ascii=False, indent=2)
+        logger.info(f"Collected products saved to {save_path}")
     return all_products
 
 
+def enrich_products(scrapers_config="config/scrapers.yaml", db_config="config/database.yaml", max_workers=16,
+                    max_age_hours=72, limit=None, sources=None, batch_size=200):
+    logger.info("Enriching stored products from their detail pages...")
+    db = ConfigLoader(db_config).get_config("database")
+    database.configure_engine(db["host"], db["port"], db["user"], db["password"], db["dbname"])
+    database.ensure_details_table()
+    crawler = EnrichmentCrawler(ConfigLoader(scrapers_config).config, max_workers=max_workers, batch_size=batch_size)
+    targets = database.load_enrichment_targets(sources=sources or crawler.enabled_sources(),
+                                               max_age_hours=max_age_hours, limit=limit)
+    return crawler.run(targets)
+
+
 def process_pipeline(
         products=None,
         raw_json_path=None,
@@ -0,0 +1,165 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from src.pipeline.batches import decode_products, encode_products
+from src.pipeline.replay import parse_archived_page
+from src.utils.logger import get_logger
+
+logger = get_logger("parse-pool")
+
+
+def parse_page_task(source, body, options=None, category=None):
+    """
+    Process-pool entry point: parses one raw page (utf-8 bytes) with its source's page parser.
+
+    Returns:
+        bytes: The products as an encoded columnar batch (see batches.encode_products).
+    """
+    html = body.decode("utf-8", errors="replace")
+    products = parse_archived_page({"source": source, "category": category}, html, options)
+    return encode_products(products)
+
+
+class ParsePool:
+    """
+    Process pool that parses fetched pages off the fetching threads.
+
+    Parsing is CPU-bound and holds the GIL, so threads that fetch and parse in turn stop scaling
+    after a few categories. Fetch threads hand the raw page bytes to this pool instead: the same
+    module-level parse_page() functions the archive replay uses run in worker processes and send
+    back compact columnar batches. At most max_pending pages are queued or being parsed; when the
+    parsers fall behind, submit() blocks the fetchers until a slot frees up.
+
+    Fetchers do not wait for their own page: parse_later() returns a future of the products and
+    iter_parse() keeps a window of a job's pages parsing while the job fetches the next ones.
+
+    Typical usage:
+        pool = ParsePool(max_workers=4)
+        for page, products in pool.iter_parse("microcenter", fetched_pages, {"parser": "lxml"}):
+            ...
+
+    Args:
+        max_workers (int, optional): Parser processes (defaults to the CPU count).
+        max_pending (int, optional): Pages queued or in flight (defaults to 2 per worker).
+        window (int, optional): Pages of one job fetched ahead of its oldest unparsed page (defaults to 2).
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, window=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.window = window or 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.pages = 0
+
+    def submit(self, source, html, options=None, category=None):
+        """
+        Queues one page, blocking while max_pending pages are already queued.
+        Returns a future of the encoded product batch.
+        """
+        body = html.encode("utf-8") if isinstance(html, str) else html
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(parse_page_task, source, body, options, category)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self.pages += 1
+        return future
+
+    def parse(self, source, html, options=None, category=None):
+        """
+        Parses one page in the pool and returns its product dicts.
+        """
+        return decode_products(self.submit(source, html, options, category).result())
+
+    def parse_later(self, source, html, options=None, category=None):
+        """
+        Queues one page and returns a future of its product dicts, so the caller can go on
+        fetching while the page is parsed. Cancelling the future drops the products.
+        """
+        parsed = Future()
+
+        def done(batch):
+            if not parsed.set_running_or_notify_cancel():
+                return
+            try:
+                parsed.set_result(decode_products(batch.result()))
+            except Exception as e:
+                parsed.set_exception(e)
+
+        self.submit(source, html, options, category).add_done_callback(done)
+        return parsed
+
+    def iter_parse(self, source, pages, options=None, category=None, window=None):
+        """
+        Parses a job's fetched pages and yields (page, products) in page order.
+
+        Each page is queued as soon as pages yields it, so the next page is fetched while the pool
+        parses. At most `window` pages of the job are parsing at once; the oldest is waited for
+        only when the window is full, and parsed pages are yielded as soon as they reach the head.
+        When the caller stops early (e.g. on an empty page), the pages fetched ahead are dropped.
+
+        Args:
+            source (str): Source whose page parser is used.
+            pages (iterable): (page, html) tuples, in page order.
+            window (int, optional): Pages in flight for this job (defaults to the pool's window).
+        """
+        window = max(1, window or self.window)
+        in_flight = deque()
+        try:
+            for page, html in pages:
+                in_flight.append((page, self.parse_later(source, html, options, category)))
+                while in_flight and (len(in_flight) >= window or in_flight[0][1].done()):
+                    done_page, parsed = in_flight.popleft()
+                    yield done_page, parsed.result()
+            while in_flight:
+                done_page, parsed = in_flight.popleft()
+                yield done_page, parsed.result()
+        finally:
+            for _, parsed in in_flight:
+                parsed.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool(config=None):
+    """
+    Returns the process-wide ParsePool for a 'parse_pool' config section, or None when disabled.
+    All scrapers of a process share it, so the parser processes match the cores, not the sources.
+    Runners hand it to the scrapers they create (see executor.new_scraper) and shut it down with
+    close_parse_pool().
+    """
+    global _pool
+    config = config or {}
+    if not config.get("enabled"):
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool(
+                max_workers=config.get("workers"),
+                max_pending=config.get("max_pending"),
+                window=config.get("window"),
+            )
+            logger.info(f"Started {_pool.max_workers} parser processes.")
+        return _pool
+
+
+def close_parse_pool():
+    """
+    Shuts down the process-wide ParsePool, if one was started. Pool worker processes exit without
+    atexit hooks, and a parser pool left running keeps their executor from shutting down.
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
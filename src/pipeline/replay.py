@@ -0,0 +1,109 @@
+import importlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.pipeline.batches import decode_products, iter_encoded_chunks
+from src.scrapers.page_archive import PageArchive
+from src.scrapers.parser_backend import get_backend
+from src.utils.config import ConfigLoader
+from src.utils.logger import get_logger
+
+logger = get_logger("replay")
+
+# module-level parse_page(html, backend, partial) functions, importable without a browser
+PAGE_PARSERS = {
+    "amazon": "src.scrapers.selenium.amazon_scraper",
+    "ebay": "src.scrapers.selenium.ebay_selenium_scraper",
+    "microcenter": "src.scrapers.static_scraper",
+}
+# parse_page(html, category) functions working on parsel selectors
+SCRAPY_PAGE_PARSERS = {
+    "newegg": "src.scrapers.scrapy_crawler.newegg_crawler.spriders.newegg_scrapy",
+}
+
+
+def parse_archived_page(entry, html, options=None):
+    """
+    Parses one archived page with the current parser of its source.
+
+    Args:
+        entry (dict): Archive index entry (source, category, page, url, ...).
+        html (str): Archived page body.
+        options (dict, optional): The source's scraper config ('parser', 'partial_parse').
+
+    Returns:
+        list: Product dicts annotated with 'source' and 'category'.
+    """
+    options = options or {}
+    source = entry["source"]
+    if source in PAGE_PARSERS:
+        parse_page = importlib.import_module(PAGE_PARSERS[source]).parse_page
+        products = parse_page(html, get_backend(options.get("parser")), options.get("partial_parse", False))
+    elif source in SCRAPY_PAGE_PARSERS:
+        parse_page = importlib.import_module(SCRAPY_PAGE_PARSERS[source]).parse_page
+        products = parse_page(html, entry.get("category"))
+    else:
+        raise ValueError(f"No page parser for source '{source}'.")
+    for product in products:
+        product["source"] = source
+        product["category"] = entry.get("category") or product.get("category")
+    return products
+
+
+def replay_task(archive_dir, entries, source_options):
+    """
+    Process-pool entry point: parses a batch of archived pages and returns encoded product chunks.
+    """
+    archive = PageArchive(archive_dir)
+    products = []
+    for entry in entries:
+        try:
+            products.extend(parse_archived_page(entry, archive.read(entry), source_options.get(entry["source"])))
+        except Exception as e:
+            logger.error(f"Failed to replay {entry['url']} ({entry['segment']}@{entry['offset']}): {e}")
+    return len(entries), list(iter_encoded_chunks(products))
+
+
+def replay_archive(archive_dir, scrapers_config=None, source=None, category=None, since=None, max_workers=None,
+                   pages_per_task=50):
+    """
+    Re-runs the page parsers over an archive of raw pages, in parallel and without any network access.
+
+    Args:
+        archive_dir (str): Directory written by PageArchive.
+        scrapers_config (str, optional): Scrapers YAML; used for per-source parser settings.
+        source (str, optional): Only replay pages of this source.
+        category (str, optional): Only replay pages of this category.
+        since (float, optional): Only replay pages archived at or after this timestamp.
+        max_workers (int, optional): Parser processes (defaults to the CPU count).
+        pages_per_task (int): Pages parsed per task.
+
+    Returns:
+        list: All product dicts parsed from the archived pages.
+    """
+    archive = PageArchive(archive_dir)
+    source_options = {}
+    if scrapers_config and os.path.exists(scrapers_config):
+        source_options = ConfigLoader(scrapers_config).config or {}
+
+    entries = list(archive.iter_index(source=source, category=category, since=since))
+    logger.info(f"Replaying {len(entries)} archived pages from {archive_dir}...")
+    started = time.time()
+    all_products = []
+    pages = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(replay_task, archive_dir, entries[i:i + pages_per_task], source_options)
+            for i in range(0, len(entries), pages_per_task)
+        ]
+        for future in as_completed(futures):
+            try:
+                done, chunks = future.result()
+                pages += done
+                for chunk in chunks:
+                    all_products.extend(decode_products(chunk))
+            except Exception as e:
+                logger.error(f"Replay task failed: {e}")
+    logger.info(f"Replayed {pages} pages into {len(all_products)} products in {time.time() - started:.1f}s.")
+    return all_products
@@ -0,0 +1,222 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+
+from src.utils.logger import get_logger
+
+logger = get_logger("scheduler")
+
+
+@dataclass
+class CrawlPlanEntry:
+    """
+    Scheduling decision for one (source, category).
+    """
+    source: str
+    category: str
+    due: bool
+    max_pages: int
+    full_pages: int
+    interval_hours: float
+    volatility: float
+    reason: str
+
+    @property
+    def expected_requests(self):
+        return self.max_pages if self.due else 0
+
+
+class RecrawlScheduler:
+    """
+    Volatility-driven recrawl scheduler.
+
+    Every run records, per (source, category) and per page, which share of products was new
+    or changed price compared with the previous run. The smoothed change rate (volatility)
+    decides how often a category is recrawled and how deep: volatile categories are crawled
+    every run to full depth, stable ones wait up to max_interval_hours and stop after the last
+    page that still changes.
+
+    Typical usage:
+        scheduler = RecrawlScheduler("data_output/state/recrawl.json")
+        plan = scheduler.plan(scrapers_config)
+        for batch in orchestrator.iter_products(plan=plan):
+            scheduler.record_batch(batch["source"], batch["category"], batch["page"], batch["products"])
+        scheduler.finish_run()
+
+    Args:
+        state_path (str): JSON file with the per-category history.
+        min_interval_hours (float): Recrawl interval for fully volatile categories.
+        max_interval_hours (float): Recrawl interval for categories that never change.
+        page_threshold (float): Pages with a smoothed change rate below this are considered stable.
+        smoothing (float): EWMA weight of the latest run (0 < smoothing <= 1).
+    """
+
+    def __init__(self, state_path, min_interval_hours=0, max_interval_hours=72, page_threshold=0.05,
+                 smoothing=0.5):
+        self.state_path = state_path
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.page_threshold = page_threshold
+        self.smoothing = smoothing
+        self.state = self._load()
+        self._current = {}
+
+    def _load(self):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"categories": {}}
+
+    def save(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _key(source, category):
+        return f"{source}/{category}"
+
+    def record_batch(self, source, category, page, products):
+        """
+        Records one scraped page of the current run.
+        """
+        pages = self._current.setdefault(self._key(source, category), {})
+        snapshot = pages.setdefault(str(page or 1), {})
+        for product in products:
+            if product.get("url"):
+                snapshot[product["url"]] = product.get("price")
+
+    def record_products(self, products):
+        """
+        Records products without page information (all treated as page 1).
+        """
+        for product in products:
+            self.record_batch(product.get("source"), product.get("category"), 1, [product])
+
+    @staticmethod
+    def change_rate(previous, current):
+        """
+        Share of products on a page that are new or changed price since the previous run.
+        """
+        if not current:
+            return 0.0
+        changed = sum(1 for url, price in current.items() if url not in previous or previous[url] != price)
+        return changed / len(current)
+
+    def _smooth(self, old, rate):
+        # the first comparison is taken as-is, later ones are blended in
+        return rate if old is None else self.smoothing * rate + (1 - self.smoothing) * old
+
+    def finish_run(self, now=None):
+        """
+        Compares the recorded pages with the previous run, updates volatility and saves state.
+        """
+        now = now or time.time()
+        categories = self.state.setdefault("categories", {})
+        for key, pages in self._current.items():
+            entry = categories.setdefault(key, {"volatility": None, "page_volatility": {}, "pages": {}})
+            previous_pages = entry.get("pages", {})
+            previous_all = {url: price for page in previous_pages.values() for url, price in page.items()}
+            current_all = {url: price for page in pages.values() for url, price in page.items()}
+
+            if previous_pages:
+                rate = self.change_rate(previous_all, current_all)
+                entry["volatility"] = self._smooth(entry.get("volatility"), rate)
+                for page, snapshot in pages.items():
+                    page_rate = self.change_rate(previous_all, snapshot)
+                    entry["page_volatility"][page] = self._smooth(entry["page_volatility"].get(page), page_rate)
+                logger.info(f"[{key}] change rate {rate:.2%}, volatility {entry['volatility']:.2f}")
+
+            entry["pages"] = pages
+            entry["last_crawled"] = now
+            entry["pages_crawled"] = len(pages)
+        self._current = {}
+        if self.state_path:
+            self.save()
+
+    def plan_entry(self, source, category, full_pages, now=None):
+        now = now or time.time()
+        entry = self.state.get("categories", {}).get(self._key(source, category))
+        if not entry or not entry.get("last_crawled"):
+            return CrawlPlanEntry(source, category, True, full_pages, full_pages, self.min_interval_hours, 1.0,
+                                  "no history")
+
+        volatility = entry.get("volatility")
+        volatility = 1.0 if volatility is None else min(max(volatility, 0.0), 1.0)
+        interval = self.min_interval_hours + (self.max_interval_hours - self.min_interval_hours) * (1 - volatility)
+        age_hours = (now - entry["last_crawled"]) / 3600
+        due = age_hours >= interval
+
+        # crawl up to the last page that still changes, plus one page to notice new churn further down
+        page_volatility = entry.get("page_volatility", {})
+        depth = full_pages
+        if page_volatility:
+            volatile_pages = [int(p) for p, v in page_volatility.items() if v >= self.page_threshold]
+            depth = min(full_pages, max(volatile_pages, default=0) + 1)
+
+        reason = f"age {age_hours:.1f}h {'>=' if due else '<'} interval {interval:.1f}h"
+        return CrawlPlanEntry(source, category, due, depth, full_pages, round(interval, 2), round(volatility, 3),
+                              reason)
+
+    def plan(self, scrapers_config, sources=None, now=None):
+        """
+        Builds the crawl plan for every configured (source, category).
+
+        Args:
+            scrapers_config (ConfigLoader): Loaded scrapers config.
+            sources (list, optional): Source names to plan for; defaults to every config section.
+            now (float, optional): Timestamp to plan for (defaults to current time).
+
+        Returns:
+            list of CrawlPlanEntry
+        """
+        sources = sources or list(scrapers_config.config.keys())
+        entries = []
+        for source in sources:
+            config = scrapers_config.get_config(source)
+            full_pages = config.get("max_pages", 1)
+            for category in config.get("categories", {}):
+                entries.append(self.plan_entry(source, category, full_pages, now))
+        return entries
+
+
+def plan_summary(plan):
+    """
+    Returns expected vs full request counts for a plan.
+    """
+    full = sum(e.full_pages for e in plan)
+    expected = sum(e.expected_requests for e in plan)
+    return {
+        "categories": len(plan),
+        "due": sum(1 for e in plan if e.due),
+        "full_requests": full,
+        "expected_requests": expected,
+        "saved_requests": full - expected,
+        "savings_pct": round(100 * (full - expected) / full, 1) if full else 0.0,
+    }
+
+
+def apply_plan(name, config, plan):
+    """
+    Restricts a scraper config to the due categories of a plan.
+
+    Returns a config copy with only due categories, 'max_pages' set to the deepest planned
+    depth and per-category depths under 'category_overrides', or None when nothing is due.
+    """
+    entries = {e.category: e for e in plan if e.source == name and e.due}
+    categories = {k: v for k, v in config.get("categories", {}).items() if k in entries}
+    if not categories:
+        return None
+    planned = dict(config)
+    planned["categories"] = categories
+    planned["max_pages"] = max(entries[c].max_pages for c in categories)
+    overrides = dict(config.get("category_overrides", {}))
+    for category in categories:
+        overrides[category] = {**overrides.get(category, {}), "max_pages": entries[category].max_pages}
+    planned["category_overrides"] = overrides
+    return planned
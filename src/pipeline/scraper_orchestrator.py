@@ -1,13 +1,186 @@
+import queue
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import Manager
 
+from src.pipeline.batches import decode_products, encode_products, iter_encoded_chunks, iter_spilled_chunks, \
+    spill_chunks
+from src.pipeline.checkpoint import get_checkpoint_store
+from src.pipeline.parse_pool import close_parse_pool, get_parse_pool
+from src.pipeline.scheduler import apply_plan
+from src.scrapers.canonical import ProductDeduper
 from src.scrapers.factory import ScraperFactory
+from src.scrapers.seen_filter import commit_staged, reset_seen_runs
+from src.scrapers.selenium.driver_manager import close_driver_managers
 from src.utils.config import ConfigLoader
-from src.utils.executor import threaded_scrape_executor
+from src.utils.executor import stage_seen, threaded_scrape_executor, threaded_page_executor
 from src.utils.logger import get_logger
 
 logger = get_logger("orchestrator")
 
 
+def scrape_source(name, config, seen_staged=None):
+    """
+    Runs a single scraper by name using its configuration.
+
+    Args:
+        name (str): Name/ID of the scraper to run.
+        config (dict): The scraper's config section.
+        seen_staged (list, optional): Receives the staged seen-url keys of the completed categories,
+                                      to be committed once their products are persisted.
+
+    Returns:
+        list: List of product dicts scraped by this scraper.
+
+    Notes:
+        - For Scrapy-based scrapers (is_scrapy = True), scraping runs in the main process.
+        - For other scrapers, scraping is parallelized using threads per category.
+        - All products are annotated with their 'source' and 'category'.
+        - With an enabled 'checkpoint' config section every parsed page is checkpointed, and
+          with 'resume' completed pages are read back instead of scraped again.
+        - Any exceptions are caught and logged; returns empty list on error.
+    """
+    scraper_cls = ScraperFactory._registry.get(name)
+    if not scraper_cls:
+        logger.error(f"Scraper '{name}' not registered!")
+        return []
+    categories = config['categories']
+    base_url = config['base_url']
+    logger.info(f"Running {name} scraper...")
+    # pool processes are reused, URLs from an earlier run are not duplicates in this one
+    reset_seen_runs()
+
+    if getattr(scraper_cls, "is_scrapy", False):
+        urls = [base_url + v for v in categories.values()]
+        logger.info(f"[ALL CATEGORIES] Scraping {urls} with Scrapy (main thread)...")
+        try:
+            scraper = scraper_cls(config, checkpoint=get_checkpoint_store(config.get("checkpoint")))
+            items = scraper.scrape(urls)
+            stage_seen(scraper, seen_staged)
+            for prod in items:
+                prod['source'] = name
+                if 'category' not in prod or not prod['category']:
+                    prod['category'] = next((k for k, v in categories.items() if v in (prod.get('url') or '')),
+                                            None)
+            logger.info(f"{name} Scrapy scraper finished with {len(items)} products.")
+            return items
+        except Exception as e:
+            logger.error(f"Scrapy scraper '{name}' failed: {e}", exc_info=True)
+            return []
+
+    try:
+        results = threaded_scrape_executor(
+            scraper_cls=scraper_cls,
+            base_config=config,
+            jobs=categories,
+            max_workers=len(categories) + 2,
+            url_prefix=base_url,
+            checkpoint=get_checkpoint_store(config.get("checkpoint")),
+            source=name,
+            parse_pool=get_parse_pool(config.get("parse_pool")),
+            seen_staged=seen_staged,
+        )
+    finally:
+        # pool workers exit without atexit hooks, so warm idle drivers and parser processes are
+        # shut down here; a running parser pool would keep the worker from exiting
+        close_driver_managers()
+        close_parse_pool()
+    all_products = []
+    for category, items in results.items():
+        for product in items:
+            product['source'] = name
+            product['category'] = category
+            all_products.append(product)
+    logger.info(f"{name} scraper finished with {sum(len(v) for v in results.values())} products.")
+    return all_products
+
+
+def scrape_source_task(name, config, chunk_size=500, spill_dir=None):
+    """
+    Process-pool entry point: runs one scraper and returns its products in columnar form.
+
+    Submitted as a plain top-level function with only (name, config), so the orchestrator
+    itself is never pickled into the worker.
+
+    Args:
+        name (str): Name/ID of the scraper to run.
+        config (dict): The scraper's config section.
+        chunk_size (int): Products per encoded chunk.
+        spill_dir (str, optional): When set, chunks are written to a temp file there and
+                                   only the file path travels back to the parent.
+
+    Returns:
+        tuple: (encoded chunks (see batches.encode_products) or the spill file path,
+                staged seen-url keys for seen_filter.commit_staged once the products are persisted).
+    """
+    seen_staged = []
+    products = scrape_source(name, config, seen_staged)
+    chunks = iter_encoded_chunks(products, chunk_size)
+    if spill_dir:
+        return spill_chunks(chunks, spill_dir), seen_staged
+    return list(chunks), seen_staged
+
+
+def stream_source_task(name, config, out_queue):
+    """
+    Process-pool entry point: runs one scraper and pushes its results page by page into a queue.
+
+    Args:
+        name (str): Name/ID of the scraper to run.
+        config (dict): The scraper's config section.
+        out_queue: Bounded (multiprocessing manager) queue receiving batch dicts.
+
+    Notes:
+        - Every batch is a dict with 'source', 'category', 'page' and 'products', where
+          'products' is an encoded columnar blob (see batches.encode_products).
+        - A final {'source': name, 'done': True, 'seen': [...]} marker is always sent, even on
+          failure; 'seen' holds the staged seen-url keys of the categories that completed.
+        - Blocking puts on the bounded queue give back-pressure to the scrapers.
+    """
+    seen_staged = []
+    try:
+        scraper_cls = ScraperFactory._registry.get(name)
+        if not scraper_cls:
+            logger.error(f"Scraper '{name}' not registered!")
+            return
+        categories = config['categories']
+        base_url = config['base_url']
+        logger.info(f"Streaming {name} scraper...")
+        reset_seen_runs()
+
+        def emit(category, page, items):
+            for product in items:
+                product['source'] = name
+                product['category'] = category
+            out_queue.put({'source': name, 'category': category, 'page': page,
+                           'products': encode_products(items)})
+
+        if getattr(scraper_cls, "is_scrapy", False):
+            urls = [base_url + v for v in categories.values()]
+            scraper = scraper_cls(config)
+            scraper.scrape(urls, on_page=emit)
+            stage_seen(scraper, seen_staged)
+            return
+
+        for category, page, items in threaded_page_executor(
+                scraper_cls=scraper_cls,
+                base_config=config,
+                jobs=categories,
+                max_workers=len(categories) + 2,
+                url_prefix=base_url,
+                checkpoint=get_checkpoint_store(config.get("checkpoint")),
+                source=name,
+                parse_pool=get_parse_pool(config.get("parse_pool")),
+                seen_staged=seen_staged,
+        ):
+            emit(category, page, items)
+    except Exception as e:
+        logger.error(f"Streaming scraper '{name}' failed: {e}", exc_info=True)
+    finally:
+        close_driver_managers()
+        close_parse_pool()
+        out_queue.put({'source': name, 'done': True, 'seen': seen_staged})
+
+
 class ScraperOrchestrator:
     """
     Orchestrates the execution of all registered product scrapers,
@@ -16,100 +189,159 @@ class ScraperOrchestrator:
 
     Args:
         scrapers_config_path (str): Path to the YAML configuration file for scrapers.
+        checkpoint_dir (str, optional): Checkpoint every parsed page under this directory
+                                        (see pipeline.checkpoint.CheckpointStore).
+        resume (bool): Skip the pages and categories already checkpointed by an interrupted run.
 
     Attributes:
         scrapers_config (ConfigLoader): Loader for all scraper configs.
         scraper_names (list of str): All available scrapers registered in the factory.
+        seen_staged (list): Seen-url keys staged by the runs so far; commit_seen() commits them.
     """
 
-    def __init__(self, scrapers_config_path):
+    def __init__(self, scrapers_config_path, checkpoint_dir=None, resume=False):
         self.scrapers_config = ConfigLoader(scrapers_config_path)
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
         self.scraper_names = ScraperFactory.available_scrapers()
+        self.seen_staged = []
         logger.info(f"Available scrapers '{self.scraper_names}'")
 
     def _run_scraper(self, name):
         """
-        Runs a single scraper by name using its configuration.
+        Runs a single scraper by name in the current process, see scrape_source().
 
         Args:
             name (str): Name/ID of the scraper to run.
 
         Returns:
             list: List of product dicts scraped by this scraper.
-
-        Notes:
-            - For Scrapy-based scrapers (is_scrapy = True), scraping runs in the main process.
-            - For other scrapers, scraping is parallelized using threads per category.
-            - All products are annotated with their 'source' and 'category'.
-            - Any exceptions are caught and logged; returns empty list on error.
         """
-        config = self.scrapers_config.get_config(name)
-        scraper_cls = ScraperFactory._registry.get(name)
-        if not scraper_cls:
-            logger.error(f"Scraper '{name}' not registered!")
-            return []
-        categories = config['categories']
-        base_url = config['base_url']
-        logger.info(f"Running {name} scraper...")
+        return scrape_source(name, self.scrapers_config.get_config(name), self.seen_staged)
 
-        if getattr(scraper_cls, "is_scrapy", False):
-            urls = [base_url + v for v in categories.values()]
-            logger.info(f"[ALL CATEGORIES] Scraping {urls} with Scrapy (main thread)...")
-            try:
-                items = scraper_cls(config).scrape(urls)
-                for prod in items:
-                    prod['source'] = name
-                    if 'category' not in prod or not prod['category']:
-                        prod['category'] = next((k for k, v in categories.items() if v in (prod.get('url') or '')),
-                                                None)
-                logger.info(f"{name} Scrapy scraper finished with {len(items)} products.")
-                return items
-            except Exception as e:
-                logger.error(f"Scrapy scraper '{name}' failed: {e}", exc_info=True)
-                return []
+    def commit_seen(self):
+        """
+        Commits the seen-url keys staged by the runs so far to their filters. Call it once the
+        products are persisted: keys committed for products that were never stored would make
+        the next incremental run stop paginating before it reaches them.
+        """
+        staged, self.seen_staged = self.seen_staged, []
+        commit_staged(staged)
 
-        results = threaded_scrape_executor(
-            scraper_cls=scraper_cls,
-            base_config=config,
-            jobs=categories,
-            max_workers=len(categories) + 2,
-            url_prefix=base_url,
-        )
-        all_products = []
-        for category, items in results.items():
-            for product in items:
-                product['source'] = name
-                product['category'] = category
-                all_products.append(product)
-        logger.info(f"{name} scraper finished with {sum(len(v) for v in results.values())} products.")
-        return all_products
+    def _source_configs(self, plan=None):
+        """
+        Returns {name: config} for every scraper to run, restricted to due categories when a plan is given.
+        """
+        configs = {}
+        for name in self.scraper_names:
+            config = self.scrapers_config.get_config(name)
+            if plan is not None:
+                config = apply_plan(name, config, plan)
+                if config is None:
+                    logger.info(f"Skipping {name}: nothing due in crawl plan.")
+                    continue
+            if self.checkpoint_dir:
+                config = {**config, "checkpoint": {"enabled": True, "dir": self.checkpoint_dir,
+                                                   "resume": self.resume}}
+            configs[name] = config
+        return configs
 
-    def run_all(self, max_workers=2):
+    def run_all(self, max_workers=2, chunk_size=500, spill_dir=None, plan=None, dedupe=True):
         """
         Runs all configured scrapers in parallel using process pool.
 
         Args:
             max_workers (int): Maximum number of processes (scrapers run in parallel).
                                Default is 2.
+            chunk_size (int): Products per columnar chunk sent back from each worker.
+            spill_dir (str, optional): Directory for worker temp files instead of in-band results.
+            plan (list of CrawlPlanEntry, optional): Recrawl plan; only due categories are scraped,
+                                                     each to its planned depth.
+            dedupe (bool): Keep only the first product per product_key (see canonical.ProductDeduper).
 
         Returns:
             list: Combined list of all products from all scrapers.
 
         Notes:
             - Each scraper runs in a separate process for isolation.
-            - Aggregates all results into a single product list.
+            - Workers send compact columnar chunks, decoded here one chunk at a time.
+            - Aggregates all results into a single product list; a product seen under several
+              categories or behind several URLs is kept once (dedupe=True).
             - Scraper failures are logged and do not interrupt the rest.
+            - Seen-url keys are only staged (see commit_seen).
         """
         all_products = []
         scraper_futures = []
+        deduper = ProductDeduper() if dedupe else None
         with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            for name in self.scraper_names:
+            for name, config in self._source_configs(plan).items():
                 scraper_futures.append(
-                    executor.submit(self._run_scraper, name)
+                    executor.submit(scrape_source_task, name, config, chunk_size, spill_dir)
                 )
             for future in as_completed(scraper_futures):
                 try:
-                    all_products.extend(future.result())
+                    result, seen_staged = future.result()
+                    chunks = iter_spilled_chunks(result) if isinstance(result, str) else result
+                    for chunk in chunks:
+                        products = decode_products(chunk)
+                        all_products.extend(deduper.filter(products) if deduper else products)
+                    self.seen_staged.extend(seen_staged)
                 except Exception as e:
                     logger.error(f"Scraper failed: {e}")
+        if deduper:
+            logger.info(f"Dropped {deduper.dropped} duplicate products (same product_key).")
         return all_products
+
+    def iter_products(self, max_workers=2, queue_size=32, plan=None, dedupe=True):
+        """
+        Runs all configured scrapers in parallel and yields page-sized batches as soon as they are parsed.
+
+        Args:
+            max_workers (int): Maximum number of processes (scrapers run in parallel).
+            queue_size (int): Maximum number of batches buffered between the scrapers and the consumer.
+                              When the consumer falls behind, scrapers block until it catches up.
+            plan (list of CrawlPlanEntry, optional): Recrawl plan; only due categories are scraped,
+                                                     each to its planned depth.
+            dedupe (bool): Drop products whose product_key came up in an earlier batch.
+
+        Yields:
+            dict: {'source': str, 'category': str, 'page': int, 'products': list of product dicts}
+
+        Notes:
+            - Peak memory is bounded by queue_size batches, not by the total number of products.
+            - Batches cross the process boundary in columnar form and are decoded here.
+            - Scraper failures are logged and do not interrupt the rest.
+            - Closing the generator early shuts the scrapers down.
+            - Seen-url keys are only staged (see commit_seen).
+        """
+        deduper = ProductDeduper() if dedupe else None
+        with Manager() as manager:
+            batches = manager.Queue(maxsize=queue_size)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(stream_source_task, name, config, batches): name
+                    for name, config in self._source_configs(plan).items()
+                }
+                pending = set(futures.values())
+                try:
+                    while pending:
+                        try:
+                            batch = batches.get(timeout=1)
+                        except queue.Empty:
+                            for future, name in futures.items():
+                                if name in pending and future.done() and future.exception():
+                                    logger.error(f"Scraper failed: {future.exception()}")
+                                    pending.discard(name)
+                            continue
+                        if batch.get('done'):
+                            self.seen_staged.extend(batch.get('seen') or [])
+                            pending.discard(batch['source'])
+                            continue
+                        batch['products'] = decode_products(batch['products'])
+                        if deduper:
+                            batch['products'] = deduper.filter(batch['products'])
+                        yield batch
+                finally:
+                    if pending:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        manager.shutdown()
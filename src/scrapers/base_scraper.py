@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 
+from src.utils.logger import get_logger
+
+logger = get_logger("base-scraper")
+
 
 class BaseScraper(ABC):
     """
@@ -26,3 +30,54 @@ class BaseScraper(ABC):
         """
         html = self.fetch(url)
         return self.parse(html)
+
+    def iter_pages(self, url: str):
+        """
+        Yields (page_number, products) tuples as soon as each page is parsed.
+        Scrapers with pagination override this; the default yields a single page.
+        """
+        yield 1, self.scrape(url)
+
+    def archive_page(self, source, url, html, page=None):
+        """
+        Stores a fetched page in the raw-page archive when the scraper has one configured.
+        """
+        archive = getattr(self, "archive", None)
+        if archive is not None and html:
+            archive.write(html, url=url, source=source, category=getattr(self, "category", None), page=page)
+
+    def seen_session(self):
+        """
+        Returns the scraper's SeenSession, None when it has no seen-url filter.
+        """
+        seen = getattr(self, "seen", None)
+        if seen is None:
+            return None
+        if getattr(self, "_seen_session", None) is None:
+            self._seen_session = seen.session()
+        return self._seen_session
+
+    def commit_seen(self):
+        """
+        Records the products this scraper yielded in its seen-url filter. Callers invoke it once
+        the products are persisted; a scraper closed without it leaves the filter unchanged.
+        """
+        session = self.seen_session()
+        if session is not None:
+            session.commit()
+
+    def skip_seen(self, pages):
+        """
+        Passes (page, products) tuples through the scraper's seen-url filter, when it has one:
+        drops products already found in this run and stops after a page of known, unchanged products.
+        """
+        session = self.seen_session()
+        if session is None:
+            yield from pages
+            return
+        for page, products in pages:
+            fresh, exhausted = session.filter_page(products)
+            yield page, fresh
+            if exhausted:
+                logger.info(f"Page {page} only has products seen unchanged before, stopping pagination.")
+                return
@@ -0,0 +1,103 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+from src.scrapers.seen_filter import url_key
+
+AMAZON_ASIN = re.compile(r"/(?:dp|gp/product|gp/aw/d|exec/obidos/asin|o/ASIN)/([A-Z0-9]{10})(?:[/?]|$)", re.I)
+EBAY_ITEM = re.compile(r"/itm/(?:[^/?]+/)?(\d{9,15})(?:[/?]|$)")
+NEWEGG_ITEM = re.compile(r"/p/((?:N82E|9SI)[A-Z0-9]+|[A-Z0-9]{3}-[A-Z0-9]{3,4}-[A-Z0-9]+)(?:[/?]|$)", re.I)
+MICROCENTER_PRODUCT = re.compile(r"/product/(\d+)(?:[/?]|$)")
+
+# query parameters that carry the item id when it is not in the path
+ID_PARAMS = {
+    "amazon": ("asin",),
+    "ebay": ("item", "itemid"),
+    "newegg": ("item", "itemnumber"),
+}
+
+
+def _amazon_target(parts):
+    """
+    the product path behind an Amazon sponsored redirect (/sspa/click?...&url=/.../dp/ASIN/...)
+    """
+    target = parse_qs(parts.query).get("url")
+    return target[0] if target else ""
+
+
+def _id_from_query(source, parts):
+    query = {k.lower(): v for k, v in parse_qs(parts.query).items()}
+    for name in ID_PARAMS.get(source, ()):
+        if query.get(name):
+            return query[name][0]
+    return None
+
+
+def extract_item_id(source, url):
+    """
+    Returns the site's stable item id in a product URL (ASIN, eBay item number, Newegg item
+    number, MicroCenter product id), or None when the URL does not carry one.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    path = parts.path
+    if source == "amazon":
+        if "/sspa/click" in path:
+            path = _amazon_target(parts)
+        match = AMAZON_ASIN.search(path)
+        item = match.group(1) if match else _id_from_query(source, parts)
+        return item.upper() if item else None
+    if source == "ebay":
+        match = EBAY_ITEM.search(path)
+        return match.group(1) if match else _id_from_query(source, parts)
+    if source == "newegg":
+        match = NEWEGG_ITEM.search(path)
+        item = match.group(1) if match else _id_from_query(source, parts)
+        return item.upper() if item else None
+    if source == "microcenter":
+        match = MICROCENTER_PRODUCT.search(path)
+        return match.group(1) if match else None
+    return None
+
+
+def product_key(source, url):
+    """
+    Stable product key '<source>:<item id>'. URLs without a recognizable item id fall back to
+    '<source>:<url without tracking parameters>' (see seen_filter.url_key). None without a URL.
+    """
+    if not url:
+        return None
+    item = extract_item_id(source, url)
+    return f"{source}:{item}" if item else f"{source}:{url_key(url)}"
+
+
+class ProductDeduper:
+    """
+    Drops products whose product_key already came up in this run.
+
+    The same product shows up under overlapping categories and behind different tracking URLs;
+    the first occurrence is kept (with its category), later ones are dropped before persistence.
+    Every kept product gets its 'product_key'. Products without a URL are passed through.
+
+    Typical usage:
+        deduper = ProductDeduper()
+        for batch in batches:
+            batch = deduper.filter(batch)
+    """
+
+    def __init__(self):
+        self.seen = set()
+        self.dropped = 0
+
+    def filter(self, products):
+        kept = []
+        for product in products:
+            key = product.get("product_key") or product_key(product.get("source"), product.get("url"))
+            if key is not None:
+                product["product_key"] = key
+                if key in self.seen:
+                    self.dropped += 1
+                    continue
+                self.seen.add(key)
+            kept.append(product)
+        return kept
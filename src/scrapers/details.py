@@ -0,0 +1,157 @@
+import re
+
+from src.scrapers.parser_backend import get_backend
+
+WHITESPACE = re.compile(r"\s+")
+OUT_OF_STOCK = ("out of stock", "unavailable", "sold out", "no longer available")
+IN_STOCK = ("in stock", "available")
+
+DETAIL_FIELDS = ("seller", "shipping", "condition", "availability", "in_stock", "specs")
+
+
+def _clean(value):
+    """
+    collapses whitespace; empty strings become None
+    """
+    if value is None:
+        return None
+    value = WHITESPACE.sub(" ", value).strip(" :\u200e\u200f")
+    return value or None
+
+
+def _first_text(backend, doc, selectors):
+    """
+    text of the first selector (tried in order) that matches a non-empty node
+    """
+    for selector in selectors:
+        node = backend.select_one(doc, selector)
+        if node is not None:
+            text = _clean(backend.text(node, strip=False))
+            if text:
+                return text
+    return None
+
+
+def _pairs(backend, doc, row_selector, label_selector, value_selector):
+    """
+    label -> value dict from a spec table (the first label/value node of every row)
+    """
+    specs = {}
+    for row in backend.select(doc, row_selector):
+        label = backend.select_one(row, label_selector)
+        value = backend.select_one(row, value_selector)
+        if label is None or value is None:
+            continue
+        key = _clean(backend.text(label, strip=False))
+        if key and key not in specs:
+            specs[key] = _clean(backend.text(value, strip=False))
+    return specs
+
+
+def stock_state(availability):
+    """
+    True/False when an availability text clearly says in or out of stock, else None
+    """
+    if not availability:
+        return None
+    lowered = availability.lower()
+    if any(phrase in lowered for phrase in OUT_OF_STOCK):
+        return False
+    if any(phrase in lowered for phrase in IN_STOCK):
+        return True
+    return None
+
+
+def _details(seller=None, shipping=None, condition=None, availability=None, specs=None):
+    return {
+        "seller": seller,
+        "shipping": shipping,
+        "condition": condition,
+        "availability": availability,
+        "in_stock": stock_state(availability),
+        "specs": specs or {},
+    }
+
+
+def extract_amazon_details(html, backend=None):
+    backend = backend or get_backend()
+    doc = backend.document(html)
+    specs = _pairs(backend, doc, "#productOverview_feature_div tr", "td:nth-of-type(1)", "td:nth-of-type(2)")
+    for table in ("#productDetails_techSpec_section_1 tr", "#productDetails_detailBullets_sections1 tr"):
+        for key, value in _pairs(backend, doc, table, "th", "td").items():
+            specs.setdefault(key, value)
+    for key, value in _pairs(backend, doc, "#detailBullets_feature_div li", "span.a-text-bold",
+                             "span.a-text-bold + span").items():
+        specs.setdefault(key, value)
+    return _details(
+        seller=_first_text(backend, doc, ["#sellerProfileTriggerId",
+                                          "#merchantInfoFeature_feature_div .offer-display-feature-text-message",
+                                          "#merchant-info"]),
+        shipping=_first_text(backend, doc, ["#mir-layout-DELIVERY_BLOCK-slot-PRIMARY_DELIVERY_MESSAGE_LARGE",
+                                            "#deliveryBlockMessage"]),
+        condition=_first_text(backend, doc, ["#condition-text", "#usedBuySection .a-text-bold"]),
+        availability=_first_text(backend, doc, ["#availability"]),
+        specs=specs,
+    )
+
+
+def extract_ebay_details(html, backend=None):
+    backend = backend or get_backend()
+    doc = backend.document(html)
+    return _details(
+        seller=_first_text(backend, doc, [".x-sellercard-atf__info__about-seller a span",
+                                          ".x-sellercard-atf__info__about-seller"]),
+        shipping=_first_text(backend, doc, [".ux-labels-values--shipping .ux-labels-values__values"]),
+        condition=_first_text(backend, doc, [".x-item-condition-text .ux-textspans",
+                                             ".x-item-condition-value"]),
+        availability=_first_text(backend, doc, ["#qtyAvailability .ux-textspans", "#qtySubTxt"]),
+        specs=_pairs(backend, doc, ".ux-layout-section-evo__col", ".ux-labels-values__labels",
+                     ".ux-labels-values__values"),
+    )
+
+
+def extract_microcenter_details(html, backend=None):
+    backend = backend or get_backend()
+    doc = backend.document(html)
+    return _details(
+        # sold and shipped by the store itself
+        seller="Micro Center",
+        shipping=_first_text(backend, doc, ["#pnlInventory .shipping-info", ".delivery-options"]),
+        condition=_first_text(backend, doc, [".product-condition"]) or "New",
+        availability=_first_text(backend, doc, ["#pnlInventory .inventoryCnt", "#pnlInventory .inventory"]),
+        specs=_pairs(backend, doc, "#tab-specs .spec-body", "div:nth-of-type(1)", "div:nth-of-type(2)"),
+    )
+
+
+def extract_newegg_details(html, backend=None):
+    backend = backend or get_backend()
+    doc = backend.document(html)
+    return _details(
+        seller=_first_text(backend, doc, [".product-seller-sold-by strong", ".product-seller strong"]),
+        shipping=_first_text(backend, doc, [".product-delivery .product-delivery-title", ".product-shipping"]),
+        condition=_first_text(backend, doc, [".product-condition strong"]) or "New",
+        availability=_first_text(backend, doc, [".product-inventory strong", ".product-inventory"]),
+        specs=_pairs(backend, doc, "#product-details table.table-horizontal tr", "th", "td"),
+    )
+
+
+DETAIL_EXTRACTORS = {
+    "amazon": extract_amazon_details,
+    "ebay": extract_ebay_details,
+    "microcenter": extract_microcenter_details,
+    "newegg": extract_newegg_details,
+}
+
+
+def extract_details(source, html, backend=None):
+    """
+    Parses a product detail page of a source into seller, shipping, condition, availability,
+    in_stock (None when the page does not say) and a specs dict.
+
+    Raises:
+        ValueError: If the source has no detail extractor.
+    """
+    extractor = DETAIL_EXTRACTORS.get(source)
+    if extractor is None:
+        raise ValueError(f"No detail extractor for source '{source}'. Choose from {sorted(DETAIL_EXTRACTORS)}.")
+    return extractor(html, backend)
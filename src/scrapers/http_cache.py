@@ -0,0 +1,231 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from src.utils.logger import get_logger
+
+logger = get_logger("http-cache")
+
+# bodies are stored decoded, so transfer-level headers must not be replayed
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class HttpCache:
+    """
+    On-disk HTTP response cache with conditional revalidation.
+
+    Each URL is stored as a gzip-compressed body plus a small JSON metadata file holding the
+    status, headers, ETag/Last-Modified validators and the time it was stored. Entries younger
+    than ttl seconds are served without touching the network; older ones are revalidated with
+    If-None-Match / If-Modified-Since and served from disk when the server answers 304.
+
+    Typical usage:
+        cache = HttpCache("data_output/http_cache", ttl=3600)
+        mount_cache(session, cache)
+
+    Args:
+        cache_dir (str): Directory for the cache files.
+        ttl (float): Seconds an entry is served without revalidation (0 = always revalidate).
+        compress_level (int): gzip level for stored bodies.
+    """
+
+    def __init__(self, cache_dir, ttl=3600, compress_level=6):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        directory = os.path.join(self.cache_dir, key[:2])
+        return os.path.join(directory, f"{key}.json"), os.path.join(directory, f"{key}.gz")
+
+    def get(self, url):
+        """
+        Returns the stored metadata dict for url, or None.
+        """
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable cache entry for {url}: {e}")
+            return None
+
+    def read_body(self, url):
+        _, body_path = self._paths(url)
+        with gzip.open(body_path, "rb") as f:
+            return f.read()
+
+    def store(self, url, status, headers, body):
+        """
+        Stores a response body and its metadata, replacing any previous entry atomically.
+        """
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        headers = dict(headers)
+        lower = {k.lower(): v for k, v in headers.items()}
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": headers,
+            "etag": lower.get("etag"),
+            "last_modified": lower.get("last-modified"),
+            "stored_at": time.time(),
+            "size": len(body),
+        }
+        tmp_body, tmp_meta = f"{body_path}.tmp", f"{meta_path}.tmp"
+        with gzip.open(tmp_body, "wb", compresslevel=self.compress_level) as f:
+            f.write(body)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_body, body_path)
+        os.replace(tmp_meta, meta_path)
+        return meta
+
+    def touch(self, url, meta):
+        """
+        Marks an entry as fresh again after a successful revalidation.
+        """
+        meta_path, _ = self._paths(url)
+        meta = {**meta, "stored_at": time.time()}
+        tmp_meta = f"{meta_path}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+        return meta
+
+    def is_fresh(self, meta, now=None):
+        return ((now or time.time()) - meta["stored_at"]) < self.ttl
+
+    @staticmethod
+    def conditional_headers(meta):
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def record(self, outcome, size):
+        """
+        Updates counters; outcome is 'hit' (served fresh), 'revalidated' (304) or 'miss' (full download).
+        """
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.bytes_saved += size
+            elif outcome == "revalidated":
+                self.revalidated += 1
+                self.bytes_saved += size
+            else:
+                self.misses += 1
+                self.bytes_downloaded += size
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_ratio": round((self.hits + self.revalidated) / total, 3) if total else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "bytes_downloaded": self.bytes_downloaded,
+            }
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    requests transport adapter that answers GET requests from an HttpCache.
+
+    Fresh entries never hit the network; stale ones are sent as conditional requests and a
+    304 answer is turned into a normal 200 response built from the cached body. Responses
+    served from disk carry an 'X-Cache' header ('HIT' or 'REVALIDATED').
+    """
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def _cached_response(self, request, meta, label):
+        response = Response()
+        response.status_code = meta["status"]
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.headers["X-Cache"] = label
+        response._content = self.cache.read_body(meta["url"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        url = request.url
+        meta = self.cache.get(url)
+        if meta is not None and self.cache.is_fresh(meta):
+            self.cache.record("hit", meta["size"])
+            return self._cached_response(request, meta, "HIT")
+
+        if meta is not None:
+            request.headers.update(self.cache.conditional_headers(meta))
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            meta = self.cache.touch(url, meta)
+            self.cache.record("revalidated", meta["size"])
+            return self._cached_response(request, meta, "REVALIDATED")
+
+        if response.status_code == 200:
+            body = response.content
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+            self.cache.store(url, response.status_code, headers, body)
+            self.cache.record("miss", len(body))
+        return response
+
+
+def mount_cache(session, cache, **adapter_kwargs):
+    """
+    Routes all http(s) requests of a requests.Session through a CachingAdapter.
+    """
+    adapter = CachingAdapter(cache, **adapter_kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(cache_dir, ttl=3600):
+    """
+    Returns the process-wide HttpCache for a directory, so counters are shared
+    between everything that uses the same cache (e.g. Scrapy storage and policy).
+    """
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = HttpCache(cache_dir, ttl=ttl)
+        return cache
@@ -0,0 +1,118 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from src.scrapers.http_cache import mount_cache
+from src.utils.logger import get_logger
+
+logger = get_logger("http-session")
+
+
+def build_retry(retries=3, backoff=0.5):
+    """
+    urllib3 Retry for idempotent requests: connection and read errors are retried with exponential
+    backoff (backoff, 2 * backoff, ... up to 60s) plus up to `backoff` seconds of random jitter.
+
+    Error statuses are deliberately not retried here: a 429/503 goes straight back to the caller so
+    the concurrency controller and the circuit breaker see every throttled answer (and its
+    Retry-After), and no backoff sleep is counted as request latency. Callers retry them with
+    backoff_delay() between attempts, each attempt in its own in-flight slot (see
+    MicroCenterStaticScraper.fetch); the tiered fetcher escalates them to a browser instead.
+    """
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=0,
+        backoff_factor=backoff,
+        backoff_jitter=backoff,
+        backoff_max=60,
+        status_forcelist=(),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+
+def build_session(pool_size=10, pool_hosts=10, retries=3, backoff=0.5, cache=None):
+    """
+    Builds a requests.Session tuned for many requests to a few hosts.
+
+    Args:
+        pool_size (int): Keep-alive connections kept per host (should cover the source's max concurrency).
+        pool_hosts (int): Hosts with a connection pool.
+        retries (int): Retries per request on connection errors (see build_retry).
+        backoff (float): Backoff factor between retries.
+        cache (HttpCache, optional): Serve and store GET responses through this cache (see mount_cache).
+
+    Returns:
+        requests.Session: With gzip/deflate (and brotli when available) and keep-alive headers.
+    """
+    session = requests.Session()
+    adapter_kwargs = {
+        "pool_connections": pool_hosts,
+        "pool_maxsize": pool_size,
+        "max_retries": build_retry(retries, backoff),
+    }
+    if cache is not None:
+        mount_cache(session, cache, **adapter_kwargs)
+    else:
+        adapter = HTTPAdapter(**adapter_kwargs)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+    return session
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def acquire_session(name, config=None, cache=None, max_retries=3):
+    """
+    Returns the process-wide session of a source, creating it on first use.
+
+    Every category scraper of the source shares it, so connections and TLS sessions to the host
+    are reused across categories. Each acquire must be paired with release_session(); the session
+    is closed when the last user releases it.
+
+    Args:
+        name (str): Source name.
+        config (dict, optional): The source's 'http_session' section (pool_size, pool_hosts, retries,
+                                 backoff).
+        cache (HttpCache, optional): Response cache mounted on the session.
+        max_retries (int): Retries when the section does not set them.
+    """
+    config = config or {}
+    with _sessions_lock:
+        entry = _sessions.get(name)
+        if entry is None:
+            session = build_session(
+                pool_size=config.get("pool_size", 10),
+                pool_hosts=config.get("pool_hosts", 10),
+                retries=config.get("retries", max_retries),
+                backoff=config.get("backoff", 0.5),
+                cache=cache,
+            )
+            entry = _sessions[name] = [session, 0]
+            logger.info(f"Created shared HTTP session for {name}.")
+        entry[1] += 1
+        return entry[0]
+
+
+def release_session(session):
+    """
+    Releases a session from acquire_session(); sessions it did not hand out are closed directly.
+    """
+    with _sessions_lock:
+        for name, entry in list(_sessions.items()):
+            if entry[0] is session:
+                entry[1] -= 1
+                if entry[1] > 0:
+                    return
+                del _sessions[name]
+                break
+    session.close()
@@ -0,0 +1,126 @@
+import math
+import re
+
+# first number in a string: digits with thousands/decimal separators (',', '.', apostrophe,
+# no-break spaces, and a plain space only before a group of exactly three digits, as in
+# "EUR 1 299,00"). "10 to 20" and "$10 - $20" still give 10.
+_DIGITS = r"\d(?:[\d.,'\u00a0\u202f]| (?=\d{3}(?!\d)))*\d|\d"
+NUMBER = re.compile(_DIGITS)
+RATING = re.compile(r"(\d+(?:[.,]\d+)?)")
+COUNT = re.compile(rf"({_DIGITS})\s*([kKmM])?")
+COMMA_THOUSANDS = re.compile(r"\d{1,3}(?:,\d{3})+")
+DOT_THOUSANDS = re.compile(r"\d{1,3}(?:\.\d{3}){2,}")
+_GROUPING = str.maketrans("", "", "' \u00a0\u202f")
+_SCALE = {"k": 1_000, "m": 1_000_000}
+
+
+def _number(value):
+    """
+    Returns (number, None) for values that already are numbers, (None, text) for strings to parse.
+    """
+    if value is None or isinstance(value, bool):
+        return None, None
+    if isinstance(value, (int, float)):
+        return (None if isinstance(value, float) and math.isnan(value) else value), None
+    return None, str(value)
+
+
+def to_decimal(token):
+    """
+    Parses one number token with locale separators: '1,299.00' and '1.299,00' are both 1299.0.
+
+    With a single kind of separator, a comma is a thousands separator only in groups of three
+    ('1,299'), otherwise a decimal comma ('12,50'); dots are decimal points unless they group
+    thousands more than once ('1.299.000').
+    """
+    token = token.translate(_GROUPING)
+    last_comma, last_dot = token.rfind(","), token.rfind(".")
+    if last_comma > last_dot and not (last_dot < 0 and COMMA_THOUSANDS.fullmatch(token)):
+        token = token.replace(".", "").replace(",", ".")
+    elif last_comma < 0 and DOT_THOUSANDS.fullmatch(token):
+        token = token.replace(".", "")
+    else:
+        token = token.replace(",", "")
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def parse_price_text(value):
+    """
+    Parses a raw price ('$1,299.00', '1.299,00 €', '$10.00 to $20.00', 'US $5') into a float.
+    Ranges give their lower bound; numbers pass through; None when there is no number.
+    """
+    number, text = _number(value)
+    if text is None:
+        return float(number) if number is not None else None
+    match = NUMBER.search(text)
+    return to_decimal(match.group(0)) if match else None
+
+
+def parse_rating_text(value, pattern=RATING):
+    """
+    Parses the first group of pattern ('4.6 out of 5 stars', '4,5', or e.g. 'rating-(\\d+)'
+    for a CSS class) into a float.
+    """
+    number, text = _number(value)
+    if text is None:
+        return number
+    match = pattern.search(text)
+    return float(match.group(1).replace(",", ".")) if match else None
+
+
+def parse_count_text(value):
+    """
+    Parses a review count ('(1,234)', '87', '1.2K') into an int.
+    """
+    number, text = _number(value)
+    if text is None:
+        return int(number) if number is not None else None
+    match = COUNT.search(text)
+    if not match:
+        return None
+    digits, suffix = match.groups()
+    if suffix:
+        scaled = to_decimal(digits)
+        return round(scaled * _SCALE[suffix.lower()]) if scaled is not None else None
+    digits = "".join(c for c in digits if c.isdigit())
+    return int(digits) if digits else None
+
+
+def normalize_products(products, rating_pattern=RATING, rating_type=float, unparsed_count=None):
+    """
+    Normalizes the price, rating and review_count fields of a batch of product dicts in place.
+
+    Scrapers emit these fields as raw text and run this once per page, so every site shares the
+    same rules for currency symbols, ranges, thousands separators and decimal commas.
+
+    Args:
+        products (list): Product dicts holding raw strings (or numbers) in those fields.
+        rating_pattern (re.Pattern): Pattern whose first group is the rating (site-specific markup).
+        rating_type (type): Type of parsed ratings (Newegg's star classes and Micro Center's -1 placeholder are ints).
+        unparsed_count: review_count for a count that is present but unreadable (Amazon uses 0).
+
+    Returns:
+        list: The same dicts, with floats for price, rating_type for rating, ints for review_count
+        and None where nothing could be parsed. Fields a product does not have are left out.
+    """
+    for product in products:
+        if "price" in product:
+            product["price"] = parse_price_text(product["price"])
+        if "rating" in product:
+            rating = parse_rating_text(product["rating"], rating_pattern)
+            product["rating"] = rating_type(rating) if rating is not None else None
+        if "review_count" in product:
+            raw = product["review_count"]
+            count = parse_count_text(raw)
+            product["review_count"] = unparsed_count if count is None and raw is not None else count
+    return products
+
+
+def normalize_product(product, **options):
+    """
+    Single-product wrapper around normalize_products() (returns a normalized copy).
+    """
+    return normalize_products([dict(product)], **options)[0]
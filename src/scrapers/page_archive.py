@@ -0,0 +1,147 @@
+import glob
+import gzip
+import json
+import os
+import threading
+import time
+import uuid
+
+from src.utils.logger import get_logger
+
+logger = get_logger("page-archive")
+
+
+class PageArchive:
+    """
+    Append-only archive of raw fetched pages.
+
+    Pages are written into segment files, one gzip member per page, so a single page can be
+    read back by seeking to its offset. Every segment has a JSONL index next to it with one
+    line per page: url, timestamp, source, category, page, segment, offset and length. Each
+    process writes its own uniquely named segments, so parallel scrapers (and workers on other
+    machines sharing the directory) never append to the same file.
+
+    Typical usage:
+        archive = PageArchive("data_output/archive")
+        archive.write(html, url=url, source="amazon", category="laptops", page=1)
+        for entry, html in archive.iter_pages(source="amazon"):
+            ...
+
+    Args:
+        archive_dir (str): Directory for segments and indexes.
+        segment_max_bytes (int): Compressed size after which a new segment is started.
+        compress_level (int): gzip level per page.
+    """
+
+    def __init__(self, archive_dir, segment_max_bytes=64 * 1024 * 1024, compress_level=6):
+        self.archive_dir = archive_dir
+        self.segment_max_bytes = segment_max_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._segment = None
+        self._segment_pid = None
+        self._segment_size = 0
+        self._segment_count = 0
+
+    def _new_segment(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self._segment_count += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._segment = f"pages-{stamp}-{os.getpid()}-{self._segment_count:04d}-{uuid.uuid4().hex[:8]}.gz"
+        self._segment_pid = os.getpid()
+        self._segment_size = 0
+
+    def write(self, body, url, source, category=None, page=None, timestamp=None):
+        """
+        Appends one page and its index entry. Returns the index entry.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        member = gzip.compress(body, compresslevel=self.compress_level)
+        with self._lock:
+            # forked workers inherit this object, but must not append to the parent's segment
+            if self._segment is None or self._segment_size >= self.segment_max_bytes \
+                    or self._segment_pid != os.getpid():
+                self._new_segment()
+            segment_path = os.path.join(self.archive_dir, self._segment)
+            with open(segment_path, "ab") as f:
+                offset = f.tell()
+                f.write(member)
+            entry = {
+                "url": url,
+                "timestamp": timestamp or time.time(),
+                "source": source,
+                "category": category,
+                "page": page,
+                "segment": self._segment,
+                "offset": offset,
+                "length": len(member),
+                "size": len(body),
+            }
+            with open(f"{segment_path}.idx.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._segment_size = offset + len(member)
+        return entry
+
+    def segments(self):
+        """
+        Returns the segment file names that have an index.
+        """
+        paths = sorted(glob.glob(os.path.join(self.archive_dir, "*.gz.idx.jsonl")))
+        return [os.path.basename(p)[:-len(".idx.jsonl")] for p in paths]
+
+    def iter_index(self, segment=None, source=None, category=None, since=None):
+        """
+        Yields index entries, optionally filtered by segment, source, category and minimum timestamp.
+        """
+        for name in ([segment] if segment else self.segments()):
+            with open(os.path.join(self.archive_dir, f"{name}.idx.jsonl"), "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if source and entry["source"] != source:
+                        continue
+                    if category and entry["category"] != category:
+                        continue
+                    if since and entry["timestamp"] < since:
+                        continue
+                    yield entry
+
+    def read(self, entry):
+        """
+        Returns the decoded HTML of one index entry.
+        """
+        with open(os.path.join(self.archive_dir, entry["segment"]), "rb") as f:
+            f.seek(entry["offset"])
+            return gzip.decompress(f.read(entry["length"])).decode("utf-8", errors="replace")
+
+    def iter_pages(self, **filters):
+        """
+        Yields (index entry, html) for every archived page matching the filters of iter_index().
+        """
+        for entry in self.iter_index(**filters):
+            yield entry, self.read(entry)
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(config=None):
+    """
+    Returns the process-wide PageArchive for an 'archive' config section, or None when disabled.
+    """
+    config = config or {}
+    if not config.get("enabled"):
+        return None
+    archive_dir = config.get("dir", "data_output/archive")
+    key = os.path.abspath(archive_dir)
+    with _archives_lock:
+        archive = _archives.get(key)
+        if archive is None:
+            archive = _archives[key] = PageArchive(
+                archive_dir,
+                segment_max_bytes=config.get("segment_mb", 64) * 1024 * 1024,
+            )
+        return archive
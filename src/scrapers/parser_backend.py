@@ -0,0 +1,282 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from cssselect import HTMLTranslator
+from lxml import etree
+
+_SIMPLE_SELECTOR = re.compile(r"""([a-zA-Z][\w-]*)|\.([\w-]+)|\[([\w-]+)(?:=['"]?([^'"\]]*)['"]?)?\]""")
+
+
+def parse_card_selector(selector):
+    """
+    Splits a single compound selector like "div.a.b[data-x='y']" into (tag, classes, attrs).
+    Only tag, class and attribute-equals/presence parts are supported, which is what the
+    card selectors use; anything else (combinators, pseudo-classes) raises ValueError.
+    """
+    tag, classes, attrs = None, [], {}
+    pos = 0
+    for m in _SIMPLE_SELECTOR.finditer(selector):
+        if m.start() != pos:
+            break
+        pos = m.end()
+        if m.group(1):
+            tag = m.group(1).lower()
+        elif m.group(2):
+            classes.append(m.group(2))
+        else:
+            attrs[m.group(3)] = m.group(4)
+    if pos != len(selector) or not selector:
+        raise ValueError(f"Card selector '{selector}' must be a single compound selector.")
+    return tag, classes, attrs
+
+
+def _matches(tag, classes, attrs, name, attrib):
+    if tag and name != tag:
+        return False
+    if classes:
+        have = (attrib.get("class") or "").split()
+        if any(c not in have for c in classes):
+            return False
+    return all(k in attrib and (v is None or attrib[k] == v) for k, v in attrs.items())
+
+
+class ParserBackend(ABC):
+    """
+    Minimal document API the page parsers are written against, so the same extraction
+    logic can run on BeautifulSoup or on lxml.
+
+    Nodes are whatever the backend returns (bs4 Tags, lxml elements); parsers only pass
+    them back into the backend and must compare them with `is None`, never by truthiness.
+    """
+    name = None
+
+    @abstractmethod
+    def document(self, html):
+        """
+        parses a full page and returns its root node
+        """
+        pass
+
+    def cards(self, html, selector, partial=False):
+        """
+        returns the product card nodes of a page.
+
+        With partial=True only the card subtrees are built and each card is standalone
+        (its parent is None), so parsing never looks outside the card. The selector must
+        then be a single compound selector, see parse_card_selector().
+        """
+        return self.select(self.document(html), selector)
+
+    @abstractmethod
+    def select(self, node, selector):
+        """
+        returns all descendants of node matching a CSS selector
+        """
+        pass
+
+    def select_one(self, node, selector):
+        """
+        returns the first descendant matching a CSS selector, or None
+        """
+        found = self.select(node, selector)
+        return found[0] if found else None
+
+    @abstractmethod
+    def text(self, node, strip=True):
+        """
+        returns the text of node; strip=True strips every text fragment like get_text(strip=True)
+        """
+        pass
+
+    @abstractmethod
+    def attr(self, node, name):
+        """
+        returns an attribute value, or None when it is missing
+        """
+        pass
+
+    @abstractmethod
+    def parent(self, node):
+        """
+        returns the parent node, or None for the root
+        """
+        pass
+
+
+class SoupBackend(ParserBackend):
+    """
+    BeautifulSoup with the pure-python html.parser, the original parsing path.
+    """
+    name = "soup"
+
+    def document(self, html):
+        return BeautifulSoup(html, "html.parser")
+
+    def select(self, node, selector):
+        return node.select(selector)
+
+    def cards(self, html, selector, partial=False):
+        if not partial:
+            return super().cards(html, selector)
+        tag, classes, attrs = parse_card_selector(selector)
+        strainer_attrs = dict(attrs)
+        if classes:
+            strainer_attrs["class"] = lambda v: v is not None and all(
+                c in (v if isinstance(v, list) else v.split()) for c in classes)
+        strainer = SoupStrainer(tag, attrs={k: (True if v is None else v) for k, v in strainer_attrs.items()})
+        soup = BeautifulSoup(html, "html.parser", parse_only=strainer)
+        return [card.extract() for card in soup.select(selector)]
+
+    def select_one(self, node, selector):
+        return node.select_one(selector)
+
+    def text(self, node, strip=True):
+        return node.get_text(strip=strip)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def parent(self, node):
+        return node.find_parent()
+
+
+class LxmlBackend(ParserBackend):
+    """
+    lxml (libxml2) backend. CSS selectors are translated to XPath once and kept as
+    compiled etree.XPath objects, so per-card lookups skip selector parsing entirely.
+    Compiled expressions are kept per thread, since the category threads share one backend.
+
+    Text extraction skips comments and script/style/template content, like bs4's get_text().
+    """
+    name = "lxml"
+
+    TEXT_XPATH = "descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]"
+
+    def __init__(self):
+        self._translator = HTMLTranslator()
+        self._translations = {}
+        self._local = threading.local()
+
+    def xpath(self, expression):
+        """
+        returns a compiled etree.XPath for an expression, cached per thread
+        """
+        compiled = getattr(self._local, "compiled", None)
+        if compiled is None:
+            compiled = self._local.compiled = {}
+        xpath = compiled.get(expression)
+        if xpath is None:
+            xpath = compiled[expression] = etree.XPath(expression)
+        return xpath
+
+    def compile(self, selector):
+        """
+        returns the compiled XPath for a CSS selector (descendants only, like bs4's select)
+        """
+        expression = self._translations.get(selector)
+        if expression is None:
+            expression = self._translations[selector] = self._translator.css_to_xpath(selector, prefix="descendant::")
+        return self.xpath(expression)
+
+    def document(self, html):
+        return lxml.html.document_fromstring(html)
+
+    def cards(self, html, selector, partial=False):
+        if not partial:
+            return super().cards(html, selector)
+        return list(self.iter_cards(html, selector))
+
+    def iter_cards(self, html, selector, chunk_size=65536):
+        """
+        streams the page through a parser target and yields each card as soon as it is closed.
+
+        libxml2 only reports events here; elements are created just for the card subtrees,
+        so the rest of the page never becomes a tree.
+        """
+        collector = _CardCollector(*parse_card_selector(selector))
+        parser = etree.HTMLParser(target=collector)
+        for start in range(0, len(html), chunk_size):
+            parser.feed(html[start:start + chunk_size])
+            yield from collector.drain()
+        parser.close()
+        yield from collector.drain()
+
+    def select(self, node, selector):
+        return self.compile(selector)(node)
+
+    def text(self, node, strip=True):
+        parts = self.xpath(self.TEXT_XPATH)(node)
+        if strip:
+            return "".join(s for s in (p.strip() for p in parts) if s)
+        return "".join(parts)
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def parent(self, node):
+        return node.getparent()
+
+
+class _CardCollector:
+    """
+    lxml parser target that builds elements only inside matching card elements.
+    """
+
+    def __init__(self, tag, classes, attrs):
+        self.tag, self.classes, self.attrs = tag, classes, attrs
+        self.builder = None
+        self.depth = 0
+        self.done = []
+
+    def start(self, name, attrib):
+        if self.builder is None:
+            if not _matches(self.tag, self.classes, self.attrs, name, attrib):
+                return
+            self.builder = etree.TreeBuilder()
+        self.depth += 1
+        self.builder.start(name, dict(attrib))
+
+    def end(self, name):
+        if self.builder is None:
+            return
+        self.builder.end(name)
+        self.depth -= 1
+        if self.depth == 0:
+            self.done.append(self.builder.close())
+            self.builder = None
+
+    def data(self, data):
+        if self.builder is not None:
+            self.builder.data(data)
+
+    def comment(self, text):
+        if self.builder is not None:
+            self.builder.comment(text)
+
+    def drain(self):
+        done, self.done = self.done, []
+        return done
+
+    def close(self):
+        return None
+
+
+_backends = {
+    SoupBackend.name: SoupBackend(),
+    LxmlBackend.name: LxmlBackend(),
+}
+
+DEFAULT_BACKEND = LxmlBackend.name
+
+
+def get_backend(name=None):
+    """
+    Returns the shared parser backend instance for a name ('lxml' or 'soup').
+    """
+    backend = _backends.get((name or DEFAULT_BACKEND).lower())
+    if backend is None:
+        raise ValueError(f"Parser backend '{name}' is not available. Choose from {sorted(_backends)}.")
+    return backend
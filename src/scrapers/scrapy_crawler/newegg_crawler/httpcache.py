@@ -0,0 +1,79 @@
+import time
+
+from scrapy.extensions.httpcache import RFC2616Policy
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+
+from src.scrapers.http_cache import get_cache
+from src.utils.logger import get_logger
+
+logger = get_logger("newegg-httpcache")
+
+
+def _cache_from_settings(settings):
+    return get_cache(settings.get("HTTPCACHE_DIR"), ttl=settings.getfloat("HTTP_CACHE_TTL", 3600))
+
+
+class HttpCacheStorage:
+    """
+    Scrapy cache storage (HTTPCACHE_STORAGE) backed by the shared on-disk HttpCache,
+    so the spider and the requests-based scrapers use the same compressed format.
+    """
+
+    def __init__(self, settings):
+        self.cache = _cache_from_settings(settings)
+
+    def open_spider(self, spider):
+        logger.info(f"Using HTTP cache in {self.cache.cache_dir}")
+
+    def close_spider(self, spider):
+        logger.info(f"HTTP cache stats: {self.cache.stats()}")
+
+    def retrieve_response(self, spider, request):
+        if request.method != "GET":
+            return None
+        meta = self.cache.get(request.url)
+        if meta is None:
+            return None
+        request.meta["cache_timestamp"] = meta["stored_at"]
+        request.meta["cache_size"] = meta["size"]
+        body = self.cache.read_body(request.url)
+        headers = Headers(meta["headers"])
+        respcls = responsetypes.from_args(headers=headers, url=meta["url"], body=body)
+        return respcls(url=meta["url"], headers=headers, status=meta["status"], body=body)
+
+    def store_response(self, spider, request, response):
+        headers = {k.decode("latin-1"): b", ".join(v).decode("latin-1") for k, v in response.headers.items()}
+        self.cache.store(request.url, response.status, headers, response.body)
+        self.cache.record("miss", len(response.body))
+
+
+class TtlRevalidatePolicy(RFC2616Policy):
+    """
+    Cache policy: every 200 GET is stored, entries younger than HTTP_CACHE_TTL are served
+    as-is, older ones are revalidated with If-None-Match / If-Modified-Since.
+    """
+
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.cache = _cache_from_settings(settings)
+
+    def should_cache_response(self, response, request):
+        return response.status == 200
+
+    def is_cached_response_fresh(self, cachedresponse, request):
+        age = time.time() - request.meta.get("cache_timestamp", 0)
+        if age < self.cache.ttl:
+            self.cache.record("hit", request.meta.get("cache_size", len(cachedresponse.body)))
+            return True
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+    def is_cached_response_valid(self, cachedresponse, response, request):
+        if response.status == 304:
+            meta = self.cache.get(request.url)
+            if meta is not None:
+                self.cache.touch(request.url, meta)
+            self.cache.record("revalidated", request.meta.get("cache_size", len(cachedresponse.body)))
+            return True
+        return super().is_cached_response_valid(cachedresponse, response, request)
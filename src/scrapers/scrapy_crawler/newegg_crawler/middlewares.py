@@ -0,0 +1,94 @@
+from urllib.parse import urlparse
+
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.task import deferLater
+
+from src.utils.concurrency import get_controller
+from src.utils.logger import get_logger
+from src.utils.resilience import FAILURE_STATUSES, backoff_delay, get_breaker, parse_retry_after
+
+logger = get_logger("newegg-middlewares")
+
+
+class AdaptiveConcurrencyMiddleware:
+    """
+    Downloader middleware feeding Scrapy responses into the shared AIMD controller
+    and applying its limit to the downloader slot of the request's domain.
+
+    Scrapy keeps managing in-flight requests itself; this only moves the slot's
+    concurrency up and down so the spider follows the same policy as the other scrapers.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def _controller(self, spider):
+        config = getattr(spider, "config", None) or {}
+        return get_controller(spider.name, config.get("concurrency"))
+
+    def _apply(self, request, controller):
+        downloader = getattr(getattr(self.crawler, "engine", None), "downloader", None)
+        if downloader is None:
+            return
+        key = request.meta.get("download_slot") or urlparse(request.url).hostname
+        slot = downloader.slots.get(key)
+        if slot is not None and slot.concurrency != controller.current_limit:
+            slot.concurrency = controller.current_limit
+            logger.info(f"[{key}] downloader concurrency -> {slot.concurrency}")
+
+    def process_response(self, request, response, spider):
+        controller = self._controller(spider)
+        controller.record(request.meta.get("download_latency", 0.0), status=response.status)
+        self._apply(request, controller)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        controller = self._controller(spider)
+        controller.record(request.meta.get("download_latency", 0.0), error=True)
+        self._apply(request, controller)
+        return None
+
+
+class CircuitBreakerMiddleware:
+    """
+    Downloader middleware applying the shared per-domain circuit breaker and retry backoff to Scrapy.
+
+    Scrapy's RetryMiddleware re-schedules failed requests right away; here a retried request first
+    waits an exponentially growing, jittered delay (based on its retry_times), and every request
+    waits while the domain's breaker is open, without blocking the reactor. Responses and download
+    errors are recorded on the breaker, with the server's Retry-After.
+    """
+
+    def _config(self, spider):
+        config = getattr(spider, "config", None) or {}
+        return config.get("resilience") or {}
+
+    async def process_request(self, request, spider):
+        from twisted.internet import reactor  # the reactor Scrapy installed for this crawl
+
+        config = self._config(spider)
+        breaker = get_breaker(request.url, config)
+        retries = request.meta.get("retry_times", 0)
+        delay = backoff_delay(retries, config.get("backoff_base", 1.0), config.get("backoff_cap", 60.0)) \
+            if retries else 0
+        delay = max(delay, breaker.admit())
+        while delay:
+            await maybe_deferred_to_future(deferLater(reactor, delay, lambda: None))
+            delay = breaker.admit()
+        return None
+
+    def process_response(self, request, response, spider):
+        breaker = get_breaker(request.url, self._config(spider))
+        if response.status in FAILURE_STATUSES:
+            breaker.record_failure(parse_retry_after(response.headers.get("Retry-After")))
+        else:
+            breaker.record_success()
+        return response
+
+    def process_exception(self, request, exception, spider):
+        get_breaker(request.url, self._config(spider)).record_failure()
+        return None
@@ -0,0 +1,97 @@
+from collections import Counter
+
+from lxml import etree
+from parsel.csstranslator import css2xpath
+
+from src.utils.logger import get_logger
+
+logger = get_logger("selector-resolver")
+
+
+class SelectorResolver:
+    """
+    Remembers which of several fallback CSS selectors matches the current page layout.
+
+    Every field has an ordered list of candidate selectors (parsel CSS, including ::text and
+    ::attr(...)). They are translated to XPath and compiled once. The selector that matched last
+    time is tried first; only when it misses are the other candidates probed. When another
+    candidate keeps matching while the remembered one misses (switch_after times in a row), it
+    becomes the new winner and the layout change is logged, so single odd cards (e.g. without
+    a price) do not flip the choice back and forth.
+
+    Typical usage:
+        resolver = SelectorResolver("newegg", {"title": ["a.item-title::text", "h3 a::text"]})
+        title = resolver.first(card, "title")
+
+    Args:
+        name (str): Name used in log messages.
+        candidates (dict): field -> ordered list of CSS selectors.
+        switch_after (int): Consecutive fallback matches before the winner is replaced.
+    """
+
+    def __init__(self, name, candidates, switch_after=3):
+        self.name = name
+        self.switch_after = switch_after
+        self.selectors = {field: list(selectors) for field, selectors in candidates.items()}
+        self.xpaths = {field: [css2xpath(s) for s in selectors] for field, selectors in self.selectors.items()}
+        self.compiled = {field: [etree.XPath(x) for x in xpaths] for field, xpaths in self.xpaths.items()}
+        self.winners = {}
+        self._streaks = {}
+        self.stats = Counter()
+
+    def _order(self, field):
+        winner = self.winners.get(field)
+        indexes = range(len(self.selectors[field]))
+        if winner is None:
+            return list(indexes)
+        return [winner] + [i for i in indexes if i != winner]
+
+    def _matched(self, field, index):
+        winner = self.winners.get(field)
+        if winner is None:
+            self.winners[field] = index
+            logger.info(f"{self.name}: '{field}' resolved to {self.selectors[field][index]!r}")
+            return
+        if index == winner:
+            self.stats["hit"] += 1
+            self._streaks.pop(field, None)
+            return
+        self.stats["fallback"] += 1
+        streak_index, streak = self._streaks.get(field, (index, 0))
+        streak = streak + 1 if streak_index == index else 1
+        if streak >= self.switch_after:
+            logger.warning(
+                f"{self.name}: layout change, '{field}' now matches {self.selectors[field][index]!r} "
+                f"instead of {self.selectors[field][winner]!r}"
+            )
+            self.winners[field] = index
+            self._streaks.pop(field, None)
+        else:
+            self._streaks[field] = (index, streak)
+
+    def select(self, page, field):
+        """
+        Returns the parsel SelectorList of the first candidate that matches anything on page.
+        """
+        for index in self._order(field):
+            found = page.xpath(self.xpaths[field][index])
+            if found:
+                self._matched(field, index)
+                return found
+        self.stats["miss"] += 1
+        return []
+
+    def first(self, node, field):
+        """
+        Returns the first non-empty string a candidate extracts from node (a parsel Selector
+        or lxml element), like node.css(selector).get() over the candidates; None if none match.
+        """
+        root = getattr(node, "root", node)
+        for index in self._order(field):
+            for value in self.compiled[field][index](root)[:1]:
+                value = str(value) if isinstance(value, str) else etree.tostring(value, encoding="unicode")
+                if value:
+                    self._matched(field, index)
+                    return value
+        self.stats["miss"] += 1
+        return None
@@ -1,11 +1,17 @@
 import random
+import re
 import time
 
 import scrapy
+from parsel import Selector
 from scrapy.crawler import CrawlerProcess
 
 from src.scrapers.base_scraper import BaseScraper
 from src.scrapers.factory import ScraperFactory
+from src.scrapers.normalize import normalize_product, normalize_products
+from src.scrapers.page_archive import get_archive
+from src.scrapers.seen_filter import get_seen_filter
+from src.scrapers.scrapy_crawler.newegg_crawler.selector_resolver import SelectorResolver
 from src.utils.logger import get_logger
 
 logger = get_logger("newegg-scrapy")
@@ -15,26 +21,30 @@ SCRAPERAPI_KEY = ""
 SCRAPERAPI_ENDPOINT = f"http://api.scraperapi.com/?api_key={SCRAPERAPI_KEY}&url={{}}"
 
 
-def parse_price(price_parts):
-    try:
-        if not price_parts or not price_parts[0]:
-            return None
-        main = price_parts[0].replace(',', '').strip()
-        decimal = price_parts[1].strip() if len(price_parts) > 1 else '00'
-        return float(f"{main}.{decimal.lstrip('.')}")
-    except Exception:
+RATING_CLASS = re.compile(r'rating-(\d+)')
+
+
+def raw_price(price_parts):
+    """
+    joins the main and decimal price parts into one price string, None without a main part
+    """
+    if not price_parts or not price_parts[0] or not any(c.isdigit() for c in price_parts[0]):
         return None
+    main = price_parts[0].strip()
+    decimal = (price_parts[1] or '').strip().lstrip('.') if len(price_parts) > 1 else ''
+    return f"{main}.{decimal or '00'}"
+
+
+def parse_price(price_parts):
+    return normalize_product({"price": raw_price(price_parts)})["price"]
+
 
 def parse_rating(class_str):
-    import re
-    m = re.search(r'rating-(\d+)', class_str or "")
-    return int(m.group(1)) if m else None
+    return normalize_product({"rating": class_str}, rating_pattern=RATING_CLASS, rating_type=int)["rating"]
 
 
 def parse_review_count(txt):
-    import re
-    m = re.search(r'\(([\d,]+)\)', txt or "")
-    return int(m.group(1).replace(',', '')) if m else None
+    return normalize_product({"review_count": txt})["review_count"]
 
 
 def get_browser_headers(user_agents):
@@ -46,10 +56,100 @@ def get_browser_headers(user_agents):
     }
 
 
+PRODUCT_SELECTORS = [
+    "div.item-cell",
+    ".item-container",
+    "[data-testid='product-item']",
+    ".product-item"
+]
+
+# ordered fallbacks per field; SelectorResolver tries the one matching the current layout first
+FIELD_SELECTORS = {
+    "cards": PRODUCT_SELECTORS,
+    "title": ["a.item-title::text", ".item-title::text", "h3 a::text", ".product-title::text"],
+    "url": ["a.item-title::attr(href)", ".item-title::attr(href)", "h3 a::attr(href)", ".product-title::attr(href)"],
+    "price_main": ["li.price-current strong::text", ".price-current strong::text", ".price .price-main::text"],
+    "price_decimal": ["li.price-current sup::text", ".price-current sup::text", ".price .price-decimal::text"],
+    "rating_class": ["a.item-rating::attr(class)"],
+    "review_text": ["span.item-rating-num::text"],
+    "img_url": ["a.item-img img::attr(src)", "a.item-img img::attr(data-src)", "img::attr(src)"],
+    "next_page": ['a[title="Next"]::attr(href)', 'a[aria-label="Next"]::attr(href)', '.pagination .next::attr(href)',
+                  '.pager .next::attr(href)'],
+}
+
+
+def new_resolver():
+    return SelectorResolver("newegg", FIELD_SELECTORS)
+
+
+_default_resolver = None
+
+
+def default_resolver():
+    """
+    resolver shared by offline parsing (replay), created on first use in each process
+    """
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = new_resolver()
+    return _default_resolver
+
+
+def find_product_cards(page, resolver=None):
+    """
+    returns the product cards of a results page (Scrapy response or parsel Selector)
+    using the card selector that matches the current layout
+    """
+    return (resolver or default_resolver()).select(page, "cards")
+
+
+def parse_product_card(prod, category, resolver=None):
+    """
+    extracts one product dict from a card with price/rating/reviews still raw (see parse_cards),
+    or None when it has no title or url
+    """
+    resolver = resolver or default_resolver()
+    title = resolver.first(prod, "title")
+    product_url = resolver.first(prod, "url")
+    if not (title and product_url):
+        return None
+    price = raw_price([resolver.first(prod, "price_main"), resolver.first(prod, "price_decimal")])
+    rating = resolver.first(prod, "rating_class")
+    review_count = resolver.first(prod, "review_text")
+    img_url = resolver.first(prod, "img_url")
+    return {
+        "title": title.strip(),
+        "price": price,
+        "rating": rating,
+        "review_count": review_count,
+        "url": product_url,
+        "img_url": img_url,
+        "category": category,
+    }
+
+
+def parse_cards(cards, category, resolver=None):
+    """
+    parses product cards into normalized product dicts, one normalization pass per page
+    """
+    items = [item for item in (parse_product_card(prod, category, resolver) for prod in cards) if item]
+    return normalize_products(items, RATING_CLASS, rating_type=int)
+
+
+def parse_page(html, category=None, resolver=None):
+    """
+    parses a stored results page offline (no Scrapy response needed)
+    """
+    resolver = resolver or default_resolver()
+    page = Selector(text=html)
+    return parse_cards(find_product_cards(page, resolver), category, resolver)
+
+
 class NeweggSpider(scrapy.Spider):
     name = "newegg"
 
-    def __init__(self, start_urls, config, results, max_pages=5, categories=None, user_agents=None, proxy_enabled=False, **kwargs):
+    def __init__(self, start_urls, config, results, max_pages=5, categories=None, user_agents=None, proxy_enabled=False,
+                 on_page=None, seen_session=None, checkpoint=None, **kwargs):
         super().__init__(**kwargs)
         self.start_urls = start_urls
         self.config = config
@@ -58,17 +158,55 @@ class NeweggSpider(scrapy.Spider):
         self.category_map = categories or {}
         self.user_agents = user_agents or ["Mozilla/5.0"]
         self.proxy_enabled = proxy_enabled
+        self.on_page = on_page
+        self.archive = get_archive((config or {}).get("archive"))
+        # staged by the scraper that started the crawl, which hands the keys on once it is finished
+        self.seen_session = seen_session
+        # CheckpointStore of the runner; pages are checkpointed and categories resumed when set
+        self.checkpoint = checkpoint
+        self.resolver = new_resolver()
         self.request_count = 0
 
+    def _deliver(self, category, page_num, page_items):
+        if self.on_page is not None:
+            self.on_page(category, page_num, page_items)
+        else:
+            self.results.extend(page_items)
+
+    def _resume_point(self, url, category):
+        """
+        returns (url, page) to start a category at, None when its checkpoint says it is complete
+        """
+        if self.checkpoint is None:
+            return url, 1
+        if not self.checkpoint.resume:
+            self.checkpoint.reset(self.name, category)
+            return url, 1
+        for page_num, page_items in self.checkpoint.completed_pages(self.name, category):
+            self._deliver(category, page_num, page_items)
+        state = self.checkpoint.state(self.name, category)
+        if state["done"] or (state["last_page"] and not state["next_url"]):
+            logger.info(f"Category {category} already completed, {state['products']} products from checkpoint")
+            return None
+        if state["next_url"]:
+            logger.info(f"Resuming category {category} at page {state['last_page'] + 1}")
+            return state["next_url"], state["last_page"] + 1
+        return url, 1
+
     def start_requests(self):
         for url in self.start_urls:
+            category = self.category_map.get(url, 'unknown')
+            start = self._resume_point(url, category)
+            if start is None:
+                continue
+            url, page_num = start
             if self.proxy_enabled:
                 api_url = SCRAPERAPI_ENDPOINT.format(url)
             else:
                 api_url = url
             meta = {
-                'category': self.category_map.get(url, 'unknown'),
-                'page_num': 1,
+                'category': category,
+                'page_num': page_num,
             }
             headers = get_browser_headers(self.user_agents)
             yield scrapy.Request(
@@ -92,98 +230,61 @@ class NeweggSpider(scrapy.Spider):
         url = response.url
         category = response.meta.get('category') or self.category_map.get(url, 'unknown')
         page_num = response.meta.get('page_num', 1)
+        if self.archive is not None:
+            self.archive.write(response.text, url=url, source=self.name, category=category, page=page_num)
 
-        product_selectors = [
-            "div.item-cell",
-            ".item-container",
-            "[data-testid='product-item']",
-            ".product-item"
-        ]
-        product_cards = []
-        for selector in product_selectors:
-            product_cards = response.css(selector)
-            if product_cards:
-                logger.info(f"Found products using selector: {selector}")
-                break
-
+        product_cards = find_product_cards(response, self.resolver)
         if not product_cards:
             logger.warning(f"No products found with any selector on {response.url}")
             logger.debug(f"Page content preview: {response.text[:1000]}")
             return
 
-        found = 0
-        for prod in product_cards:
-            title_selectors = ["a.item-title::text", ".item-title::text", "h3 a::text", ".product-title::text"]
-            url_selectors = ["a.item-title::attr(href)", ".item-title::attr(href)", "h3 a::attr(href)",
-                             ".product-title::attr(href)"]
-            title = None
-            product_url = None
-            for selector in title_selectors:
-                title = prod.css(selector).get()
-                if title:
-                    break
-            for selector in url_selectors:
-                product_url = prod.css(selector).get()
-                if product_url:
-                    break
-            price_main = (prod.css("li.price-current strong::text").get() or
-                          prod.css(".price-current strong::text").get() or
-                          prod.css(".price .price-main::text").get())
-            price_dec = (prod.css("li.price-current sup::text").get() or
-                         prod.css(".price-current sup::text").get() or
-                         prod.css(".price .price-decimal::text").get())
-            price = parse_price([price_main, price_dec])
-            rating_class = prod.css("a.item-rating::attr(class)").get()
-            rating = parse_rating(rating_class)
-            review_txt = prod.css("span.item-rating-num::text").get()
-            review_count = parse_review_count(review_txt)
-            img_url = (prod.css("a.item-img img::attr(src)").get() or
-                       prod.css("a.item-img img::attr(data-src)").get() or
-                       prod.css("img::attr(src)").get())
-            if title and product_url:
-                self.results.append({
-                    "title": title.strip(),
-                    "price": price,
-                    "rating": rating,
-                    "review_count": review_count,
-                    "url": product_url,
-                    "img_url": img_url,
-                    "category": category,
-                })
-                found += 1
+        page_items = parse_cards(product_cards, category, self.resolver)
+        found = len(page_items)
+        exhausted = False
+        if self.seen_session is not None:
+            page_items, exhausted = self.seen_session.filter_page(page_items)
+            if exhausted:
+                logger.info(f"Page {page_num} of {category} only has products seen unchanged before, "
+                            f"stopping pagination.")
 
+        self._deliver(category, page_num, page_items)
         logger.info(f"Found {found} products for category {category} on page {page_num}")
 
-        if page_num < self.max_pages and found > 0:
-            next_selectors = [
-                'a[title="Next"]::attr(href)',
-                'a[aria-label="Next"]::attr(href)',
-                '.pagination .next::attr(href)',
-                '.pager .next::attr(href)'
-            ]
-            next_page = None
-            for selector in next_selectors:
-                next_page = response.css(selector).get()
-                if next_page:
-                    break
-            if next_page:
-                if self.proxy_enabled:
-                    api_url = SCRAPERAPI_ENDPOINT.format(response.urljoin(next_page))
-                else:
-                    api_url = response.urljoin(next_page)
-                meta = {
-                    'category': category,
-                    'page_num': page_num + 1,
-                }
-                headers = get_browser_headers(self.user_agents)
-                yield scrapy.Request(
-                    api_url,
-                    callback=self.parse,
-                    errback=self.handle_error,
-                    headers=headers,
-                    meta=meta,
-                    dont_filter=True,
-                )
+        next_url = None
+        if page_num < self.max_pages and found > 0 and not exhausted:
+            next_page = self.resolver.first(response.selector, "next_page")
+            next_url = response.urljoin(next_page) if next_page else None
+        if self.checkpoint is not None:
+            self.checkpoint.record_page(self.name, category, page_num, page_items, next_url)
+            if next_url is None:
+                self.checkpoint.mark_done(self.name, category)
+
+        if next_url:
+            if self.proxy_enabled:
+                api_url = SCRAPERAPI_ENDPOINT.format(next_url)
+            else:
+                api_url = next_url
+            meta = {
+                'category': category,
+                'page_num': page_num + 1,
+            }
+            headers = get_browser_headers(self.user_agents)
+            yield scrapy.Request(
+                api_url,
+                callback=self.parse,
+                errback=self.handle_error,
+                headers=headers,
+                meta=meta,
+                dont_filter=True,
+            )
+
+    def closed(self, reason):
+        if self.seen_session is not None:
+            # a crawl that was shut down or crashed stages nothing, its pages are scraped again
+            if reason != "finished":
+                self.seen_session.discard()
+            logger.info(f"Seen-url filter stats ({reason}): {self.seen_session.seen.stats()}")
 
     def handle_error(self, failure):
         response = getattr(failure.value, 'response', None)
@@ -200,8 +301,10 @@ class NeweggSpider(scrapy.Spider):
 class NeweggScrapyScraper(BaseScraper):
     is_scrapy = True
 
-    def __init__(self, config):
+    def __init__(self, config, checkpoint=None):
         self.config = config
+        self.checkpoint = checkpoint
+        self.seen = get_seen_filter("newegg", config.get("seen_filter"))
 
     def fetch(self, urls):
         return self.scrape(urls)
@@ -209,7 +312,18 @@ class NeweggScrapyScraper(BaseScraper):
     def parse(self, content):
         pass
 
-    def scrape(self, urls):
+    def scrape(self, urls, on_page=None):
+        """
+        Runs the spider over all configured categories.
+
+        Args:
+            urls (list): Start URLs (kept for interface compatibility, categories come from config).
+            on_page (callable, optional): Called as on_page(category, page, items) for every parsed
+                page. When given, items are handed over page by page instead of being collected.
+
+        Returns:
+            list: Collected product dicts (empty when on_page is used).
+        """
         results = []
         categories = self.config.get("categories", {})
         url_to_category = {self.config["base_url"] + v: k for k, v in categories.items()}
@@ -217,11 +331,12 @@ class NeweggScrapyScraper(BaseScraper):
         user_agents = self.config.get("user_agents", ["Mozilla/5.0"])
         proxy_enabled = self.config.get("proxy_enabled", False)
 
-        process = CrawlerProcess(settings={
+        max_concurrency = self.config.get("concurrency", {}).get("max", 8)
+        settings = {
             "LOG_ENABLED": False,
             "DOWNLOAD_DELAY": self.config.get("delay", 0.5),
-            "CONCURRENT_REQUESTS": 8,
-            "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
+            "CONCURRENT_REQUESTS": max_concurrency,
+            "CONCURRENT_REQUESTS_PER_DOMAIN": max_concurrency,
             "AUTOTHROTTLE_ENABLED": False,
             "COOKIES_ENABLED": True,
             "ROBOTSTXT_OBEY": False,
@@ -229,8 +344,22 @@ class NeweggScrapyScraper(BaseScraper):
             "RETRY_HTTP_CODES": [429, 500, 502, 503, 504, 522, 524, 408],
             "DOWNLOADER_MIDDLEWARES": {
                 'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
+                # after RetryMiddleware (550) on requests, so retries are backed off
+                'src.scrapers.scrapy_crawler.newegg_crawler.middlewares.CircuitBreakerMiddleware': 560,
+                # responses run high to low: AIMD sees 429/5xx/timeouts before RetryMiddleware swallows them
+                'src.scrapers.scrapy_crawler.newegg_crawler.middlewares.AdaptiveConcurrencyMiddleware': 570,
             }
-        })
+        }
+        cache_config = self.config.get("http_cache") or {}
+        if cache_config.get("enabled"):
+            settings.update({
+                "HTTPCACHE_ENABLED": True,
+                "HTTPCACHE_DIR": cache_config.get("dir", "data_output/http_cache"),
+                "HTTPCACHE_STORAGE": 'src.scrapers.scrapy_crawler.newegg_crawler.httpcache.HttpCacheStorage',
+                "HTTPCACHE_POLICY": 'src.scrapers.scrapy_crawler.newegg_crawler.httpcache.TtlRevalidatePolicy',
+                "HTTP_CACHE_TTL": cache_config.get("ttl", 3600),
+            })
+        process = CrawlerProcess(settings=settings)
 
         max_pages = self.config.get("max_pages", 5)
         process.crawl(
@@ -242,6 +371,9 @@ class NeweggScrapyScraper(BaseScraper):
             categories=url_to_category,
             user_agents=user_agents,
             proxy_enabled=proxy_enabled,
+            on_page=on_page,
+            seen_session=self.seen_session(),
+            checkpoint=self.checkpoint,
         )
         process.start()
         logger.info(f"Scraped {len(results)} Newegg products.")
@@ -0,0 +1,293 @@
+import hashlib
+import math
+import os
+import re
+import struct
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.utils.logger import get_logger
+
+logger = get_logger("seen-filter")
+
+_MAGIC = b"SEENBLM1"
+_HEADER = struct.Struct("<QIQ")  # bit count, hash count, keys added
+
+# query parameters that change between visits of the same product (search ids, tracking)
+VOLATILE_PARAMS = frozenset({
+    "qid", "sr", "ref", "ref_", "crid", "sprefix", "keywords", "dib", "dib_tag", "content-id",
+    "_trksid", "_trkparms", "_skw", "hash", "itmmeta", "amdata", "epid", "cm_sp",
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+})
+_REF_SEGMENT = re.compile(r"/ref=[^/]*")
+
+
+def url_key(url):
+    """
+    Returns url without its fragment, tracking query parameters and Amazon '/ref=...' path segment,
+    so the same product found from different searches gives the same key.
+    """
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in VOLATILE_PARAMS]
+    path = _REF_SEGMENT.sub("", parts.path)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+class SeenUrlFilter:
+    """
+    Bloom filter of products seen in earlier runs, plus an exact set of the URLs seen in this one.
+
+    Every persisted product is recorded as 'url|price', so a known key means the product was seen
+    before and its price has not changed. The filter is loaded from disk when the scraper starts,
+    which lets an incremental crawl stop paginating as soon as a page holds only known, unchanged
+    products. Products whose URL already came up in this run (e.g. in an overlapping category)
+    are dropped before they reach the pipeline.
+
+    Scrapers filter pages through a SeenSession: its keys reach the filter, and the filter its
+    file, only when the session is committed after the products were persisted. Runners that
+    persist in another process ship the session's staged() keys there and call commit_staged().
+    A failed job, or a run whose products were never stored, leaves the filter as it was, so the
+    next run scrapes every page again.
+
+    The filter is sized for `capacity` keys at `error_rate` false positives: about 1.2 MB for a
+    million keys at 1%. A false positive can only make a changed product look unchanged, so the
+    worst case is stopping one page early.
+
+    Typical usage:
+        seen = SeenUrlFilter("data_output/seen/amazon.bloom")
+        session = seen.session()
+        fresh, exhausted = session.filter_page(products)
+        ... persist fresh ...
+        session.commit()
+
+    Args:
+        path (str): File the filter is loaded from and saved to.
+        capacity (int): Expected number of distinct keys (used when no file exists yet).
+        error_rate (float): Target false-positive rate at capacity.
+    """
+
+    def __init__(self, path, capacity=200_000, error_rate=0.01):
+        self.path = path
+        self._lock = threading.Lock()
+        self._run_urls = set()
+        self.dropped = 0
+        self.known_pages = 0
+        if not self._load():
+            self.bit_count = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+            self.bits = bytearray((self.bit_count + 7) // 8)
+            self.added = 0
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    raise ValueError("not a seen-url filter")
+                self.bit_count, self.hash_count, self.added = _HEADER.unpack(f.read(_HEADER.size))
+                self.bits = bytearray(f.read())
+            if len(self.bits) != (self.bit_count + 7) // 8:
+                raise ValueError("truncated filter")
+        except FileNotFoundError:
+            return False
+        except (ValueError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable seen-url filter {self.path}: {e}")
+            return False
+        logger.info(f"Loaded seen-url filter {self.path} ({self.added} keys)")
+        return True
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        return [(h1 + i * h2) % self.bit_count for i in range(self.hash_count)]
+
+    def _contains(self, positions):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def _add(self, positions):
+        for p in positions:
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._contains(self._positions(key))
+
+    def add(self, key):
+        """
+        Records key. Returns True if it was (probably) already there.
+        """
+        positions = self._positions(key)
+        with self._lock:
+            known = self._contains(positions)
+            if not known:
+                self._add(positions)
+                self.added += 1
+                self._dirty = True
+            return known
+
+    def session(self):
+        """
+        Returns a new SeenSession staging the keys of one scraper run.
+        """
+        return SeenSession(self)
+
+    def reset_run(self):
+        """
+        Forgets the URLs seen in the current run; called when a new run or job starts.
+        """
+        with self._lock:
+            self._run_urls.clear()
+
+    def _check_page(self, products, staged):
+        """
+        returns (fresh products, number of known products, keys to stage) for one page
+        """
+        fresh, known, keys = [], 0, []
+        with self._lock:
+            for product in products:
+                url = product.get("url")
+                if not url:
+                    fresh.append(product)
+                    continue
+                key = url_key(url)
+                entry = f"{key}|{product.get('price')}"
+                duplicate = key in self._run_urls
+                self._run_urls.add(key)
+                if entry in staged or self._contains(self._positions(entry)):
+                    known += 1
+                else:
+                    keys.append(entry)
+                if duplicate:
+                    self.dropped += 1
+                else:
+                    fresh.append(product)
+            if products and known == len(products):
+                self.known_pages += 1
+        return fresh, known, keys
+
+    def commit(self, keys):
+        """
+        Records persisted 'url|price' keys and saves the filter.
+        """
+        for key in keys:
+            self.add(key)
+        self.save()
+
+    def save(self):
+        """
+        Writes the filter to its path (atomically) if anything was added since it was loaded.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            if self.added > self.capacity:
+                logger.warning(f"Seen-url filter {self.path} holds {self.added} keys, more than its capacity "
+                               f"{self.capacity}; raise 'capacity' or delete the file to resize it")
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(_MAGIC)
+                f.write(_HEADER.pack(self.bit_count, self.hash_count, self.added))
+                f.write(self.bits)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def stats(self):
+        return {"keys": self.added, "dropped_duplicates": self.dropped, "known_pages": self.known_pages}
+
+
+class SeenSession:
+    """
+    The 'url|price' keys one scraper run staged in a SeenUrlFilter, committed once persisted.
+
+    filter_page() drops URLs already seen in this run right away, but the Bloom filter only learns
+    the page's products on commit(). Until then they count as known for this session alone.
+    """
+
+    def __init__(self, seen):
+        self.seen = seen
+        self.keys = set()
+
+    def filter_page(self, products):
+        """
+        Stages a page of product dicts and drops those whose URL was already seen in this run.
+
+        Returns:
+            tuple: (products to keep, True when the page had products and all of them were known,
+                    i.e. seen unchanged in an earlier run or already in this one).
+        """
+        fresh, known, keys = self.seen._check_page(products, self.keys)
+        self.keys.update(keys)
+        return fresh, bool(products) and known == len(products)
+
+    def commit(self):
+        """
+        Records the staged keys in the filter and saves it; call after the products were persisted.
+        """
+        keys, self.keys = self.keys, set()
+        if keys:
+            self.seen.commit(keys)
+
+    def staged(self):
+        """
+        Returns the staged keys as a picklable dict for commit_staged() (e.g. in the process that
+        persists the products), None when nothing is staged. The session is emptied.
+        """
+        keys, self.keys = self.keys, set()
+        if not keys:
+            return None
+        return {"path": self.seen.path, "capacity": self.seen.capacity, "error_rate": self.seen.error_rate,
+                "keys": sorted(keys)}
+
+    def discard(self):
+        self.keys.clear()
+
+
+_filters = {}
+_filters_lock = threading.Lock()
+
+
+def get_seen_filter(source, config=None):
+    """
+    Returns the process-wide SeenUrlFilter of a source for a 'seen_filter' config section,
+    or None when disabled. Category scrapers of the same source share it.
+    """
+    config = config or {}
+    if not config.get("enabled"):
+        return None
+    path = os.path.join(config.get("dir", "data_output/seen"), f"{source}.bloom")
+    return _filter_at(path, config.get("capacity", 200_000), config.get("error_rate", 0.01))
+
+
+def _filter_at(path, capacity, error_rate):
+    key = os.path.abspath(path)
+    with _filters_lock:
+        seen = _filters.get(key)
+        if seen is None:
+            seen = _filters[key] = SeenUrlFilter(path, capacity=capacity, error_rate=error_rate)
+        return seen
+
+
+def commit_staged(staged):
+    """
+    Commits SeenSession.staged() dicts to their filters (loaded from disk when this process has
+    not opened them yet); call once the products they belong to are persisted.
+    """
+    for entry in staged:
+        if entry:
+            seen = _filter_at(entry["path"], entry["capacity"], entry["error_rate"])
+            seen.commit(entry["keys"])
+
+
+def reset_seen_runs():
+    """
+    Starts a new run for every seen-url filter of this process (see SeenUrlFilter.reset_run).
+    """
+    with _filters_lock:
+        filters = list(_filters.values())
+    for seen in filters:
+        seen.reset_run()
@@ -1,62 +1,99 @@
 import random
 import re
 import time
+from concurrent.futures import Future
+from functools import partial
 
-from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.common import TimeoutException
 from selenium.webdriver import ActionChains
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.normalize import normalize_product, normalize_products
+from src.scrapers.page_archive import get_archive
+from src.scrapers.parser_backend import get_backend
+from src.scrapers.seen_filter import get_seen_filter
+from src.scrapers.selenium.browser import driver_alive, get_cache_slots, launch_chrome, resolve_profile
+from src.scrapers.selenium.driver_manager import get_driver_manager
+from src.scrapers.selenium.extraction import JS_HELPERS, run_extractor
+from src.scrapers.selenium.page_state import BLOCK, RESULTS, get_classifier, until_ready_or_dead_end
+from src.scrapers.selenium.pagination import DriverPool, iter_fan_out, page_url, url_pagination_detected
+from src.scrapers.selenium.tiered_fetch import TieredFetcher
+from src.scrapers.selenium.waits import Politeness, page_changed, ready_condition
+from src.utils.concurrency import get_controller
 from src.utils.logger import get_logger
+from src.utils.resilience import backoff_delay, get_breaker
 
 logger = get_logger("amazon-selenium")
 
 
-def extract_rating(node):
-    tag = node.select_one("i.a-icon-star-mini span.a-icon-alt") \
-          or node.select_one("i.a-icon-star span.a-icon-alt") \
-          or node.select_one(".a-icon-alt")
-    if tag and tag.get_text(strip=True):
-        rating_text = tag.get_text(strip=True)
+def extract_rating(node, backend=None):
+    backend = backend or get_backend("soup")
+    tag = backend.select_one(node, "i.a-icon-star-mini span.a-icon-alt")
+    if tag is None:
+        tag = backend.select_one(node, "i.a-icon-star span.a-icon-alt")
+    if tag is None:
+        tag = backend.select_one(node, ".a-icon-alt")
+    if tag is not None and backend.text(tag):
+        rating_text = backend.text(tag)
         m = re.match(r"([\d.]+)", rating_text)
         if m:
             return m.group(1)
-    tag = node.select_one("span.a-size-small.a-color-base")
-    if tag:
-        m = re.match(r"([\d.]+)", tag.get_text(strip=True))
+    tag = backend.select_one(node, "span.a-size-small.a-color-base")
+    if tag is not None:
+        m = re.match(r"([\d.]+)", backend.text(tag))
         if m:
             return m.group(1)
     return None
 
 
-def extract_price(node):
-    for price_tag in node.select(".a-offscreen"):
-        text = price_tag.get_text(strip=True)
+def extract_price(node, backend=None):
+    backend = backend or get_backend("soup")
+    for price_tag in backend.select(node, ".a-offscreen"):
+        text = backend.text(price_tag)
         if re.match(r'^[\$\€\£]\s?\d', text):
             return text
 
-    whole = node.select_one(".a-price-whole")
-    frac = node.select_one(".a-price-fraction")
-    if whole and frac:
-        return f"${whole.text.strip()}.{frac.text.strip()}"
-    if whole:
-        return f"${whole.text.strip()}"
-
-    parent = node.find_parent() if hasattr(node, "find_parent") else None
-    if parent:
-        for price_tag in parent.select(".a-offscreen"):
-            text = price_tag.get_text(strip=True)
+    whole = backend.select_one(node, ".a-price-whole")
+    frac = backend.select_one(node, ".a-price-fraction")
+    if whole is not None and frac is not None:
+        return f"${backend.text(whole, strip=False).strip()}.{backend.text(frac, strip=False).strip()}"
+    if whole is not None:
+        return f"${backend.text(whole, strip=False).strip()}"
+
+    parent = backend.parent(node)
+    if parent is not None:
+        for price_tag in backend.select(parent, ".a-offscreen"):
+            text = backend.text(price_tag)
             if re.match(r'^[\$\€\£]\s?\d', text):
                 return text
 
     return None
 
 
+CARD_SELECTOR = "div[data-component-type='s-search-result']"
+PAGE_PARAM = "page"
+PAGINATION_LINKS = "a.s-pagination-item, a.s-pagination-next"
+PAGE_SIGNALS = {
+    "block_selectors": ["form[action*='validateCaptcha']", "input#captchacharacters", "img[src*='/captcha/']"],
+    "block_urls": ["/errors/validateCaptcha", "/captcha/"],
+    "block_phrases": ["type the characters you see in this image",
+                      "enter the characters as they are shown in the image"],
+    "empty_phrases": ["no results for"],
+}
+
+
+def parse_page(html, backend=None, partial=False):
+    """
+    parses a search results page into product dicts, without needing a driver
+    """
+    backend = backend or get_backend()
+    cards = backend.cards(html, CARD_SELECTOR, partial=partial)
+    return normalize_products([extract_product(card, backend) for card in cards], unparsed_count=0)
+
+
 agents = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 12_6_3) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
@@ -64,58 +101,42 @@ agents = [
 
 
 def clean_product_fields(prod):
-    p = prod.copy()
-    if isinstance(p.get('price'), str):
-        price_clean = re.sub(r'[^\d.,]', '', p['price'])
-        try:
-            p['price'] = float(price_clean.replace(',', ''))
-        except:
-            p['price'] = None
-    if 'rating' in p and p['rating'] is not None:
-        try:
-            p['rating'] = float(str(p['rating']).replace(',', '').strip())
-        except:
-            p['rating'] = None
-    if 'review_count' in p and p['review_count'] is not None:
-        review_str = str(p['review_count']).replace(',', '').strip()
-        try:
-            p['review_count'] = int(review_str)
-        except:
-            p['review_count'] = 0
-    return p
+    return normalize_product(prod, unparsed_count=0)
 
 
-def parse_product(product_html):
+def extract_product(product_html, backend=None):
     """
-    extracts data from a single search result page block
+    extracts the raw fields of a single search result page block (price/rating/reviews as text)
     """
-    sg_col_inner = product_html.select_one("div.sg-col-inner")
+    backend = backend or get_backend("soup")
+    sg_col_inner = backend.select_one(product_html, "div.sg-col-inner")
 
-    title_tag = sg_col_inner.select_one("h2 span") if sg_col_inner else None
-    title = title_tag.get_text(strip=True) if title_tag else None
+    title_tag = backend.select_one(sg_col_inner, "h2 span") if sg_col_inner is not None else None
+    title = backend.text(title_tag) if title_tag is not None else None
 
-    url_tag = sg_col_inner.select_one("h2 a") if sg_col_inner else None
-    if not url_tag:
-        url_tag = product_html.select_one("a[href*='/dp/']")
-    url = f"https://www.amazon.com{url_tag['href']}" if url_tag and url_tag.has_attr('href') else None
+    url_tag = backend.select_one(sg_col_inner, "h2 a") if sg_col_inner is not None else None
+    if url_tag is None:
+        url_tag = backend.select_one(product_html, "a[href*='/dp/']")
+    href = backend.attr(url_tag, 'href') if url_tag is not None else None
+    url = f"https://www.amazon.com{href}" if href is not None else None
 
-    img_tag = sg_col_inner.select_one("img.s-image") if sg_col_inner else None
-    img_url = img_tag['src'] if img_tag else None
+    img_tag = backend.select_one(sg_col_inner, "img.s-image") if sg_col_inner is not None else None
+    img_url = backend.attr(img_tag, 'src') if img_tag is not None else None
 
-    price = extract_price(sg_col_inner) if sg_col_inner else None
+    price = extract_price(sg_col_inner, backend) if sg_col_inner is not None else None
     if not price:
-        price = extract_price(product_html)
+        price = extract_price(product_html, backend)
 
-    rating = extract_rating(sg_col_inner) if sg_col_inner else None
+    rating = extract_rating(sg_col_inner, backend) if sg_col_inner is not None else None
     if not rating:
-        rating = extract_rating(product_html)
+        rating = extract_rating(product_html, backend)
 
-    review_cnt_tag = sg_col_inner.select_one(
-        "div[data-cy='reviews-block'] span.a-size-small.puis-normal-weight-text"
-    ) if sg_col_inner else None
-    if not review_cnt_tag and sg_col_inner:
-        review_cnt_tag = sg_col_inner.select_one("span.a-size-base.s-underline-text")
-    review_cnt = review_cnt_tag.get_text(strip=True).strip("()") if review_cnt_tag else None
+    review_cnt_tag = backend.select_one(
+        sg_col_inner, "div[data-cy='reviews-block'] span.a-size-small.puis-normal-weight-text"
+    ) if sg_col_inner is not None else None
+    if review_cnt_tag is None and sg_col_inner is not None:
+        review_cnt_tag = backend.select_one(sg_col_inner, "span.a-size-base.s-underline-text")
+    review_cnt = backend.text(review_cnt_tag).strip("()") if review_cnt_tag is not None else None
 
     product = {
         'title': title,
@@ -125,8 +146,89 @@ def parse_product(product_html):
         'review_count': review_cnt,
         'img_url': img_url
     }
+    return product
+
+
+def parse_product(product_html, backend=None):
+    """
+    extracts data from a single search result page block
+    """
+    return normalize_product(extract_product(product_html, backend), unparsed_count=0)
+
+
+# in-browser counterpart of parse_product(): one execute_script call returns the raw fields of every card
+EXTRACT_SCRIPT = JS_HELPERS + r"""
+const PRICE = /^[$€£]\s?\d/;
+const priceIn = (root) => {
+  if (!root) return null;
+  for (const el of root.querySelectorAll('.a-offscreen')) {
+    const t = text(el);
+    if (PRICE.test(t)) return t;
+  }
+  const whole = one(root, '.a-price-whole');
+  const frac = one(root, '.a-price-fraction');
+  if (whole && frac) return '$' + raw(whole) + '.' + raw(frac);
+  if (whole) return '$' + raw(whole);
+  const parent = root.parentElement;
+  if (parent) {
+    for (const el of parent.querySelectorAll('.a-offscreen')) {
+      const t = text(el);
+      if (PRICE.test(t)) return t;
+    }
+  }
+  return null;
+};
+const ratingIn = (root) => {
+  if (!root) return null;
+  const tag = one(root, 'i.a-icon-star-mini span.a-icon-alt') || one(root, 'i.a-icon-star span.a-icon-alt')
+    || one(root, '.a-icon-alt');
+  let m = tag && text(tag) ? text(tag).match(/^([\d.]+)/) : null;
+  if (m) return m[1];
+  const small = one(root, 'span.a-size-small.a-color-base');
+  m = small ? text(small).match(/^([\d.]+)/) : null;
+  return m ? m[1] : null;
+};
+return Array.from(document.querySelectorAll(arguments[0]), (card) => {
+  const inner = one(card, 'div.sg-col-inner');
+  const link = one(inner, 'h2 a') || one(card, "a[href*='/dp/']");
+  const reviews = one(inner, "div[data-cy='reviews-block'] span.a-size-small.puis-normal-weight-text")
+    || one(inner, 'span.a-size-base.s-underline-text');
+  return {
+    title: text(one(inner, 'h2 span')),
+    href: attr(link, 'href'),
+    price: priceIn(inner) || priceIn(card),
+    rating: ratingIn(inner) || ratingIn(card),
+    review_count: reviews ? text(reviews).replace(/^[()]+|[()]+$/g, '') : null,
+    img_url: attr(one(inner, 'img.s-image'), 'src'),
+  };
+});
+"""
+
+
+def product_from_record(record):
+    """
+    maps an EXTRACT_SCRIPT record to the raw fields of extract_product()
+    """
+    href = record.get('href')
+    product = {
+        'title': record.get('title'),
+        'price': record.get('price'),
+        'rating': record.get('rating'),
+        'url': f"https://www.amazon.com{href}" if href is not None else None,
+        'review_count': record.get('review_count'),
+        'img_url': record.get('img_url'),
+    }
+    return product
+
 
-    return clean_product_fields(product)
+def extract_products(driver):
+    """
+    extracts the products of the loaded page in the browser, None when extraction failed
+    """
+    records = run_extractor(driver, EXTRACT_SCRIPT, CARD_SELECTOR)
+    if records is None:
+        return None
+    return normalize_products([product_from_record(r) for r in records], unparsed_count=0)
 
 from src.scrapers.factory import ScraperFactory
 
@@ -143,65 +245,150 @@ class AmazonSeleniumScraper(BaseScraper):
     is_scrapy = False
 
 
-    def __init__(self, config):
+    def __init__(self, config, parse_pool=None):
         self.user_agents = config.get("user_agents", agents)
         self.max_retries = config.get("max_retries", 3)
         self.base_url = config['base_url']
         self.categories = config['categories']
         self.max_pages = config['max_pages']
         self.delay = config['delay']
-        self.driver = self._init_driver()
+        self.politeness = Politeness(self.delay, config.get("delay_jitter", 0))
+        self.waits = config.get("waits") or {}
+        self.wait_timeout = self.waits.get("timeout", 30)
+        self.pagination = config.get("pagination") or {}
+        self._pool = None
+        self.concurrency = get_controller("amazon", config.get("concurrency"))
+        resilience = config.get("resilience") or {}
+        self.breaker = get_breaker(self.base_url, resilience)
+        self.backoff = {"base": resilience.get("backoff_base", 1.0), "cap": resilience.get("backoff_cap", 60.0)}
+        self.parser = get_backend(config.get("parser"))
+        self.partial_parse = config.get("partial_parse", False)
+        # a ParsePool handed in by the runner: raw pages are parsed there instead of on this thread
+        self.parse_pool = parse_pool
+        self.parse_options = {"parser": config.get("parser"), "partial_parse": self.partial_parse}
+        self.extraction = config.get("extraction", "dom")
+        self.archive = get_archive(config.get("archive"))
+        self.page_state = get_classifier("amazon", CARD_SELECTOR, **PAGE_SIGNALS)
+        self.seen = get_seen_filter("amazon", config.get("seen_filter"))
+        self.category = config.get("category")
+        self.browser_profile = resolve_profile(config.get("browser_profile"))
+        cache_root = self.browser_profile["disk_cache_dir"]
+        self.cache_slots = get_cache_slots(cache_root) if cache_root else None
+        self.driver_manager = self._init_driver_manager(config.get("driver_manager") or {})
+        # managed drivers keep their cache in their persistent profile
+        self.cache_dir = self.cache_slots.acquire() if self.cache_slots and self.driver_manager is None else None
+        self.tiered = self._init_tiered(config.get("tiered_fetch") or {})
+        # the main driver starts on first use: pages served over HTTP never launch Chrome
+        self._lease = None
+        self._driver = None
         logger.info("AmazonSeleniumScraper initialized.")
 
-    def _init_driver(self):
-        options = Options()
-        options.add_argument("--headless")
-        user_agent = random.choice(self.user_agents)
-        options.add_argument(f"user-agent={user_agent}")
-        logger.info(f"Selected User-Agent: {user_agent}")
-        return webdriver.Chrome(options=options)
-
-    def wait_for_products(self, timeout=30):
+    @property
+    def driver(self):
         """
-        wait until product blocks are loaded.
+        the main driver, started (or leased when drivers are managed) on first use
         """
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-component-type='s-search-result']"))
-            )
-        except Exception as e:
-            if self.is_captcha_page():
-                logger.warning("CAPTCHA detected. Solve or rotate proxy/user-agent.", e)
+        if self._driver is None:
+            if self.driver_manager is not None:
+                self._lease = self.driver_manager.acquire()
+                self._driver = self._lease.driver
             else:
-                logger.warn("Timed out waiting for product content.")
+                self._driver = self._init_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
 
-    def is_captcha_page(self):
+    def _init_tiered(self, tiered):
         """
-        detects if a captcha is shown
+        HTTP-first page fetching (see TieredFetcher), None unless tiered_fetch is enabled
         """
-        src = self.driver.page_source
-        return (
-                "Type the characters you see in this image" in src or
-                "/captcha/" in src or
-                "enter the characters as they are shown in the image" in src
+        if not tiered.get("enabled"):
+            return None
+        return TieredFetcher(
+            "amazon",
+            self.parse,
+            block_urls=PAGE_SIGNALS.get("block_urls", []),
+            block_phrases=PAGE_SIGNALS.get("block_phrases", []),
+            empty_phrases=PAGE_SIGNALS.get("empty_phrases", []),
+            min_cards=tiered.get("min_cards", 10),
+            min_priced=tiered.get("min_priced", 0.5),
+            pool_size=self.pagination.get("pool_size", 3),
+            delay=self.delay,
+            jitter=self.politeness.jitter,
+            headers={"User-Agent": random.choice(self.user_agents), "Accept-Language": "en-US,en;q=0.9"},
+            give_up_after=tiered.get("give_up_after", 5),
+            on_page=lambda url, html, page: self.archive_page("amazon", url, html, page),
+            concurrency=self.concurrency,
+            breaker=self.breaker,
         )
 
+    def _init_driver_manager(self, managed):
+        """
+        warm, recycled drivers on persistent profiles (see DriverManager), None unless driver_manager is enabled
+        """
+        if not managed.get("enabled"):
+            return None
+        # built from settings only: the shared manager outlives this scraper and must not hold it
+        factory = partial(launch_chrome, list(self.user_agents), self.browser_profile)
+        return get_driver_manager("amazon", managed, factory)
+
+    def _init_driver(self, cache_dir=None, user_data_dir=None):
+        return launch_chrome(self.user_agents, self.browser_profile, user_data_dir, cache_dir or self.cache_dir)
+
+    def wait_for_products(self, timeout=None, driver=None):
+        """
+        wait until the product list has finished rendering. Returns True once the page is settled
+        (results or an empty search), False on timeout or a block/captcha page.
+        """
+        driver = driver or self.driver
+        condition = until_ready_or_dead_end(ready_condition(CARD_SELECTOR, self.waits), self.page_state)
+        try:
+            WebDriverWait(driver, timeout or self.wait_timeout, poll_frequency=0.1).until(condition)
+        except Exception:
+            state = self.page_state.classify(driver)
+            logger.warning(f"Timed out waiting for product content (page state: {state}).")
+            return False
+        state = self.page_state.record(condition.state or RESULTS)
+        if state == BLOCK:
+            logger.warning("CAPTCHA detected. Solve or rotate proxy/user-agent.")
+            return False
+        return True
+
+    def is_captcha_page(self, driver=None):
+        """
+        detects if a captcha / block page is shown, without serializing the DOM
+        """
+        return self.page_state.probe(driver or self.driver) == BLOCK
+
     def fetch(self, url, retries=3):
         retries = retries if retries is not None else self.max_retries
         for attempt in range(1, retries + 1):
             try:
                 logger.info(f"Fetching URL (attempt {attempt}): {url}")
-                self.driver.get(url)
-                time.sleep(random.uniform(self.delay, self.delay + 2))
-                try:
-                    self.wait_for_products()
-                except Exception as e:
-                    if self.is_captcha_page():
-                        logger.warning("CAPTCHA detected. Solve or rotate proxy/user-agent.", e)
-                    else:
-                        logger.error("Timed out waiting for product content.", e, exc_info=True)
-                return self.driver.page_source
+                self.politeness.wait()
+                self.breaker.wait()
+                with self.concurrency.request() as outcome:
+                    self.driver.get(url)
+                    try:
+                        if self.wait_for_products():
+                            self.breaker.record_success()
+                        else:
+                            outcome.failed()
+                            self.breaker.record_failure()
+                    except Exception as e:
+                        outcome.failed()
+                        self.breaker.record_failure()
+                        if self.is_captcha_page():
+                            logger.warning("CAPTCHA detected. Solve or rotate proxy/user-agent.", e)
+                        else:
+                            logger.error("Timed out waiting for product content.", e, exc_info=True)
+                html = self.driver.page_source
+                self._page_done()
+                return html
             except Exception as e:
+                self.breaker.record_failure()
                 if self.is_captcha_page():
                     logger.warning("CAPTCHA detected. Use proxy/user-agent rotation or solve manually.")
                     self.driver.save_screenshot(f"logs/captcha_{int(time.time())}.png")
@@ -209,80 +396,256 @@ class AmazonSeleniumScraper(BaseScraper):
                 else:
                     logger.error(f"Error fetching page on attempt {attempt}: {e}", exc_info=True)
                     if attempt < retries:
-                        logger.info("Retrying fetch...")
-                        self.driver.quit()
-                        self.driver = self._init_driver()
-                        time.sleep(2)
+                        pause = backoff_delay(attempt, **self.backoff)
+                        logger.info(f"Retrying fetch in {pause:.1f}s...")
+                        if not driver_alive(self.driver):
+                            logger.info("Browser session is gone, relaunching Chrome.")
+                            self._replace_driver()
+                        time.sleep(pause)
                     else:
                         logger.error("Max fetch retries reached.")
                         raise
         return self.driver.page_source
 
     def parse(self, html):
-        soup = BeautifulSoup(html, "html.parser")
-        products = soup.select("div[data-component-type='s-search-result']")
-        all_products = []
-        for product_html in products:
-            data = parse_product(product_html)
-            all_products.append(data)
+        if self.parse_pool is not None:
+            all_products = self.parse_pool.parse("amazon", html, self.parse_options, self.category)
+        else:
+            all_products = parse_page(html, self.parser, self.partial_parse)
         logger.info(f"Parsed {len(all_products)} valid products from page.")
         return all_products
 
-    def scrape_category(self, category_url, max_pages=None, delay=None):
+    def iter_pages(self, category_url, max_pages=None, delay=None, start_page=1):
         """
-        scrapes pages for a given search results, supports pagination
+        walks the search result pages and yields (page, products) as soon as each page is parsed
 
         Args:
             category_url (str): URL of the search - category.
             max_pages (int, optional): Number of pages to scrape.
             delay (int, optional): Seconds to wait between pages.
+            start_page (int, optional): First page to parse; earlier pages are skipped with URL pagination
+                and only clicked through otherwise.
 
-        Returns:
-            list: All product dicts found across all pages.
+        Yields:
+            tuple: (page number, list of product dicts on that page).
         """
-        all_products = []
+        yield from self.skip_seen(self._walk_pages(category_url, max_pages, delay, start_page))
+
+    def _walk_pages(self, category_url, max_pages=None, delay=None, start_page=1):
         max_pages = max_pages or self.max_pages
-        delay = delay or self.delay
+        politeness = self.politeness if delay is None else Politeness(delay)
+        mode = self.pagination.get("mode", "auto")
+
+        if self.tiered is not None and mode != "click":
+            pages = range(max(1, start_page), max_pages + 1)
+            yield from iter_fan_out(lambda p: self._scrape_page_tiered(category_url, p, delay), pages,
+                                    self.pagination.get("pool_size", 3))
+            return
+
+        loaded = False
+        if mode != "click":
+            politeness.wait()
+            self._load(category_url)
+            loaded = True
+            if mode == "url" or url_pagination_detected(self.driver, PAGINATION_LINKS, PAGE_PARAM):
+                if start_page <= 1:
+                    yield 1, self._scrape_loaded(1)
+                pages = range(max(2, start_page), max_pages + 1)
+                yield from iter_fan_out(lambda p: self._scrape_page_url(category_url, p, delay), pages,
+                                        self.pagination.get("pool_size", 3))
+                return
+            logger.info("URL pagination not detected, falling back to clicking next.")
 
-        self.driver.get(category_url)
         for page in range(1, max_pages + 1):
-            logger.info(f"Scraping Amazon page {page}: {self.driver.current_url}")
+            if page > 1 or not loaded:
+                politeness.wait()
+                if page == 1:
+                    self._load(category_url)
+                elif not self._load(click_next=True):
+                    break
+            if page < start_page:
+                continue
+            yield page, self._scrape_loaded(page)
 
-            self.wait_for_products()
+    def _load(self, url=None, driver=None, click_next=False):
+        """
+        opens url (or clicks "next") and waits for the product list; the in-flight slot covers the
+        navigation itself. Returns False when click_next finds no next page.
+        """
+        driver = driver or self.driver
+        if url or click_next:
+            self.breaker.wait()
+        with self.concurrency.request() as outcome:
+            if click_next and not self._click_next():
+                return False
+            if url:
+                try:
+                    driver.get(url)
+                except Exception:
+                    # a page load that times out or loses the session counts against the domain too
+                    self.breaker.record_failure()
+                    raise
+            if self.wait_for_products(driver=driver):
+                self.breaker.record_success()
+            else:
+                outcome.failed()
+                self.breaker.record_failure()
+        return True
 
-            html = self.driver.page_source
-            page_products = self.parse(html)
+    def _scrape_loaded(self, page, driver=None, defer=False):
+        """
+        scrapes the page loaded in driver; with defer, a page parsed in the parse pool is returned
+        as a future of its products, so the driver can move on while the page is parsed
+        """
+        driver = driver or self.driver
+        logger.info(f"Scraping Amazon page {page}: {driver.current_url}")
+        page_products = extract_products(driver) if self.extraction == "js" else None
+        # page_source is only serialized when parsing falls back to it or the page is archived
+        if page_products is None or self.archive is not None:
+            html = driver.page_source
+            self.archive_page("amazon", driver.current_url, html, page)
+            if page_products is None and defer and self.parse_pool is not None:
+                page_products = self.parse_pool.parse_later("amazon", html, self.parse_options, self.category)
+            elif page_products is None:
+                page_products = self.parse(html)
+        if driver is self.driver:
+            # pagination may continue from this page, the budget is applied on release
+            self._page_done(swap=False)
+        if isinstance(page_products, Future):
+            logger.info(f"Queued page {page} for parsing.")
+        else:
             logger.info(f"Found {len(page_products)} products on page {page}.")
-            all_products.extend(page_products)
-            time.sleep(delay)
+        return page_products
 
-            if page < max_pages:
-                try:
-                    self.driver.execute_script("""
-                                    let cover = document.getElementById('nav-cover');
-                                    if (cover) { cover.style.display = 'none'; }
-                                """)
-                    next_btn = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "a.s-pagination-next:not(.s-pagination-disabled)"))
-                    )
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-                    time.sleep(0.5)
-                    actions = ActionChains(self.driver)
-                    actions.move_to_element(next_btn).pause(0.2).click().perform()
-                except TimeoutException:
-                    logger.warning("No next page or next button not clickable after waiting.")
-                    break
-                except Exception as e:
-                    logger.warning(f"Failed to click next: {e}", exc_info=True)
-                    break
+    def driver_pool(self):
+        """
+        lazily started pool of extra drivers for URL pagination, leased from the driver manager when enabled
+        """
+        if self._pool is None:
+            self._pool = DriverPool(
+                self._init_driver,
+                size=self.pagination.get("pool_size", 3),
+                delay=self.delay,
+                jitter=self.politeness.jitter,
+                cache_slots=self.cache_slots,
+                driver_manager=self.driver_manager,
+            )
+        return self._pool
+
+    def _scrape_page_url(self, category_url, page, delay=None):
+        """
+        fetches one result page by URL on a pooled driver
+        """
+        pool = self.driver_pool()
+        pooled = pool.acquire()
+        try:
+            if delay is not None:
+                pooled.politeness.delay = delay
+            pooled.politeness.wait()
+            self._load(page_url(category_url, PAGE_PARAM, page), pooled.driver)
+            products = self._scrape_loaded(page, pooled.driver, defer=True)
+            pool.page_done(pooled)
+            return products
+        except Exception:
+            pooled.broken = True
+            raise
+        finally:
+            pool.release(pooled)
+
+    def _scrape_page_tiered(self, category_url, page, delay=None):
+        """
+        fetches one result page over plain HTTP, or on a pooled driver when the page needs a browser
+        """
+        url = category_url if page == 1 else page_url(category_url, PAGE_PARAM, page)
+        return self.tiered.fetch(url, lambda: self._scrape_page_url(category_url, page, delay), page)
+
+    def _click_next(self):
+        """
+        clicks the "next" pagination button, returns False when there is no next page
+        """
+        try:
+            self.driver.execute_script("""
+                            let cover = document.getElementById('nav-cover');
+                            if (cover) { cover.style.display = 'none'; }
+                        """)
+            next_btn = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.s-pagination-next:not(.s-pagination-disabled)"))
+            )
+            cards = self.driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
+            changed = page_changed(cards[0] if cards else None, self.driver.current_url)
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
+            actions = ActionChains(self.driver)
+            actions.move_to_element(next_btn).pause(0.2).click().perform()
+            WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.1).until(changed)
+            return True
+        except TimeoutException:
+            logger.warning("No next page, or the page did not change after clicking next.")
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to click next: {e}", exc_info=True)
+            return False
+
+    def scrape_category(self, category_url, max_pages=None, delay=None):
+        """
+        scrapes pages for a given search results, supports pagination
 
-        logger.info(f"Scraping {self.driver.current_url} completed. Total products: {len(all_products)}")
+        Args:
+            category_url (str): URL of the search - category.
+            max_pages (int, optional): Number of pages to scrape.
+            delay (int, optional): Seconds to wait between pages.
+
+        Returns:
+            list: All product dicts found across all pages.
+        """
+        all_products = []
+        for _, page_products in self.iter_pages(category_url, max_pages, delay):
+            all_products.extend(page_products)
+        logger.info(f"Scraping {category_url} completed. Total products: {len(all_products)}")
         return all_products
 
     def scrape(self, url: str):
         logger.info(f"Starting scrape for URL: {url}")
         return self.scrape_category(url)
 
+    def _replace_driver(self):
+        """
+        swaps a dead main driver for a new one (a warm one when drivers are managed)
+        """
+        if self._lease is not None:
+            self._lease = self.driver_manager.replace(self._lease)
+            self.driver = self._lease.driver
+            return
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self._init_driver()
+
+    def _page_done(self, swap=True):
+        """
+        counts a page served by the main driver; a managed driver over its budget is swapped
+        for a warm one unless swap is False (the caller still needs the loaded page)
+        """
+        if self._lease is not None:
+            self._lease = self.driver_manager.page_done(self._lease, swap=swap)
+            self.driver = self._lease.driver
+
     def close(self):
-        self.driver.quit()
+        if self._pool is not None:
+            self._pool.close()
+        if self._lease is not None:
+            # handed back warm for the next category
+            self.driver_manager.release(self._lease)
+            logger.info(f"Drivers: {self.driver_manager.stats()}")
+        elif self._driver is not None:
+            self._driver.quit()
+        logger.info(f"Page states: {self.page_state.stats()}")
+        if self.tiered is not None:
+            self.tiered.close()
+            logger.info(f"Fetch tiers: {self.tiered.stats()}")
+        if self.seen is not None:
+            # staged keys reach the filter only after the runner has persisted the products
+            logger.info(f"Seen-url filter stats: {self.seen.stats()}")
+        if self.cache_slots:
+            self.cache_slots.release(self.cache_dir)
         logger.info("Closed Selenium WebDriver.")
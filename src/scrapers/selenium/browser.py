@@ -0,0 +1,222 @@
+import os
+import random
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from src.utils.logger import get_logger
+
+logger = get_logger("browser-profile")
+
+# URL patterns handed to Network.setBlockedURLs, per resource type
+BLOCKED_URL_PATTERNS = {
+    "images": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg", "*.wav"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheets": ["*.css"],
+}
+# content settings that Chrome can switch off itself, before any request is made
+_CONTENT_SETTING_PREFS = {
+    "images": "profile.managed_default_content_settings.images",
+}
+
+DEFAULT_PROFILE = {
+    "block": ["images", "media", "fonts"],
+    "page_load_strategy": "eager",
+    "disable_gpu": True,
+    "disable_extensions": True,
+    "disk_cache_dir": None,
+    "disk_cache_mb": 256,
+}
+
+
+def resolve_profile(config=None):
+    """
+    Returns the effective browser profile for a 'browser_profile' config section.
+    A missing section gives the lightweight default; 'enabled: false' gives a plain browser.
+    """
+    config = config or {}
+    if config.get("enabled", True) is False:
+        return {"block": [], "page_load_strategy": "normal", "disable_gpu": False,
+                "disable_extensions": False, "disk_cache_dir": None, "disk_cache_mb": None}
+    profile = {**DEFAULT_PROFILE, **config}
+    unknown = [name for name in profile["block"] if name not in BLOCKED_URL_PATTERNS]
+    if unknown:
+        raise ValueError(f"Unknown resource types to block: {unknown} (known: {sorted(BLOCKED_URL_PATTERNS)})")
+    return profile
+
+
+def blocked_url_patterns(profile):
+    patterns = []
+    for name in profile["block"]:
+        patterns.extend(BLOCKED_URL_PATTERNS[name])
+    return patterns
+
+
+def build_chrome_options(user_agent, profile, cache_dir=None, headless=True, user_data_dir=None):
+    """
+    Builds Chrome options for a resolved browser profile.
+
+    Args:
+        user_agent (str): User-Agent header for the session.
+        profile (dict): Result of resolve_profile().
+        cache_dir (str, optional): Disk cache directory leased via CacheSlots.
+        headless (bool): Run without a window.
+        user_data_dir (str, optional): Persistent profile directory (keeps cookies and, without
+                                       cache_dir, the HTTP cache between launches).
+
+    Returns:
+        Options: Chrome options; resources Chrome cannot drop through prefs are
+        blocked later by apply_network_blocking().
+    """
+    options = Options()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument(f"user-agent={user_agent}")
+    options.page_load_strategy = profile["page_load_strategy"]
+    if profile["disable_gpu"]:
+        options.add_argument("--disable-gpu")
+    if profile["disable_extensions"]:
+        options.add_argument("--disable-extensions")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(user_data_dir)}")
+    if cache_dir:
+        options.add_argument(f"--disk-cache-dir={os.path.abspath(cache_dir)}")
+        if profile.get("disk_cache_mb"):
+            options.add_argument(f"--disk-cache-size={int(profile['disk_cache_mb']) * 1024 * 1024}")
+
+    # img elements keep their src attributes, only the bytes are never requested
+    prefs = {_CONTENT_SETTING_PREFS[name]: 2 for name in profile["block"] if name in _CONTENT_SETTING_PREFS}
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def apply_network_blocking(driver, profile):
+    """
+    Blocks the profile's resource types at the network layer through CDP.
+    Covers what prefs cannot (fonts, media, CSS background images). Returns the patterns applied.
+    """
+    patterns = blocked_url_patterns(profile)
+    if not patterns:
+        return []
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logger.warning(f"Could not apply CDP URL blocking, relying on prefs only: {e}")
+        return []
+    return patterns
+
+
+def launch_chrome(user_agents, profile, user_data_dir=None, cache_dir=None):
+    """
+    Starts Chrome with a random User-Agent from user_agents and the resolved browser profile.
+    Depends on nothing but its arguments, so partial(launch_chrome, user_agents, profile) is a
+    driver factory that can outlive the scraper that built it (see get_driver_manager).
+    """
+    user_agent = random.choice(user_agents)
+    options = build_chrome_options(user_agent, profile, cache_dir, user_data_dir=user_data_dir)
+    logger.info(f"Selected User-Agent: {user_agent}")
+    driver = webdriver.Chrome(options=options)
+    apply_network_blocking(driver, profile)
+    return driver
+
+
+def driver_alive(driver):
+    """
+    True while the browser session still answers. A page that failed to load leaves a live driver
+    that can be reused; only a crashed or disconnected Chrome needs to be relaunched.
+    """
+    try:
+        driver.current_url
+    except Exception:
+        return False
+    return True
+
+
+class CacheSlots:
+    """
+    Leases Chrome disk cache (or profile) directories under one shared root.
+
+    A Chrome disk cache or profile must not be opened by two running browsers at once, so every
+    driver leases its own numbered slot ('slot-0', 'slot-1', ...). Slots are kept between
+    runs, so the next driver that leases one starts with a warm cache of static assets.
+    A lock file holding the owner's pid marks a slot in use; locks of dead processes are taken over.
+
+    Args:
+        root (str): Shared cache root directory.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _lock_path(self, slot):
+        return os.path.join(self.root, f"{slot}.lock")
+
+    @staticmethod
+    def _alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _try_lock(self, slot):
+        path = self._lock_path(slot)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    pid = int(f.read().strip() or 0)
+            except (OSError, ValueError):
+                return False
+            if pid and self._alive(pid):
+                return False
+            os.remove(path)
+            return self._try_lock(slot)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(str(os.getpid()))
+        return True
+
+    def acquire(self):
+        """
+        Leases the lowest free slot and returns its directory.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            index = 0
+            while not self._try_lock(f"slot-{index}"):
+                index += 1
+            path = os.path.join(self.root, f"slot-{index}")
+            os.makedirs(path, exist_ok=True)
+            return path
+
+    def release(self, path):
+        if not path:
+            return
+        try:
+            os.remove(self._lock_path(os.path.basename(path)))
+        except FileNotFoundError:
+            pass
+
+
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def get_cache_slots(root):
+    """
+    Returns the process-wide CacheSlots for a cache root.
+    """
+    key = os.path.abspath(root)
+    with _slots_lock:
+        slots = _slots.get(key)
+        if slots is None:
+            slots = _slots[key] = CacheSlots(root)
+        return slots
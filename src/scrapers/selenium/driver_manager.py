@@ -0,0 +1,267 @@
+import atexit
+import threading
+from collections import Counter, deque
+
+from src.scrapers.selenium.browser import driver_alive, get_cache_slots
+from src.utils.logger import get_logger
+
+logger = get_logger("driver-manager")
+
+HEAP_SCRIPT = "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : null;"
+
+
+def js_heap_mb(driver):
+    """
+    Used JS heap of the driver's current page in MB, None when Chrome does not report it.
+    """
+    try:
+        used = driver.execute_script(HEAP_SCRIPT)
+    except Exception:
+        return None
+    return used / (1024 * 1024) if isinstance(used, (int, float)) else None
+
+
+class DriverLease:
+    """
+    A driver handed out by DriverManager, with its profile directory and the pages it served.
+    """
+
+    def __init__(self, driver, profile_dir=None):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.pages = 0
+
+
+class DriverManager:
+    """
+    Hands out warm WebDrivers with persistent profiles and recycles them on a budget.
+
+    A cold Chrome launch costs seconds and hundreds of MB, and a fresh temporary profile starts
+    with an empty HTTP cache and no cookies. The manager keeps `prespawn` drivers started by
+    background threads ahead of demand, and takes drivers back when a scraper is done so the next
+    category starts on an already running browser. Every driver runs on a persistent
+    --user-data-dir leased from profile slots (see CacheSlots), so cache and cookies survive
+    driver restarts and runs. A driver is recycled (quit in the background) only when it has
+    served max_pages pages, its page's JS heap exceeds max_heap_mb, or it is returned broken.
+    A failed page load is not a reason to relaunch.
+
+    Typical usage:
+        manager = get_driver_manager("ebay", config["driver_manager"], lambda profile: launch(profile))
+        lease = manager.acquire()
+        ... lease.driver.get(url); lease = manager.page_done(lease) ...
+        manager.release(lease)
+
+    Args:
+        name (str): Source name, used for logging.
+        factory (callable): factory(profile_dir) -> WebDriver (profile_dir is None without profile slots).
+        profile_slots (CacheSlots, optional): Where drivers lease their user-data-dirs.
+        prespawn (int): Idle drivers kept started ahead of demand.
+        max_idle (int): Idle drivers kept after release; extra ones are quit.
+        max_pages (int): Pages after which a driver is recycled (0 = no limit).
+        max_heap_mb (float, optional): JS heap size after which a driver is recycled.
+        check_every (int): Pages between heap checks.
+    """
+
+    def __init__(self, name, factory, profile_slots=None, prespawn=1, max_idle=2, max_pages=200, max_heap_mb=None,
+                 check_every=10):
+        self.name = name
+        self.factory = factory
+        self.profile_slots = profile_slots
+        self.prespawn = max(0, prespawn)
+        self.max_idle = max(self.prespawn, max_idle)
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.check_every = max(1, check_every)
+        self.counts = Counter()
+        self._idle = deque()
+        self._spawning = 0
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _launch(self):
+        profile_dir = self.profile_slots.acquire() if self.profile_slots else None
+        try:
+            driver = self.factory(profile_dir)
+        except Exception:
+            if self.profile_slots:
+                self.profile_slots.release(profile_dir)
+            raise
+        with self._lock:
+            self.counts["launched"] += 1
+        return DriverLease(driver, profile_dir)
+
+    def _quit(self, lease):
+        try:
+            lease.driver.quit()
+        except Exception as e:
+            logger.warning(f"[{self.name}] failed to quit driver: {e}")
+        finally:
+            if self.profile_slots:
+                self.profile_slots.release(lease.profile_dir)
+
+    def _retire(self, lease, reason):
+        """
+        quits a driver on a background thread, so the caller does not wait for Chrome to exit
+        """
+        with self._lock:
+            self.counts[f"recycled:{reason}"] += 1
+        logger.info(f"[{self.name}] recycling driver after {lease.pages} pages ({reason}).")
+        threading.Thread(target=self._quit, args=(lease,), daemon=True, name=f"{self.name}-driver-quit").start()
+
+    def _spawn_idle(self):
+        try:
+            lease = self._launch()
+        except Exception as e:
+            logger.warning(f"[{self.name}] pre-spawning a driver failed: {e}")
+            lease = None
+        with self._lock:
+            self._spawning -= 1
+            if lease is not None and not self._closed:
+                self._idle.append(lease)
+                return
+        if lease is not None:
+            self._quit(lease)
+
+    def replenish(self):
+        """
+        Starts background launches until prespawn drivers are idle or on their way.
+        """
+        with self._lock:
+            missing = 0 if self._closed else self.prespawn - len(self._idle) - self._spawning
+            self._spawning += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._spawn_idle, daemon=True, name=f"{self.name}-driver-spawn").start()
+
+    def acquire(self):
+        """
+        Returns a lease on an idle (warm) driver, or on a freshly launched one when none is ready.
+        """
+        while True:
+            with self._lock:
+                lease = self._idle.popleft() if self._idle else None
+            # checked outside the lock: a hung driver must not block the other threads
+            if lease is None or driver_alive(lease.driver):
+                break
+            with self._lock:
+                self.counts["dead_idle"] += 1
+            threading.Thread(target=self._quit, args=(lease,), daemon=True).start()
+        with self._lock:
+            self.counts["warm" if lease is not None else "cold"] += 1
+        if lease is None:
+            lease = self._launch()
+        self.replenish()
+        return lease
+
+    def recycle_reason(self, lease):
+        """
+        'pages' or 'memory' when the driver is over its budget, else None.
+        """
+        if self.max_pages and lease.pages >= self.max_pages:
+            return "pages"
+        if self.max_heap_mb and lease.pages and lease.pages % self.check_every == 0:
+            heap = js_heap_mb(lease.driver)
+            if heap is not None and heap > self.max_heap_mb:
+                return "memory"
+        return None
+
+    def page_done(self, lease, swap=True):
+        """
+        Counts a served page. With swap=True a driver over its budget is recycled and a lease on a
+        warm replacement is returned; callers that rely on the current page (click pagination)
+        pass swap=False and the budget is applied when the driver is released.
+        """
+        lease.pages += 1
+        if not swap:
+            return lease
+        reason = self.recycle_reason(lease)
+        if reason is None:
+            return lease
+        self._retire(lease, reason)
+        return self.acquire()
+
+    def replace(self, lease):
+        """
+        Recycles a broken driver and returns a lease on a replacement.
+        """
+        replacement = self.acquire()
+        self._retire(lease, "broken")
+        return replacement
+
+    def release(self, lease, broken=False):
+        """
+        Returns a driver when its user is done: kept warm for the next user unless it is broken,
+        over its budget or more than max_idle drivers are idle.
+        """
+        reason = "broken" if broken or not driver_alive(lease.driver) else self.recycle_reason(lease)
+        if reason is None:
+            with self._lock:
+                if not self._closed and len(self._idle) < self.max_idle:
+                    self._idle.append(lease)
+                    self.counts["reused"] += 1
+                    return
+            reason = "idle"
+        self._retire(lease, reason)
+
+    def stats(self):
+        with self._lock:
+            return {**self.counts, "idle": len(self._idle)}
+
+    def close(self):
+        """
+        Quits the idle drivers; drivers still leased are quit when released.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for lease in idle:
+            self._quit(lease)
+        logger.info(f"[{self.name}] driver manager closed: {self.stats()}")
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_driver_manager(source, config, factory):
+    """
+    Returns the process-wide DriverManager of a source, creating (and pre-spawning) it on first use.
+
+    Every category scraper of the source running in this process shares it, and the factory of the
+    first caller is kept: pass one built from the source's settings only (see launch_chrome), never
+    a bound scraper method, which would keep that scraper and its config alive in the manager.
+
+    Args:
+        source (str): Source name.
+        config (dict): The source's 'driver_manager' section (profile_dir, prespawn, max_idle,
+                       max_pages, max_heap_mb).
+        factory (callable): factory(profile_dir) -> WebDriver.
+    """
+    with _managers_lock:
+        manager = _managers.get(source)
+        if manager is None:
+            profile_dir = config.get("profile_dir")
+            manager = _managers[source] = DriverManager(
+                source,
+                factory,
+                profile_slots=get_cache_slots(profile_dir) if profile_dir else None,
+                prespawn=config.get("prespawn", 1),
+                max_idle=config.get("max_idle", 2),
+                max_pages=config.get("max_pages", 200),
+                max_heap_mb=config.get("max_heap_mb"),
+            )
+            manager.replenish()
+        return manager
+
+
+def close_driver_managers():
+    """
+    Closes every driver manager of this process (quits their idle drivers).
+    """
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close()
+
+
+atexit.register(close_driver_managers)
@@ -1,81 +1,137 @@
 import random
-import re
 import time
+from concurrent.futures import Future
+from functools import partial
 
-from bs4 import BeautifulSoup
-from selenium import webdriver
 from selenium.common import TimeoutException
 from selenium.webdriver import ActionChains
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.normalize import normalize_product, normalize_products
+from src.scrapers.page_archive import get_archive
+from src.scrapers.parser_backend import get_backend
+from src.scrapers.seen_filter import get_seen_filter
+from src.scrapers.selenium.browser import driver_alive, get_cache_slots, launch_chrome, resolve_profile
+from src.scrapers.selenium.driver_manager import get_driver_manager
+from src.scrapers.selenium.extraction import JS_HELPERS, run_extractor
+from src.scrapers.selenium.page_state import BLOCK, RESULTS, get_classifier, until_ready_or_dead_end
+from src.scrapers.selenium.pagination import DriverPool, iter_fan_out, page_url, url_pagination_detected
+from src.scrapers.selenium.tiered_fetch import TieredFetcher
+from src.scrapers.selenium.waits import Politeness, page_changed, ready_condition
+from src.utils.concurrency import get_controller
 from src.utils.logger import get_logger
+from src.utils.resilience import backoff_delay, get_breaker
 
 logger = get_logger("ebay-selenium")
 
 
 def parse_price(price_str):
-    try:
-        if price_str:
-            price = price_str.replace(",", "").replace("$", "").split()[0]
-            return float(price)
-        return None
-    except Exception:
-        return None
+    return normalize_product({'price': price_str})['price']
 
 
 def clean_product_fields(prod):
-    p = prod.copy()
-    if isinstance(p.get('price'), str):
-        price_clean = re.sub(r'[^\d.,]', '', p['price'])
-        try:
-            p['price'] = float(price_clean.replace(',', ''))
-        except:
-            p['price'] = None
-    return p
+    return normalize_product(prod)
 
 
-def parse_product(product_html):
+def extract_product(product_html, backend=None):
+    """
+    extracts the raw fields of one result card (price as text)
+    """
+    backend = backend or get_backend("soup")
     title = None
-    title_tag = product_html.select_one(".s-item__title")
-    if title_tag:
-        title = title_tag.get_text(strip=True)
+    title_tag = backend.select_one(product_html, ".s-item__title")
+    if title_tag is not None:
+        title = backend.text(title_tag)
         if not title or "results for" in title:
             title = None
 
-    url_tag = product_html.select_one("a.s-item__link")
-    url = url_tag['href'] if url_tag and url_tag.has_attr('href') else None
+    url_tag = backend.select_one(product_html, "a.s-item__link")
+    url = backend.attr(url_tag, 'href') if url_tag is not None else None
+
+    price_tag = backend.select_one(product_html, ".s-item__price")
+    price = backend.text(price_tag) if price_tag is not None else None
+
+    img_tag = backend.select_one(product_html, ".s-item__image-img")
+    img_url = backend.attr(img_tag, 'src') if img_tag is not None else None
+
+    product = {
+        'title': title,
+        'price': price,
+        'url': url,
+        'review_count': -1,
+        'rating': -1,
+        'img_url': img_url,
+    }
+    return product
+
+
+def parse_product(product_html, backend=None):
+    return normalize_product(extract_product(product_html, backend))
+
 
-    price_tag = product_html.select_one(".s-item__price")
-    price = price_tag.get_text(strip=True) if price_tag else None
+CARD_SELECTOR = "li.s-item"
+PAGE_PARAM = "_pgn"
+PAGINATION_LINKS = "a.pagination__item, a.pagination__next"
+PAGE_SIGNALS = {
+    "block_selectors": ["form[action*='captcha']", "iframe[src*='captcha']"],
+    "block_urls": ["/challenge?", "/splashui/captcha", "/splashui/challenge"],
+    "block_phrases": ["detected unusual traffic", "please verify you are a human"],
+    "empty_selectors": [".srp-save-null-search"],
+    "empty_phrases": ["no exact matches found"],
+}
 
-    img_tag = product_html.select_one(".s-item__image-img")
-    img_url = img_tag['src'] if img_tag and img_tag.has_attr('src') else None
 
-    condition_tag = product_html.select_one(".SECONDARY_INFO")
-    condition = condition_tag.get_text(strip=True) if condition_tag else None
+def parse_page(html, backend=None, partial=False):
+    """
+    parses a search results page into product dicts (cards without a title are dropped)
+    """
+    backend = backend or get_backend()
+    products = [extract_product(card, backend) for card in backend.cards(html, CARD_SELECTOR, partial=partial)]
+    return [p for p in normalize_products(products) if p.get('title')]
 
-    shipping_tag = product_html.select_one(".s-item__shipping")
-    shipping = shipping_tag.get_text(strip=True) if shipping_tag else None
 
-    location_tag = product_html.select_one(".s-item__location")
-    seller_location = location_tag.get_text(strip=True) if location_tag else None
+# in-browser counterpart of parse_product(): one execute_script call returns the raw fields of every card
+EXTRACT_SCRIPT = JS_HELPERS + r"""
+return Array.from(document.querySelectorAll(arguments[0]), (card) => ({
+  title: text(one(card, '.s-item__title')),
+  url: attr(one(card, 'a.s-item__link'), 'href'),
+  price: text(one(card, '.s-item__price')),
+  img_url: attr(one(card, '.s-item__image-img'), 'src'),
+}));
+"""
 
-    seller_tag = product_html.select_one(".s-item__seller-info-text")
-    seller = seller_tag.get_text(strip=True) if seller_tag else None
 
+def product_from_record(record):
+    """
+    maps an EXTRACT_SCRIPT record to the raw fields of extract_product()
+    """
+    title = record.get('title')
+    if not title or "results for" in title:
+        title = None
     product = {
         'title': title,
-        'price': price,
-        'url': url,
+        'price': record.get('price'),
+        'url': record.get('url'),
         'review_count': -1,
         'rating': -1,
-        'img_url': img_url,
+        'img_url': record.get('img_url'),
     }
-    return clean_product_fields(product)
+    return product
+
+
+def extract_products(driver):
+    """
+    extracts the products of the loaded page in the browser (cards without a title are dropped),
+    None when extraction failed
+    """
+    records = run_extractor(driver, EXTRACT_SCRIPT, CARD_SELECTOR)
+    if records is None:
+        return None
+    products = normalize_products([product_from_record(r) for r in records])
+    return [p for p in products if p.get('title')]
 
 
 agents = [
@@ -97,50 +153,142 @@ class EbaySeleniumScraper(BaseScraper):
     """
     is_scrapy = False
 
-    def __init__(self, config):
+    def __init__(self, config, parse_pool=None):
         self.user_agents = config.get("user_agents", agents)
         self.max_retries = config.get("max_retries", 3)
         self.base_url = config['base_url']
         self.categories = config['categories']
         self.max_pages = config['max_pages']
         self.delay = config['delay']
-        self.driver = self._init_driver()
+        self.politeness = Politeness(self.delay, config.get("delay_jitter", 0))
+        self.waits = config.get("waits") or {}
+        self.wait_timeout = self.waits.get("timeout", 30)
+        self.pagination = config.get("pagination") or {}
+        self._pool = None
+        self.concurrency = get_controller("ebay", config.get("concurrency"))
+        resilience = config.get("resilience") or {}
+        self.breaker = get_breaker(self.base_url, resilience)
+        self.backoff = {"base": resilience.get("backoff_base", 1.0), "cap": resilience.get("backoff_cap", 60.0)}
+        self.parser = get_backend(config.get("parser"))
+        self.partial_parse = config.get("partial_parse", False)
+        # a ParsePool handed in by the runner: raw pages are parsed there instead of on this thread
+        self.parse_pool = parse_pool
+        self.parse_options = {"parser": config.get("parser"), "partial_parse": self.partial_parse}
+        self.extraction = config.get("extraction", "dom")
+        self.archive = get_archive(config.get("archive"))
+        self.page_state = get_classifier("ebay", CARD_SELECTOR, **PAGE_SIGNALS)
+        self.seen = get_seen_filter("ebay", config.get("seen_filter"))
+        self.category = config.get("category")
+        self.browser_profile = resolve_profile(config.get("browser_profile"))
+        cache_root = self.browser_profile["disk_cache_dir"]
+        self.cache_slots = get_cache_slots(cache_root) if cache_root else None
+        self.driver_manager = self._init_driver_manager(config.get("driver_manager") or {})
+        # managed drivers keep their cache in their persistent profile
+        self.cache_dir = self.cache_slots.acquire() if self.cache_slots and self.driver_manager is None else None
+        self.tiered = self._init_tiered(config.get("tiered_fetch") or {})
+        # the main driver starts on first use: pages served over HTTP never launch Chrome
+        self._lease = None
+        self._driver = None
         logger.info("EbaySeleniumScraper initialized.")
 
-    def _init_driver(self):
-        options = Options()
-        options.add_argument("--headless")
-        user_agent = random.choice(self.user_agents)
-        options.add_argument(f"user-agent={user_agent}")
-        logger.info(f"Selected User-Agent: {user_agent}")
-        return webdriver.Chrome(options=options)
+    @property
+    def driver(self):
+        """
+        the main driver, started (or leased when drivers are managed) on first use
+        """
+        if self._driver is None:
+            if self.driver_manager is not None:
+                self._lease = self.driver_manager.acquire()
+                self._driver = self._lease.driver
+            else:
+                self._driver = self._init_driver()
+        return self._driver
+
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
+
+    def _init_tiered(self, tiered):
+        """
+        HTTP-first page fetching (see TieredFetcher), None unless tiered_fetch is enabled
+        """
+        if not tiered.get("enabled"):
+            return None
+        return TieredFetcher(
+            "ebay",
+            self.parse,
+            block_urls=PAGE_SIGNALS.get("block_urls", []),
+            block_phrases=PAGE_SIGNALS.get("block_phrases", []),
+            empty_phrases=PAGE_SIGNALS.get("empty_phrases", []),
+            min_cards=tiered.get("min_cards", 10),
+            min_priced=tiered.get("min_priced", 0.5),
+            pool_size=self.pagination.get("pool_size", 3),
+            delay=self.delay,
+            jitter=self.politeness.jitter,
+            headers={"User-Agent": random.choice(self.user_agents), "Accept-Language": "en-US,en;q=0.9"},
+            give_up_after=tiered.get("give_up_after", 5),
+            on_page=lambda url, html, page: self.archive_page("ebay", url, html, page),
+            concurrency=self.concurrency,
+            breaker=self.breaker,
+        )
 
-    def wait_for_products(self, timeout=30):
+    def _init_driver_manager(self, managed):
+        """
+        warm, recycled drivers on persistent profiles (see DriverManager), None unless driver_manager is enabled
+        """
+        if not managed.get("enabled"):
+            return None
+        # built from settings only: the shared manager outlives this scraper and must not hold it
+        factory = partial(launch_chrome, list(self.user_agents), self.browser_profile)
+        return get_driver_manager("ebay", managed, factory)
+
+    def _init_driver(self, cache_dir=None, user_data_dir=None):
+        return launch_chrome(self.user_agents, self.browser_profile, user_data_dir, cache_dir or self.cache_dir)
+
+    def wait_for_products(self, timeout=None, driver=None):
+        """
+        wait until the product list has finished rendering. Returns True once the page is settled
+        (results or an empty search), False on timeout or a block/captcha page.
+        """
+        driver = driver or self.driver
+        condition = until_ready_or_dead_end(ready_condition(CARD_SELECTOR, self.waits), self.page_state)
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "li.s-item"))
-            )
-        except Exception as e:
-            logger.warning("Timed out waiting for eBay product content.")
-
-    def is_captcha_page(self):
-        src = self.driver.page_source
-        return (
-                "detected unusual traffic" in src.lower() or
-                "please verify you are a human" in src.lower() or
-                "/challenge?" in self.driver.current_url
-        )
+            WebDriverWait(driver, timeout or self.wait_timeout, poll_frequency=0.1).until(condition)
+        except Exception:
+            state = self.page_state.classify(driver)
+            logger.warning(f"Timed out waiting for product content (page state: {state}).")
+            return False
+        state = self.page_state.record(condition.state or RESULTS)
+        if state == BLOCK:
+            logger.warning("CAPTCHA detected. Solve or rotate proxy/user-agent.")
+            return False
+        return True
+
+    def is_captcha_page(self, driver=None):
+        """
+        detects if a captcha / block page is shown, without serializing the DOM
+        """
+        return self.page_state.probe(driver or self.driver) == BLOCK
 
     def fetch(self, url, retries=None):
         retries = retries if retries is not None else self.max_retries
         for attempt in range(1, retries + 1):
             try:
                 logger.info(f"Fetching URL (attempt {attempt}): {url}")
-                self.driver.get(url)
-                time.sleep(random.uniform(self.delay, self.delay + 2))
-                self.wait_for_products()
-                return self.driver.page_source
+                self.politeness.wait()
+                self.breaker.wait()
+                with self.concurrency.request() as outcome:
+                    self.driver.get(url)
+                    if self.wait_for_products():
+                        self.breaker.record_success()
+                    else:
+                        outcome.failed()
+                        self.breaker.record_failure()
+                html = self.driver.page_source
+                self._page_done()
+                return html
             except Exception as e:
+                self.breaker.record_failure()
                 if self.is_captcha_page():
                     logger.warning("CAPTCHA detected. Use proxy/user-agent rotation or solve manually.")
                     self.driver.save_screenshot(f"logs/ebay_captcha_{int(time.time())}.png")
@@ -148,64 +296,225 @@ class EbaySeleniumScraper(BaseScraper):
                 else:
                     logger.error(f"Error fetching page on attempt {attempt}: {e}", exc_info=True)
                     if attempt < retries:
-                        logger.info("Retrying fetch...")
-                        self.driver.quit()
-                        self.driver = self._init_driver()
-                        time.sleep(2)
+                        pause = backoff_delay(attempt, **self.backoff)
+                        logger.info(f"Retrying fetch in {pause:.1f}s...")
+                        if not driver_alive(self.driver):
+                            logger.info("Browser session is gone, relaunching Chrome.")
+                            self._replace_driver()
+                        time.sleep(pause)
                     else:
                         logger.error("Max fetch retries reached.")
                         raise
         return self.driver.page_source
 
     def parse(self, html):
-        soup = BeautifulSoup(html, "html.parser")
-        products = soup.select("li.s-item")
-        all_products = []
-        for product_html in products:
-            data = parse_product(product_html)
-            if data.get('title'):
-                all_products.append(data)
+        if self.parse_pool is not None:
+            all_products = self.parse_pool.parse("ebay", html, self.parse_options, self.category)
+        else:
+            all_products = parse_page(html, self.parser, self.partial_parse)
         logger.info(f"Parsed {len(all_products)} valid products from page.")
         return all_products
 
-    def scrape_category(self, category_url, max_pages=None, delay=None):
-        all_products = []
+    def iter_pages(self, category_url, max_pages=None, delay=None, start_page=1):
+        yield from self.skip_seen(self._walk_pages(category_url, max_pages, delay, start_page))
+
+    def _walk_pages(self, category_url, max_pages=None, delay=None, start_page=1):
         max_pages = max_pages or self.max_pages
-        delay = delay or self.delay
+        politeness = self.politeness if delay is None else Politeness(delay)
+        mode = self.pagination.get("mode", "auto")
+
+        if self.tiered is not None and mode != "click":
+            pages = range(max(1, start_page), max_pages + 1)
+            yield from iter_fan_out(lambda p: self._scrape_page_tiered(category_url, p, delay), pages,
+                                    self.pagination.get("pool_size", 3))
+            return
+
+        loaded = False
+        if mode != "click":
+            politeness.wait()
+            self._load(category_url)
+            loaded = True
+            if mode == "url" or url_pagination_detected(self.driver, PAGINATION_LINKS, PAGE_PARAM):
+                if start_page <= 1:
+                    yield 1, self._scrape_loaded(1)
+                pages = range(max(2, start_page), max_pages + 1)
+                yield from iter_fan_out(lambda p: self._scrape_page_url(category_url, p, delay), pages,
+                                        self.pagination.get("pool_size", 3))
+                return
+            logger.info("URL pagination not detected, falling back to clicking next.")
 
-        self.driver.get(category_url)
         for page in range(1, max_pages + 1):
-            logger.info(f"Scraping eBay page {page}: {self.driver.current_url}")
-            self.wait_for_products()
-            html = self.driver.page_source
-            page_products = self.parse(html)
-            logger.info(f"Found {len(page_products)} products on page {page}.")
-            all_products.extend(page_products)
-            time.sleep(delay)
-
-            if page < max_pages:
-                try:
-                    next_btn = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, "a.pagination__next, a[aria-label='Next page']"))
-                    )
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
-                    time.sleep(0.5)
-                    actions = ActionChains(self.driver)
-                    actions.move_to_element(next_btn).pause(0.2).click().perform()
-                except TimeoutException:
-                    logger.warning("No next page or next button not clickable after waiting.")
-                    break
-                except Exception as e:
-                    logger.warning(f"Failed to click next: {e}", exc_info=True)
+            if page > 1 or not loaded:
+                politeness.wait()
+                if page == 1:
+                    self._load(category_url)
+                elif not self._load(click_next=True):
                     break
+            if page < start_page:
+                continue
+            yield page, self._scrape_loaded(page)
+
+    def _load(self, url=None, driver=None, click_next=False):
+        """
+        opens url (or clicks "next") and waits for the product list; the in-flight slot covers the
+        navigation itself. Returns False when click_next finds no next page.
+        """
+        driver = driver or self.driver
+        if url or click_next:
+            self.breaker.wait()
+        with self.concurrency.request() as outcome:
+            if click_next and not self._click_next():
+                return False
+            if url:
+                try:
+                    driver.get(url)
+                except Exception:
+                    # a page load that times out or loses the session counts against the domain too
+                    self.breaker.record_failure()
+                    raise
+            if self.wait_for_products(driver=driver):
+                self.breaker.record_success()
+            else:
+                outcome.failed()
+                self.breaker.record_failure()
+        return True
+
+    def _scrape_loaded(self, page, driver=None, defer=False):
+        """
+        scrapes the page loaded in driver; with defer, a page parsed in the parse pool is returned
+        as a future of its products, so the driver can move on while the page is parsed
+        """
+        driver = driver or self.driver
+        logger.info(f"Scraping eBay page {page}: {driver.current_url}")
+        page_products = extract_products(driver) if self.extraction == "js" else None
+        # page_source is only serialized when parsing falls back to it or the page is archived
+        if page_products is None or self.archive is not None:
+            html = driver.page_source
+            self.archive_page("ebay", driver.current_url, html, page)
+            if page_products is None and defer and self.parse_pool is not None:
+                page_products = self.parse_pool.parse_later("ebay", html, self.parse_options, self.category)
+            elif page_products is None:
+                page_products = self.parse(html)
+        if driver is self.driver:
+            # pagination may continue from this page, the budget is applied on release
+            self._page_done(swap=False)
+        if isinstance(page_products, Future):
+            logger.info(f"Queued page {page} for parsing.")
+        else:
+            logger.info(f"Found {len(page_products)} products on page {page}.")
+        return page_products
+
+    def driver_pool(self):
+        """
+        lazily started pool of extra drivers for URL pagination, leased from the driver manager when enabled
+        """
+        if self._pool is None:
+            self._pool = DriverPool(
+                self._init_driver,
+                size=self.pagination.get("pool_size", 3),
+                delay=self.delay,
+                jitter=self.politeness.jitter,
+                cache_slots=self.cache_slots,
+                driver_manager=self.driver_manager,
+            )
+        return self._pool
+
+    def _scrape_page_url(self, category_url, page, delay=None):
+        """
+        fetches one result page by URL on a pooled driver
+        """
+        pool = self.driver_pool()
+        pooled = pool.acquire()
+        try:
+            if delay is not None:
+                pooled.politeness.delay = delay
+            pooled.politeness.wait()
+            self._load(page_url(category_url, PAGE_PARAM, page), pooled.driver)
+            products = self._scrape_loaded(page, pooled.driver, defer=True)
+            pool.page_done(pooled)
+            return products
+        except Exception:
+            pooled.broken = True
+            raise
+        finally:
+            pool.release(pooled)
+
+    def _scrape_page_tiered(self, category_url, page, delay=None):
+        """
+        fetches one result page over plain HTTP, or on a pooled driver when the page needs a browser
+        """
+        url = category_url if page == 1 else page_url(category_url, PAGE_PARAM, page)
+        return self.tiered.fetch(url, lambda: self._scrape_page_url(category_url, page, delay), page)
+
+    def _click_next(self):
+        try:
+            next_btn = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "a.pagination__next, a[aria-label='Next page']"))
+            )
+            cards = self.driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
+            changed = page_changed(cards[0] if cards else None, self.driver.current_url)
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_btn)
+            actions = ActionChains(self.driver)
+            actions.move_to_element(next_btn).pause(0.2).click().perform()
+            WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.1).until(changed)
+            return True
+        except TimeoutException:
+            logger.warning("No next page, or the page did not change after clicking next.")
+            return False
+        except Exception as e:
+            logger.warning(f"Failed to click next: {e}", exc_info=True)
+            return False
 
-        logger.info(f"Scraping {self.driver.current_url} completed. Total products: {len(all_products)}")
+    def scrape_category(self, category_url, max_pages=None, delay=None):
+        all_products = []
+        for _, page_products in self.iter_pages(category_url, max_pages, delay):
+            all_products.extend(page_products)
+        logger.info(f"Scraping {category_url} completed. Total products: {len(all_products)}")
         return all_products
 
     def scrape(self, url: str):
         logger.info(f"Starting scrape for URL: {url}")
         return self.scrape_category(url)
 
+    def _replace_driver(self):
+        """
+        swaps a dead main driver for a new one (a warm one when drivers are managed)
+        """
+        if self._lease is not None:
+            self._lease = self.driver_manager.replace(self._lease)
+            self.driver = self._lease.driver
+            return
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = self._init_driver()
+
+    def _page_done(self, swap=True):
+        """
+        counts a page served by the main driver; a managed driver over its budget is swapped
+        for a warm one unless swap is False (the caller still needs the loaded page)
+        """
+        if self._lease is not None:
+            self._lease = self.driver_manager.page_done(self._lease, swap=swap)
+            self.driver = self._lease.driver
+
     def close(self):
-        self.driver.quit()
+        if self._pool is not None:
+            self._pool.close()
+        if self._lease is not None:
+            # handed back warm for the next category
+            self.driver_manager.release(self._lease)
+            logger.info(f"Drivers: {self.driver_manager.stats()}")
+        elif self._driver is not None:
+            self._driver.quit()
+        logger.info(f"Page states: {self.page_state.stats()}")
+        if self.tiered is not None:
+            self.tiered.close()
+            logger.info(f"Fetch tiers: {self.tiered.stats()}")
+        if self.seen is not None:
+            # staged keys reach the filter only after the runner has persisted the products
+            logger.info(f"Seen-url filter stats: {self.seen.stats()}")
+        if self.cache_slots:
+            self.cache_slots.release(self.cache_dir)
         logger.info("Closed Selenium WebDriver.")
@@ -0,0 +1,37 @@
+from src.utils.logger import get_logger
+
+logger = get_logger("js-extraction")
+
+# Helpers shared by the per-site extractor scripts. text() mirrors get_text(strip=True):
+# every text node stripped and joined without separators, script/style/template content skipped.
+JS_HELPERS = r"""
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+const text = (el) => {
+  if (!el) return null;
+  const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+  let out = '';
+  for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    if (!SKIP.has(node.parentNode.nodeName)) out += node.nodeValue.trim();
+  }
+  return out;
+};
+const raw = (el) => (el ? el.textContent.trim() : null);
+const one = (root, selector) => (root ? root.querySelector(selector) : null);
+const attr = (el, name) => (el ? el.getAttribute(name) : null);
+"""
+
+
+def run_extractor(driver, script, card_selector):
+    """
+    Runs a site's extractor script in the page and returns its list of card records,
+    or None when the script failed, so the caller can fall back to parsing page_source.
+    """
+    try:
+        records = driver.execute_script(script, card_selector)
+    except Exception as e:
+        logger.warning(f"In-browser extraction failed, falling back to page_source: {e}")
+        return None
+    if not isinstance(records, list):
+        logger.warning(f"In-browser extraction returned {type(records).__name__}, falling back to page_source.")
+        return None
+    return [r for r in records if isinstance(r, dict)]
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import Counter
+
+from src.utils.logger import get_logger
+
+logger = get_logger("page-state")
+
+RESULTS = "results"
+EMPTY = "empty"
+BLOCK = "block"
+ERROR = "error"
+
+# One round-trip: card count plus targeted probes. Page text is only scanned when there are no
+# cards and no selector matched, and then only the title and the first few KB of the body.
+_PROBE_SCRIPT = r"""
+const [cardSelector, blockSelectors, emptySelectors, blockPhrases, emptyPhrases] = arguments;
+const any = (selectors) => selectors.some((s) => document.querySelector(s) !== null);
+const cards = document.querySelectorAll(cardSelector).length;
+const block = any(blockSelectors);
+const empty = !block && !cards && any(emptySelectors);
+let phrase = null;
+if (!cards && !block && !empty) {
+  const sample = ((document.title || '') + ' ' +
+    (document.body ? document.body.textContent.slice(0, 8192) : '')).toLowerCase();
+  if (blockPhrases.some((p) => sample.includes(p))) phrase = 'block';
+  else if (emptyPhrases.some((p) => sample.includes(p))) phrase = 'empty';
+}
+return {cards: cards, block: block, empty: empty, phrase: phrase};
+"""
+
+
+class PageStateClassifier:
+    """
+    Classifies a loaded search page as results, empty, block (captcha / bot wall) or error
+    with one URL read and one small script, instead of serializing the whole DOM.
+
+    Counters per state are kept for the process (see stats()), so block rates show up in
+    the logs and callers can fail over as soon as a page is known to be a dead end.
+
+    Args:
+        card_selector (str): CSS selector of a product card.
+        block_selectors (list): Selectors only present on block/captcha pages.
+        block_urls (list): URL fragments of block/captcha pages.
+        block_phrases (list): Lower-case phrases of block pages (checked on card-less pages only).
+        empty_selectors (list): Selectors of the site's "no results" message.
+        empty_phrases (list): Lower-case "no results" phrases.
+    """
+
+    def __init__(self, card_selector, block_selectors=(), block_urls=(), block_phrases=(),
+                 empty_selectors=(), empty_phrases=()):
+        self.card_selector = card_selector
+        self.block_selectors = list(block_selectors)
+        self.block_urls = list(block_urls)
+        self.block_phrases = [p.lower() for p in block_phrases]
+        self.empty_selectors = list(empty_selectors)
+        self.empty_phrases = [p.lower() for p in empty_phrases]
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def probe(self, driver):
+        """
+        Returns the page state without recording it.
+        """
+        try:
+            url = driver.current_url or ""
+            if any(fragment in url for fragment in self.block_urls):
+                return BLOCK
+            result = driver.execute_script(
+                _PROBE_SCRIPT, self.card_selector, self.block_selectors, self.empty_selectors,
+                self.block_phrases, self.empty_phrases,
+            )
+        except Exception as e:
+            logger.warning(f"Page state probe failed: {e}")
+            return ERROR
+        if not isinstance(result, dict):
+            return ERROR
+        if result.get("block") or result.get("phrase") == BLOCK:
+            return BLOCK
+        if result.get("cards"):
+            return RESULTS
+        if result.get("empty") or result.get("phrase") == EMPTY:
+            return EMPTY
+        return ERROR
+
+    def record(self, state):
+        with self._lock:
+            self.counts[state] += 1
+        return state
+
+    def classify(self, driver):
+        """
+        Probes the page and records the result in the counters.
+        """
+        return self.record(self.probe(driver))
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class until_ready_or_dead_end:
+    """
+    Wraps a readiness condition so a wait also ends on block and empty pages: while the page is
+    not ready, the classifier is probed every `every` seconds. The state that ended the wait is
+    kept in .state (None when the page became ready).
+    """
+
+    def __init__(self, ready, classifier, every=1.0):
+        self.ready = ready
+        self.classifier = classifier
+        self.every = every
+        self.state = None
+        self._last = time.monotonic()
+
+    def __call__(self, driver):
+        result = self.ready(driver)
+        if result:
+            return result
+        now = time.monotonic()
+        if now - self._last >= self.every:
+            self._last = now
+            state = self.classifier.probe(driver)
+            if state in (BLOCK, EMPTY):
+                self.state = state
+                return state
+        return False
+
+
+_classifiers = {}
+_classifiers_lock = threading.Lock()
+
+
+def get_classifier(source, card_selector, **signals):
+    """
+    Returns the process-wide PageStateClassifier of a source, so counters are shared by all its scrapers.
+    """
+    with _classifiers_lock:
+        classifier = _classifiers.get(source)
+        if classifier is None:
+            classifier = _classifiers[source] = PageStateClassifier(card_selector, **signals)
+        return classifier
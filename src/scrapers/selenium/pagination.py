@@ -0,0 +1,194 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+from src.scrapers.selenium.waits import Politeness
+from src.utils.logger import get_logger
+
+logger = get_logger("pagination")
+
+_LINKS_SCRIPT = "return Array.from(document.querySelectorAll(arguments[0])).map(a => a.href || '');"
+
+
+def page_url(url, param, page):
+    """
+    Returns url with its page query parameter set to page (other parameters are kept).
+    """
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qs(parts.query, keep_blank_values=True).items() if k != param]
+    pairs = [(k, item) for k, values in query for item in values] + [(param, str(page))]
+    return urlunsplit(parts._replace(query=urlencode(pairs)))
+
+
+def url_pagination_detected(driver, link_selector, param):
+    """
+    True when the pagination links of the loaded page address pages through the param query parameter.
+    """
+    try:
+        hrefs = driver.execute_script(_LINKS_SCRIPT, link_selector) or []
+    except Exception as e:
+        logger.warning(f"Could not read pagination links: {e}")
+        return False
+    for href in hrefs:
+        if isinstance(href, str) and param in parse_qs(urlsplit(href).query):
+            return True
+    return False
+
+
+class PooledDriver:
+    def __init__(self, driver, cache_dir, politeness, lease=None):
+        self.driver = driver
+        self.cache_dir = cache_dir
+        self.politeness = politeness
+        self.lease = lease
+        self.broken = False
+
+
+class DriverPool:
+    """
+    A fixed-size pool of WebDrivers for fetching pages of one site in parallel.
+
+    Drivers are started lazily, each with its own disk cache slot and politeness interval,
+    and handed out to one thread at a time. A driver released as broken is quit and its slot
+    freed; a thread waiting in acquire() then starts a replacement.
+
+    With a driver_manager, drivers are leased from it instead: they start warm on their persistent
+    profiles, are recycled on the manager's page budget (see page_done) and are handed back to it,
+    not quit, when the pool closes.
+
+    Args:
+        factory (callable): factory(cache_dir) -> WebDriver.
+        size (int): Maximum number of drivers.
+        delay (float): Politeness delay per driver.
+        jitter (float): Politeness jitter per driver.
+        cache_slots (CacheSlots, optional): Where pooled drivers lease their disk caches.
+        driver_manager (DriverManager, optional): Where pooled drivers are leased from (factory and
+                                                  cache_slots are then unused).
+    """
+
+    def __init__(self, factory, size=3, delay=0, jitter=0, cache_slots=None, driver_manager=None):
+        self.factory = factory
+        self.size = max(1, size)
+        self.delay = delay
+        self.jitter = jitter
+        self.cache_slots = cache_slots
+        self.driver_manager = driver_manager
+        self._idle = deque()
+        self._cond = threading.Condition()
+        self._all = []
+        self._starting = 0
+
+    def acquire(self):
+        with self._cond:
+            while not self._idle and len(self._all) + self._starting >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.popleft()
+            self._starting += 1
+        # Chrome starts outside the lock, so other threads can take and return drivers meanwhile
+        cache_dir = None
+        try:
+            if self.driver_manager is not None:
+                lease = self.driver_manager.acquire()
+                pooled = PooledDriver(lease.driver, None, Politeness(self.delay, self.jitter), lease)
+            else:
+                cache_dir = self.cache_slots.acquire() if self.cache_slots else None
+                pooled = PooledDriver(self.factory(cache_dir), cache_dir, Politeness(self.delay, self.jitter))
+        except Exception:
+            if cache_dir is not None:
+                self.cache_slots.release(cache_dir)
+            with self._cond:
+                self._starting -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._starting -= 1
+            self._all.append(pooled)
+        return pooled
+
+    def release(self, pooled):
+        if pooled.broken:
+            self._discard(pooled)
+            with self._cond:
+                if pooled in self._all:
+                    self._all.remove(pooled)
+                self._cond.notify()
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def page_done(self, pooled):
+        """
+        Counts a page served by a managed driver; one over the manager's budget is swapped for a warm one.
+        """
+        if pooled.lease is not None:
+            pooled.lease = self.driver_manager.page_done(pooled.lease)
+            pooled.driver = pooled.lease.driver
+
+    def _discard(self, pooled):
+        if pooled.lease is not None:
+            # the manager keeps a live driver warm for the next user and recycles a broken one
+            self.driver_manager.release(pooled.lease, broken=pooled.broken)
+            return
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Failed to quit pooled driver: {e}")
+        if self.cache_slots:
+            self.cache_slots.release(pooled.cache_dir)
+
+    def close(self):
+        with self._cond:
+            drivers, self._all = self._all, []
+            self._idle.clear()
+        for pooled in drivers:
+            self._discard(pooled)
+
+
+def iter_fan_out(fetch_page, pages, workers):
+    """
+    Fetches pages in parallel and yields (page, products) in page order.
+
+    At most `workers` pages are in flight. The first page without products is taken as the end
+    of the results: nothing after it is yielded or requested, and pages not started yet are
+    cancelled when the caller stops iterating. A page whose fetch raised is logged and skipped.
+    A page handed to the parse pool counts as in flight until it is parsed, while its fetch
+    worker has already moved on to the next page.
+
+    Args:
+        fetch_page (callable): fetch_page(page) -> list of product dicts, or a future of them.
+        pages (iterable): Page numbers, ascending.
+        workers (int): Parallel fetches.
+    """
+    pages = iter(pages)
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        def submit_next():
+            page = next(pages, None)
+            if page is not None:
+                in_flight.append((page, executor.submit(fetch_page, page)))
+
+        for _ in range(max(1, workers)):
+            submit_next()
+        try:
+            while in_flight:
+                page, future = in_flight.popleft()
+                try:
+                    products = future.result()
+                    if isinstance(products, Future):
+                        products = products.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch page {page}: {e}")
+                    submit_next()
+                    continue
+                if not products:
+                    logger.info(f"Page {page} has no products, stopping pagination.")
+                    break
+                submit_next()
+                yield page, products
+        finally:
+            # also reached when the consumer stops early (e.g. on a page of already seen products)
+            for _, pending in in_flight:
+                pending.cancel()
@@ -0,0 +1,159 @@
+import threading
+from collections import Counter
+
+from src.scrapers.http_session import build_session
+from src.scrapers.selenium.waits import Politeness
+from src.utils.logger import get_logger
+from src.utils.resilience import FAILURE_STATUSES
+
+logger = get_logger("tiered-fetch")
+
+HTTP = "http"
+BROWSER = "browser"
+
+
+class TieredFetcher:
+    """
+    Fetches result pages with a plain HTTP request first and falls back to a browser only when needed.
+
+    Many search pages are server-rendered, and a pooled HTTP request costs a fraction of a browser
+    page load. The HTTP response is accepted when a cheap completeness check passes: status 200, no
+    block URL or block phrase, at least min_cards parsed products (or an explicit empty-result
+    phrase) and at least min_priced of them with a price, since prices filled in by JavaScript
+    point to a JS-dependent page. Otherwise the page is fetched again through browser_fetch. After
+    give_up_after escalations in a row, the HTTP tier is skipped for the rest of the crawl.
+
+    Typical usage:
+        tiered = TieredFetcher("ebay", scraper.parse, block_phrases=["verify you are a human"])
+        products = tiered.fetch(url, lambda: scrape_with_driver(url))
+
+    Args:
+        name (str): Source name, used in log messages.
+        parse (callable): parse(html) -> list of product dicts.
+        block_urls (list): URL fragments of block/captcha pages.
+        block_phrases (list): Lower-case phrases of block/captcha pages.
+        empty_phrases (list): Lower-case phrases of a search without results.
+        min_cards (int): Products a complete page has at least.
+        min_priced (float): Share of products that must have a price.
+        pool_size (int): Pooled HTTP connections (matches the parallel page fetches).
+        delay (float): Politeness interval per fetch worker; HTTP requests share delay / pool_size.
+        jitter (float): Extra random seconds per interval.
+        headers (dict, optional): Request headers (e.g. the scraper's User-Agent).
+        give_up_after (int): Consecutive escalations after which only the browser is used.
+        timeout (float): HTTP timeout in seconds.
+        on_page (callable, optional): on_page(url, html, page) for every accepted HTTP page (archiving).
+        concurrency (AdaptiveConcurrencyController, optional): The source's in-flight limiter.
+        breaker (CircuitBreaker, optional): The domain's circuit breaker; throttled or blocked HTTP
+                                            responses count as failures.
+    """
+
+    def __init__(self, name, parse, block_urls=(), block_phrases=(), empty_phrases=(), min_cards=10, min_priced=0.5,
+                 pool_size=3, delay=0, jitter=0, headers=None, give_up_after=5, timeout=20, on_page=None,
+                 concurrency=None, breaker=None):
+        self.name = name
+        self.parse = parse
+        self.block_urls = list(block_urls)
+        self.block_phrases = [p.lower() for p in block_phrases]
+        self.empty_phrases = [p.lower() for p in empty_phrases]
+        self.min_cards = min_cards
+        self.min_priced = min_priced
+        self.give_up_after = give_up_after
+        self.timeout = timeout
+        self.on_page = on_page
+        self.concurrency = concurrency
+        self.breaker = breaker
+        # pages are fetched by pool_size workers in parallel, like the driver pool
+        self.politeness = Politeness((delay or 0) / max(1, pool_size), jitter)
+        # one quick retry on connection errors only: a throttled page is escalated (and seen by the breaker) at once
+        self.session = build_session(pool_size=max(1, pool_size), pool_hosts=1, retries=1)
+        self.session.headers.update(headers or {})
+        self.counts = Counter()
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def http_enabled(self):
+        return self._misses < self.give_up_after
+
+    def check(self, status, url, html):
+        """
+        Returns (products, None) for a complete page, (None, reason) when it needs a browser.
+        """
+        if status != 200:
+            return None, f"status_{status}"
+        if any(fragment in url for fragment in self.block_urls):
+            return None, "blocked"
+        lowered = html.lower()
+        if any(phrase in lowered for phrase in self.block_phrases):
+            return None, "blocked"
+        products = self.parse(html)
+        if not products and any(phrase in lowered for phrase in self.empty_phrases):
+            return products, None
+        if len(products) < self.min_cards:
+            return None, "few_cards"
+        if sum(1 for p in products if p.get("price") is not None) < self.min_priced * len(products):
+            return None, "no_prices"
+        return products, None
+
+    def fetch_http(self, url, page=None):
+        """
+        Returns the products of url fetched over plain HTTP, or None when the page needs a browser.
+        """
+        self.politeness.wait()
+        if self.breaker is not None:
+            self.breaker.wait()
+        status = None
+        try:
+            if self.concurrency is not None:
+                with self.concurrency.request() as outcome:
+                    resp = self.session.get(url, timeout=self.timeout)
+                    outcome.status = resp.status_code
+            else:
+                resp = self.session.get(url, timeout=self.timeout)
+            status = resp.status_code
+            products, reason = self.check(status, resp.url, resp.text)
+            if products is not None and self.on_page is not None:
+                self.on_page(resp.url, resp.text, page)
+        except Exception as e:
+            logger.warning(f"[{self.name}] HTTP fetch of {url} failed: {e}")
+            products, reason = None, "error"
+        if self.breaker is not None:
+            if reason in ("error", "blocked") or status in FAILURE_STATUSES:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        with self._lock:
+            if products is None:
+                self.counts[f"escalated:{reason}"] += 1
+                self._misses += 1
+                if self._misses == self.give_up_after:
+                    logger.warning(f"[{self.name}] {self._misses} HTTP pages in a row needed a browser, "
+                                   f"using the browser only from now on.")
+            else:
+                self._misses = 0
+        return products
+
+    def fetch(self, url, browser_fetch, page=None):
+        """
+        Returns the products of url, from the HTTP tier when it passes the check, else from browser_fetch().
+        """
+        products = self.fetch_http(url, page) if self.http_enabled else None
+        tier = HTTP if products is not None else BROWSER
+        if products is None:
+            products = browser_fetch()
+        with self._lock:
+            self.counts[tier] += 1
+        return products
+
+    def stats(self):
+        """
+        Returns the page counts per tier, the escalation reasons and the HTTP hit rate.
+        """
+        with self._lock:
+            stats = dict(self.counts)
+        total = stats.get(HTTP, 0) + stats.get(BROWSER, 0)
+        stats["http_rate"] = round(stats.get(HTTP, 0) / total, 3) if total else None
+        return stats
+
+    def close(self):
+        self.session.close()
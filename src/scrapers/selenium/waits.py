@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+
+from selenium.common import StaleElementReferenceException, WebDriverException
+
+# Expected conditions for WebDriverWait(...).until(), in the style of selenium's expected_conditions.
+# Each returns a falsy value until the page is ready, so waits end as soon as the signal appears
+# instead of after a fixed sleep.
+
+_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+_NETWORK_SCRIPT = "return [performance.getEntriesByType('resource').length, document.readyState];"
+
+
+class results_stable:
+    """
+    Ready once at least one element matches selector and the match count has not changed for
+    settle seconds, i.e. the result list has finished rendering. Returns the count.
+    """
+
+    def __init__(self, selector, settle=0.3):
+        self.selector = selector
+        self.settle = settle
+        self._count = None
+        self._since = None
+
+    def __call__(self, driver):
+        count = driver.execute_script(_COUNT_SCRIPT, self.selector)
+        now = time.monotonic()
+        if count != self._count:
+            self._count, self._since = count, now
+            return False
+        if count and now - self._since >= self.settle:
+            return count
+        return False
+
+
+class network_idle:
+    """
+    Ready once the document is parsed and no new resource has been fetched for idle seconds.
+    Uses the page's Resource Timing buffer, so it works on any driver without a CDP event stream.
+    """
+
+    def __init__(self, idle=0.5):
+        self.idle = idle
+        self._seen = None
+        self._since = None
+
+    def __call__(self, driver):
+        seen, state = driver.execute_script(_NETWORK_SCRIPT)
+        now = time.monotonic()
+        if seen != self._seen or state == "loading":
+            self._seen, self._since = seen, now
+            return False
+        return now - self._since >= self.idle
+
+
+class page_changed:
+    """
+    Ready once the page shown before a pagination click has been replaced: the marker element
+    from the old result list went stale, or (without a marker) the URL changed.
+    """
+
+    def __init__(self, marker, old_url=None):
+        self.marker = marker
+        self.old_url = old_url
+
+    def __call__(self, driver):
+        if self.marker is not None:
+            try:
+                self.marker.is_enabled()
+                return False
+            except StaleElementReferenceException:
+                return True
+        try:
+            return driver.current_url != self.old_url
+        except WebDriverException:
+            return False
+
+
+def ready_condition(selector, config=None):
+    """
+    Builds the readiness condition for a 'waits' config section.
+
+    'ready: results' (default) waits for the result count to settle; 'ready: network_idle'
+    additionally waits for the network to go quiet, for pages that fill in results late.
+    """
+    config = config or {}
+    ready = config.get("ready", "results")
+    results = results_stable(selector, config.get("settle", 0.3))
+    if ready == "results":
+        return results
+    if ready == "network_idle":
+        idle = network_idle(config.get("idle", 0.5))
+
+        def results_and_idle(driver):
+            quiet, count = idle(driver), results(driver)
+            return count if quiet else False
+
+        return results_and_idle
+    raise ValueError(f"Unknown readiness strategy '{ready}' (known: results, network_idle).")
+
+
+class Politeness:
+    """
+    Minimum spacing between page requests to one site, kept apart from readiness waits.
+
+    wait() only sleeps for what is left of the interval since the previous request, so time
+    spent loading, waiting and parsing the last page counts towards the delay.
+
+    Args:
+        delay (float): Minimum seconds between requests.
+        jitter (float): Extra random seconds (uniform 0..jitter) added to each interval.
+    """
+
+    def __init__(self, delay=0, jitter=0):
+        self.delay = delay or 0
+        self.jitter = jitter or 0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self):
+        """
+        Blocks until the next request may start and books the interval after it. Returns seconds slept.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slept = max(0.0, self._next_at - now)
+            if slept:
+                time.sleep(slept)
+            self._next_at = time.monotonic() + self.delay + random.uniform(0, self.jitter)
+            return slept
@@ -1,15 +1,70 @@
 import random
-import re
 import time
 
 import requests
-from bs4 import BeautifulSoup
 
 from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.http_cache import get_cache
+from src.scrapers.http_session import acquire_session, release_session
+from src.scrapers.normalize import normalize_product, normalize_products
+from src.scrapers.page_archive import get_archive
+from src.scrapers.parser_backend import get_backend
+from src.scrapers.seen_filter import get_seen_filter
+from src.utils.concurrency import get_controller
+from src.utils.resilience import FAILURE_STATUSES, backoff_delay, get_breaker, parse_retry_after
 from src.utils.logger import get_logger
 
 logger = get_logger("microcenter-static")
 
+CARD_SELECTOR = 'li.product_wrapper'
+
+
+def extract_product(card, backend=None):
+    """
+    Extracts the raw fields of one Micro Center product card (price as text).
+    """
+    parser = backend or get_backend()
+    title_tag = parser.select_one(card, '.h2 a')
+    title = parser.text(title_tag) if title_tag is not None else None
+    href = parser.attr(title_tag, 'href') if title_tag is not None else None
+    url = f"https://www.microcenter.com{href}" if href is not None else None
+
+    img_tag = parser.select_one(card, '.image2 img')
+    img_url = parser.attr(img_tag, 'src') if img_tag is not None else None
+
+    price_tag = parser.select_one(card, ".price_wrapper .price span[itemprop='price']")
+    if price_tag is None:
+        price_tag = parser.select_one(card, ".price_wrapper .price")
+    price = parser.text(price_tag) if price_tag is not None else None
+
+    return {
+        'title': title,
+        'price': price,
+        'rating': -1,
+        'review_count': -1,
+        'url': url,
+        'img_url': img_url,
+    }
+
+
+def parse_product(card, backend=None):
+    """
+    Extracts one product dict from a Micro Center product card.
+    """
+    return normalize_product(extract_product(card, backend), rating_type=int)
+
+
+def parse_page(html, backend=None, partial=False):
+    """
+    Parses a category page into product dicts, keeping only cards with a title and a price.
+    """
+    backend = backend or get_backend()
+    # cards carry no rating, the -1 placeholder stays an int like review_count
+    products = normalize_products([extract_product(card, backend)
+                                   for card in backend.cards(html, CARD_SELECTOR, partial=partial)], rating_type=int)
+    return [p for p in products if p and p.get('title') and p.get('price') is not None]
+
+
 from src.scrapers.factory import ScraperFactory
 
 
@@ -20,7 +75,7 @@ class MicroCenterStaticScraper(BaseScraper):
     """
     is_scrapy = False
 
-    def __init__(self, config):
+    def __init__(self, config, parse_pool=None):
         self.user_agents = config.get("user_agents", [])
         self.max_retries = config.get("max_retries", 3)
         self.base_url = config["base_url"]
@@ -28,106 +83,131 @@ class MicroCenterStaticScraper(BaseScraper):
         self.max_pages = config.get("max_pages", 1)
         self.delay = config.get("delay", 1)
         self.cookies = config.get("cookies", {})
-        self.session = requests.Session()
+        self.http_cache = None
+        cache_config = config.get("http_cache") or {}
+        if cache_config.get("enabled"):
+            self.http_cache = get_cache(cache_config.get("dir", "data_output/http_cache"), cache_config.get("ttl", 3600))
+        # one pooled keep-alive session per source, shared by the category scrapers; its adapter retries
+        # connection errors, throttling statuses are retried (with backoff) in fetch()
+        self.session = acquire_session("microcenter", config.get("http_session"), self.http_cache, self.max_retries)
+        self.concurrency = get_controller("microcenter", config.get("concurrency"))
+        resilience = config.get("resilience") or {}
+        self.breaker = get_breaker(self.base_url, resilience)
+        self.backoff = {"base": resilience.get("backoff_base", 1.0), "cap": resilience.get("backoff_cap", 60.0)}
+        self.parser = get_backend(config.get("parser"))
+        self.partial_parse = config.get("partial_parse", False)
+        # a ParsePool handed in by the runner: raw pages are parsed there instead of on this thread
+        self.parse_pool = parse_pool
+        self.parse_options = {"parser": config.get("parser"), "partial_parse": self.partial_parse}
+        self.archive = get_archive(config.get("archive"))
+        self.category = config.get("category")
+        self.seen = get_seen_filter("microcenter", config.get("seen_filter"))
         logger.info("MicroCenterStaticScraper initialized.")
 
     def fetch(self, url: str):
+        headers = {
+            "User-Agent": random.choice(self.user_agents) if self.user_agents else None,
+            "Accept-Language": "en-US,en;q=0.9",
+            "Referer": "https://www.microcenter.com/",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+            "DNT": "1",
+            "Upgrade-Insecure-Requests": "1",
+        }
+        error = None
         for attempt in range(1, self.max_retries + 1):
-            headers = {
-                "User-Agent": random.choice(self.user_agents) if self.user_agents else None,
-                "Accept-Language": "en-US,en;q=0.9",
-                "Referer": "https://www.microcenter.com/",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Connection": "keep-alive",
-                "DNT": "1",
-                "Upgrade-Insecure-Requests": "1",
-            }
+            logger.info(f"Fetching URL (attempt {attempt}): {url}")
+            # all category threads pause here while the site is throttling us
+            self.breaker.wait()
+            retry_after = None
             try:
-                logger.info(f"Fetching URL (attempt {attempt}): {url}")
-                resp = self.session.get(url, headers=headers, cookies=self.cookies, timeout=20)
+                # one slot per attempt, so AIMD sees every throttled answer and no backoff sleep
+                with self.concurrency.request() as outcome:
+                    resp = self.session.get(url, headers=headers, cookies=self.cookies, timeout=20)
+                    outcome.status = resp.status_code
+            except requests.RequestException as e:
+                error = e
+                self.breaker.record_failure()
+                logger.warning(f"Request failed: {e}")
+            else:
+                if resp.status_code in FAILURE_STATUSES:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    self.breaker.record_failure(retry_after)
+                else:
+                    self.breaker.record_success()
                 if resp.status_code == 200:
                     return resp.text
-                else:
-                    logger.warning(f"Non-200 response: {resp.status_code}")
-            except Exception as e:
-                logger.warning(f"Request failed: {e}")
+                logger.warning(f"Non-200 response: {resp.status_code}")
             if attempt < self.max_retries:
-                logger.info("Retrying fetch...")
-                time.sleep(self.delay)
-        raise RuntimeError(f"Failed to fetch page after {self.max_retries} attempts: {url}")
+                pause = backoff_delay(attempt, retry_after=retry_after, **self.backoff)
+                logger.info(f"Retrying fetch in {pause:.1f}s...")
+                time.sleep(pause)
+        raise RuntimeError(f"Failed to fetch page after {self.max_retries} attempts: {url}") from error
 
     def parse(self, html: str):
-        soup = BeautifulSoup(html, "html.parser")
-        product_cards = soup.select('li.product_wrapper')
-        products = []
-        for card in product_cards:
-            product = self.parse_product(card)
-            if product and product.get('title') and product.get('price') is not None:
-                products.append(product)
+        if self.parse_pool is not None:
+            products = self.parse_pool.parse("microcenter", html, self.parse_options, self.category)
+        else:
+            products = parse_page(html, self.parser, self.partial_parse)
         logger.info(f"Parsed {len(products)} products from page.")
         return products
 
     def parse_product(self, card):
-        title_tag = card.select_one('.h2 a')
-        title = title_tag.get_text(strip=True) if title_tag else None
-        url = f"https://www.microcenter.com{title_tag['href']}" if title_tag and title_tag.has_attr('href') else None
-
-        img_tag = card.select_one('.image2 img')
-        img_url = img_tag['src'] if img_tag and img_tag.has_attr('src') else None
-
-        price = None
-        price_tag = card.select_one(".price_wrapper .price span[itemprop='price']")
-        if price_tag:
-            price_txt = price_tag.get_text(strip=True)
-            price_match = re.search(r"[\d,.]+", price_txt)
-            if price_match:
-                try:
-                    price = float(price_match.group(0).replace(',', ''))
-                except Exception:
-                    price = None
-        else:
-            price_tag = card.select_one(".price_wrapper .price")
-            if price_tag:
-                price_txt = price_tag.get_text(strip=True)
-                price_match = re.search(r"[\d,.]+", price_txt)
-                if price_match:
-                    try:
-                        price = float(price_match.group(0).replace(',', ''))
-                    except Exception:
-                        price = None
-
-        return {
-            'title': title,
-            'price': price,
-            'rating': -1,
-            'review_count': -1,
-            'url': url,
-            'img_url': img_url,
-        }
+        return parse_product(card, self.parser)
 
     def scrape(self, url: str):
         return self.scrape_category(url)
 
-    def scrape_category(self, category_url, max_pages=None, delay=None):
-        all_products = []
+    def iter_pages(self, category_url, max_pages=None, delay=None, start_page=1):
+        """
+        Yields (page, products) for each category page as soon as it is parsed.
+        Pages are URL-addressed, so start_page > 1 jumps straight to that page.
+        """
+        yield from self.skip_seen(self._walk_pages(category_url, max_pages, delay, start_page))
+
+    def _walk_pages(self, category_url, max_pages=None, delay=None, start_page=1):
+        pages = self._fetch_pages(category_url, max_pages, delay, start_page)
+        if self.parse_pool is not None:
+            # the next pages are fetched while the pool parses this one
+            parsed = self.parse_pool.iter_parse("microcenter", pages, self.parse_options, self.category)
+        else:
+            parsed = ((page, self.parse(html)) for page, html in pages)
+
+        for page, page_products in parsed:
+            logger.info(f"Scraped page {page}, found {len(page_products)} products.")
+            yield page, page_products
+            if len(page_products) == 0:
+                break
+
+    def _fetch_pages(self, category_url, max_pages=None, delay=None, start_page=1):
+        """
+        Yields (page, html) for each category page, pausing between requests.
+        """
         max_pages = max_pages or self.max_pages
         delay = delay or self.delay
 
-        for page in range(1, max_pages + 1):
+        for page in range(start_page, max_pages + 1):
+            if page > start_page:
+                time.sleep(self.delay)
             url = (
                 f"{category_url}&page={page}" if "search_results.aspx" in category_url and page > 1
                 else f"{category_url}?page={page}" if page > 1
                 else category_url
             )
             html = self.fetch(url)
-            page_products = self.parse(html)
+            self.archive_page("microcenter", url, html, page)
+            yield page, html
+
+    def scrape_category(self, category_url, max_pages=None, delay=None):
+        all_products = []
+        for _, page_products in self.iter_pages(category_url, max_pages, delay):
             all_products.extend(page_products)
-            logger.info(f"Scraped page {page}, found {len(page_products)} products.")
-            if len(page_products) == 0:
-                break
-            time.sleep(self.delay)
         logger.info(f"Scraping completed. Total products: {len(all_products)}")
         return all_products
 
     def close(self):
-        self.session.close()
+        if self.seen is not None:
+            # staged keys reach the filter only after the runner has persisted the products
+            logger.info(f"Seen-url filter stats: {self.seen.stats()}")
+        if self.http_cache is not None:
+            logger.info(f"HTTP cache stats: {self.http_cache.stats()}")
+        release_session(self.session)
@@ -0,0 +1,180 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.utils.logger import get_logger
+
+logger = get_logger("concurrency")
+
+THROTTLE_STATUSES = {408, 429}
+
+
+class RequestOutcome:
+    """
+    Mutable result holder handed out by AdaptiveConcurrencyController.request().
+    Callers set `status` (HTTP status, if known) or call `failed()` for timeouts/blocks.
+    """
+
+    def __init__(self):
+        self.status = None
+        self.error = False
+
+    def failed(self):
+        self.error = True
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD (additive increase / multiplicative decrease) limiter for in-flight requests of one source.
+
+    While responses are healthy the limit grows by `increase` per window of `limit` successes
+    (roughly +increase per round trip); on 429/5xx/timeouts, or when latency exceeds
+    `latency_target`, it is multiplied by `decrease`. Cuts are spaced by at least one average
+    latency so a burst of failures from the same window only counts once.
+
+    Args:
+        name (str): Source name, used for logging.
+        initial (int): Starting in-flight limit.
+        min_limit (int): Lower bound for the limit.
+        max_limit (int): Upper bound for the limit.
+        increase (float): Additive step per window of successes.
+        decrease (float): Multiplicative factor applied on congestion (0 < decrease < 1).
+        latency_target (float, optional): Seconds; slower responses count as congestion.
+        window (int): Number of recent latencies kept for the moving average.
+    """
+
+    def __init__(self, name, initial=2, min_limit=1, max_limit=8, increase=1.0, decrease=0.5,
+                 latency_target=None, window=20):
+        self.name = name
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.successes = 0
+        self.errors = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_config(cls, name, config=None):
+        """
+        Builds a controller from a scraper's `concurrency` config section.
+        """
+        config = config or {}
+        return cls(
+            name,
+            initial=config.get("initial", 2),
+            min_limit=config.get("min", 1),
+            max_limit=config.get("max", 8),
+            increase=config.get("increase", 1.0),
+            decrease=config.get("decrease", 0.5),
+            latency_target=config.get("latency_target"),
+        )
+
+    @property
+    def current_limit(self):
+        return int(self.limit)
+
+    def acquire(self):
+        """
+        Blocks until an in-flight slot is available under the current limit.
+        """
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    def record(self, latency, status=None, error=False):
+        """
+        Feeds one observed request into the AIMD policy.
+
+        Args:
+            latency (float): Request duration in seconds.
+            status (int, optional): HTTP status code, if known.
+            error (bool): True for timeouts, connection errors and detected blocks.
+        """
+        congested = (
+                error
+                or status in THROTTLE_STATUSES
+                or (status is not None and status >= 500)
+                or (self.latency_target is not None and latency > self.latency_target)
+        )
+        with self._cond:
+            self.latencies.append(latency)
+            if congested:
+                self.errors += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= self.average_latency():
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_decrease = now
+                    logger.info(f"[{self.name}] congestion (status={status}, error={error}, "
+                                f"latency={latency:.2f}s), limit -> {self.current_limit}")
+            else:
+                self.successes += 1
+                self.limit = min(self.max_limit, self.limit + self.increase / max(self.limit, 1.0))
+            self._cond.notify_all()
+
+    def average_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    @contextmanager
+    def request(self):
+        """
+        Holds an in-flight slot for the duration of one request and records its outcome.
+        Exceptions raised inside the block are recorded as errors and re-raised.
+        """
+        self.acquire()
+        outcome = RequestOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        except Exception:
+            outcome.failed()
+            raise
+        finally:
+            self.record(time.monotonic() - start, status=outcome.status, error=outcome.error)
+            self.release()
+
+    def snapshot(self):
+        """
+        Returns current controller state as a dict (for logging/metrics).
+        """
+        with self._cond:
+            return {
+                "source": self.name,
+                "limit": self.current_limit,
+                "in_flight": self.in_flight,
+                "avg_latency": round(self.average_latency(), 3),
+                "successes": self.successes,
+                "errors": self.errors,
+            }
+
+
+_controllers = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(source, config=None):
+    """
+    Returns the process-wide controller for a source, creating it on first use.
+
+    Args:
+        source (str): Source name (e.g. 'amazon').
+        config (dict, optional): The source's `concurrency` config section.
+    """
+    with _controllers_lock:
+        controller = _controllers.get(source)
+        if controller is None:
+            controller = AdaptiveConcurrencyController.from_config(source, config)
+            _controllers[source] = controller
+        return controller
@@ -1,3 +1,5 @@
+import queue
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from src.utils.logger import get_logger
@@ -5,12 +7,84 @@ from src.utils.logger import get_logger
 logger = get_logger("threaded-executor")
 
 
+def job_config(base_config, job_name):
+    """
+    Returns the config for one job: base_config merged with its entry under 'category_overrides',
+    plus the job name as 'category'.
+    """
+    overrides = base_config.get("category_overrides", {}).get(job_name) or {}
+    return {**base_config, **overrides, "category": job_name}
+
+
+def new_scraper(scraper_cls, config, parse_pool=None):
+    """
+    Instantiates a scraper, handing it the runner's ParsePool when there is one.
+    """
+    if parse_pool is None:
+        return scraper_cls(config)
+    return scraper_cls(config, parse_pool=parse_pool)
+
+
+def commit_seen(scraper):
+    """
+    Commits the seen-url keys of a job whose products were persisted (see BaseScraper.commit_seen).
+    """
+    commit = getattr(scraper, "commit_seen", None)
+    if commit is not None:
+        commit()
+
+
+def stage_seen(scraper, seen_staged):
+    """
+    Appends the staged seen-url keys of a job whose products were all handed over to seen_staged,
+    for the caller to commit (seen_filter.commit_staged) once it has persisted them.
+    Without a seen_staged list the keys are dropped.
+    """
+    session_of = getattr(scraper, "seen_session", None)
+    session = session_of() if session_of is not None else None
+    if session is not None and seen_staged is not None:
+        staged = session.staged()
+        if staged:
+            seen_staged.append(staged)
+
+
+def checkpointed_pages(scraper_cls, base_config, checkpoint, source, job_name, url, parse_pool=None,
+                       seen_staged=None):
+    """
+    Yields (page, products) of one job through a CheckpointStore. The scraper is only started when
+    the checkpoint leaves pages to scrape, and is always closed. Errors are logged and end the job;
+    its completed pages stay checkpointed for a resumed run, but its seen-url keys are only
+    staged when every page was handed over.
+    """
+    scraper = None
+
+    def scrape_pages(start_page):
+        nonlocal scraper
+        scraper = new_scraper(scraper_cls, job_config(base_config, job_name), parse_pool)
+        logger.info(f"[{job_name}] Streaming {url} from page {start_page}")
+        return scraper.iter_pages(url, start_page=start_page)
+
+    try:
+        yield from checkpoint.iter_pages(source, job_name, scrape_pages)
+        if scraper is not None:
+            stage_seen(scraper, seen_staged)
+    except Exception as e:
+        logger.error(f"[{job_name}] ERROR: {e}")
+    finally:
+        if scraper is not None:
+            scraper.close()
+
+
 def threaded_scrape_executor(
         scraper_cls,
         base_config,
         jobs: dict,  # e.g. {'laptops': '/s?k=laptops', ...}
         max_workers=None,  # number of parallel threads
         url_prefix: str = "",
+        checkpoint=None,
+        source: str = None,
+        parse_pool=None,
+        seen_staged=None,
 ):
     """
     threaded scrape executor for any scraper class.
@@ -21,6 +95,12 @@ def threaded_scrape_executor(
         jobs: mapping of job name -> path or url (ex: {'laptops': '/s?k=laptops'})
         max_workers: max parallel threads (default: len(jobs))
         url_prefix: (optional) prefix for all jobs
+        checkpoint: (optional) CheckpointStore; pages are then scraped with .iter_pages(url, start_page=...)
+                    and checkpointed one by one under (source, job name)
+        source: scraper name used for the checkpoints
+        parse_pool: (optional) ParsePool handed to every scraper
+        seen_staged: (optional) list receiving the staged seen-url keys of every completed job
+                     (see stage_seen); nothing is committed here
 
     Returns:
         usually list of products
@@ -28,11 +108,16 @@ def threaded_scrape_executor(
     results = {}
 
     def worker(job_name, job_path):
-        scraper = scraper_cls(base_config)
+        if checkpoint is not None:
+            return job_name, [item for _, items in checkpointed_pages(
+                scraper_cls, base_config, checkpoint, source, job_name, f"{url_prefix}{job_path}", parse_pool,
+                seen_staged) for item in items]
+        scraper = new_scraper(scraper_cls, job_config(base_config, job_name), parse_pool)
         url = f"{url_prefix}{job_path}"
         try:
             logger.info(f"[{job_name}] Scraping {url}")
             items = scraper.scrape(url)
+            stage_seen(scraper, seen_staged)
             logger.info(f"[{job_name}] Done ({len(items)} items)")
             return job_name, items
         except Exception as e:
@@ -51,3 +136,99 @@ def threaded_scrape_executor(
             job_name, items = future.result()
             results[job_name] = items
     return results
+
+
+def threaded_page_executor(
+        scraper_cls,
+        base_config,
+        jobs: dict,
+        max_workers=None,
+        url_prefix: str = "",
+        queue_size: int = 16,
+        checkpoint=None,
+        source: str = None,
+        parse_pool=None,
+        seen_staged=None,
+):
+    """
+    streaming variant of threaded_scrape_executor, yields pages as soon as they are parsed.
+
+    Worker threads push every parsed page into a bounded queue, so a slow consumer
+    blocks the scrapers (back-pressure) instead of letting results pile up in memory.
+
+    Args:
+        scraper_cls: the scraper class to instantiate (with .iter_pages(url) and .close())
+        base_config: base config dict for this scraper
+        jobs: mapping of job name -> path or url (ex: {'laptops': '/s?k=laptops'})
+        max_workers: max parallel threads (default: len(jobs))
+        url_prefix: (optional) prefix for all jobs
+        queue_size: max number of parsed pages buffered between workers and consumer
+        checkpoint: (optional) CheckpointStore for per-page checkpoints and resume
+        source: scraper name used for the checkpoints
+        parse_pool: (optional) ParsePool handed to every scraper
+        seen_staged: (optional) list receiving the staged seen-url keys of every job whose pages were
+                     all yielded (see stage_seen)
+
+    Yields:
+        tuple: (job_name, page_number, list of products)
+    """
+    pages = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(job_name, job_path):
+        scraper = None
+        url = f"{url_prefix}{job_path}"
+        if checkpoint is not None:
+            pages = checkpointed_pages(scraper_cls, base_config, checkpoint, source, job_name, url, parse_pool,
+                                       seen_staged)
+            try:
+                for page, items in pages:
+                    if not put((job_name, page, items)):
+                        break
+            finally:
+                pages.close()
+                put((job_name, done, None))
+            return
+        try:
+            scraper = new_scraper(scraper_cls, job_config(base_config, job_name), parse_pool)
+            logger.info(f"[{job_name}] Streaming {url}")
+            total = 0
+            for page, items in scraper.iter_pages(url):
+                total += len(items)
+                if not put((job_name, page, items)):
+                    break
+            else:
+                stage_seen(scraper, seen_staged)
+            logger.info(f"[{job_name}] Done ({total} items)")
+        except Exception as e:
+            logger.error(f"[{job_name}] ERROR: {e}")
+        finally:
+            if scraper is not None:
+                scraper.close()
+            put((job_name, done, None))
+
+    max_workers = max_workers or len(jobs)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for job_name, job_path in jobs.items():
+            executor.submit(worker, job_name, job_path)
+        remaining = len(jobs)
+        while remaining:
+            job_name, page, items = pages.get()
+            if page is done:
+                remaining -= 1
+                continue
+            yield job_name, page, items
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
@@ -0,0 +1,199 @@
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from src.utils.logger import get_logger
+
+logger = get_logger("resilience")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# statuses that mean "slow down" rather than "this page is broken"
+FAILURE_STATUSES = {403, 408, 429, 500, 502, 503, 504, 522, 524}
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0, retry_after=None):
+    """
+    Seconds to wait before retry number `attempt` (1-based): "full jitter" exponential backoff,
+    uniform in [0, min(cap, base * 2 ** attempt)], so retrying workers do not line up. A server's
+    Retry-After is honoured as a lower bound (still capped).
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after:
+        delay = max(delay, min(cap, retry_after))
+    return delay
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parses a Retry-After header (seconds or an HTTP date) into seconds, None when missing or invalid.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode("latin-1")
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker shared by every worker that fetches from that domain.
+
+    While closed, requests pass. When failure_threshold failures (throttling statuses, timeouts,
+    block pages) happen within `window` seconds, the breaker opens and every worker waiting on it
+    pauses for `cooldown` seconds, or longer when the server sent a Retry-After. Then a single
+    probe request is let through (half-open): success closes the breaker, failure opens it again
+    with a doubled cooldown (up to max_cooldown).
+
+    Typical usage:
+        breaker = get_breaker("www.example.com")
+        breaker.wait()
+        ... fetch ...
+        breaker.record_success()  # or breaker.record_failure(retry_after=...)
+
+    Args:
+        name (str): Domain, used for logging.
+        failure_threshold (int): Failures within the window that open the breaker.
+        window (float): Seconds over which failures are counted.
+        cooldown (float): Initial pause once opened.
+        max_cooldown (float): Upper bound for the doubled pause.
+    """
+
+    def __init__(self, name, failure_threshold=5, window=60.0, cooldown=30.0, max_cooldown=600.0):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.window = window
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.trips = 0
+        self._failures = deque()
+        self._open_until = 0.0
+        self._probe_at = None
+        self._cond = threading.Condition()
+
+    def admit(self):
+        """
+        Non-blocking check: returns 0 when a request may start now (claiming the probe when
+        half-open), otherwise the seconds to wait before asking again.
+        """
+        with self._cond:
+            return self._admit(time.monotonic())
+
+    def _admit(self, now):
+        if now < self._open_until:
+            return self._open_until - now
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+            self._probe_at = None
+        if self.state == HALF_OPEN:
+            # a probe whose outcome never got recorded expires after one cooldown
+            if self._probe_at is not None and now - self._probe_at < self.cooldown:
+                return min(1.0, self.cooldown)
+            self._probe_at = now
+        return 0.0
+
+    def wait(self):
+        """
+        Blocks while the breaker is open (or another worker's probe is in flight). Returns seconds waited.
+        """
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                delay = self._admit(time.monotonic())
+                if not delay:
+                    return time.monotonic() - started
+                self._cond.wait(delay)
+
+    def record_success(self):
+        with self._cond:
+            if self.state != CLOSED:
+                logger.info(f"[{self.name}] circuit closed")
+            self.state = CLOSED
+            self.cooldown = self.base_cooldown
+            self._probe_at = None
+            self._failures.clear()
+            self._cond.notify_all()
+
+    def record_failure(self, retry_after=None):
+        """
+        Records one failed request; opens the breaker when failures spike, or right away for a
+        failed probe. A Retry-After always pauses the domain for at least that long.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window:
+                self._failures.popleft()
+            if self.state == HALF_OPEN:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._trip(now, retry_after)
+            elif self.state == CLOSED and len(self._failures) >= self.failure_threshold:
+                self._trip(now, retry_after)
+            if retry_after:
+                self._open_until = max(self._open_until, now + min(retry_after, self.max_cooldown))
+            self._cond.notify_all()
+
+    def _trip(self, now, retry_after=None):
+        pause = max(self.cooldown, min(retry_after or 0, self.max_cooldown))
+        self.state = OPEN
+        self.trips += 1
+        self._probe_at = None
+        self._failures.clear()
+        self._open_until = max(self._open_until, now + pause)
+        logger.warning(f"[{self.name}] circuit open: pausing all requests for {pause:.0f}s")
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "domain": self.name,
+                "state": self.state,
+                "trips": self.trips,
+                "paused_for": round(max(0.0, self._open_until - time.monotonic()), 1),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url_or_domain, config=None):
+    """
+    Returns the process-wide CircuitBreaker of a domain (a URL's hostname), creating it on first use.
+
+    Args:
+        url_or_domain (str): URL or hostname.
+        config (dict, optional): The source's 'resilience' config section.
+    """
+    domain = urlparse(url_or_domain).hostname if "://" in url_or_domain else url_or_domain
+    config = config or {}
+    with _breakers_lock:
+        breaker = _breakers.get(domain)
+        if breaker is None:
+            breaker = _breakers[domain] = CircuitBreaker(
+                domain,
+                failure_threshold=config.get("failure_threshold", 5),
+                window=config.get("window", 60),
+                cooldown=config.get("cooldown", 30),
+                max_cooldown=config.get("max_cooldown", 600),
+            )
+        return breaker
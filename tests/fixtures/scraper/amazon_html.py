@@ -17,3 +17,44 @@ def sample_amazon_product_html():
         </body>
     </html>
     """
+
+
+@pytest.fixture
+def sample_amazon_results_html():
+    return """
+    <html>
+        <head><script>var cards = "<div data-component-type='s-search-result'></div>";</script></head>
+        <body>
+            <div data-component-type='s-search-result'>
+                <div class='sg-col-inner'>
+                    <h2><a href='/dp/B0AAAA?ref=sr_1'><span> Laptop &amp; Sleeve </span></a></h2>
+                    <img class='s-image' src='https://m.media-amazon.com/a.jpg'/>
+                    <span class='a-price'><span class='a-offscreen'>Save 10%</span><span class='a-offscreen'>$1,299.00</span></span>
+                    <i class='a-icon a-icon-star-mini'><span class='a-icon-alt'>4.6 out of 5 stars</span></i>
+                    <div data-cy='reviews-block'>
+                        <span class='a-size-small puis-normal-weight-text'>(1,234)</span>
+                    </div>
+                </div>
+            </div>
+            <div data-component-type='s-search-result'>
+                <div class='sg-col-inner'>
+                    <h2><span>Monitor <!-- sponsored --> 27"</span></h2>
+                    <span class='a-price-whole'> 199 </span><span class='a-price-fraction'>49</span>
+                    <span class='a-size-small a-color-base'>3.9</span>
+                    <span class='a-size-base s-underline-text'>87</span>
+                </div>
+                <a href='/dp/B0BBBB'>details</a>
+            </div>
+            <div data-component-type='s-search-result'>
+                <span class='a-offscreen'>€45.10</span>
+                <div class='sg-col-inner'>
+                    <h2><span>Cable</span></h2>
+                    <i class='a-icon-star'><span class='a-icon-alt'></span></i>
+                </div>
+            </div>
+            <div data-component-type='s-search-result'>
+                <p>no details</p>
+            </div>
+        </body>
+    </html>
+    """
@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.fixture
+def sample_amazon_detail_html():
+    return """
+    <html>
+        <body>
+            <div id='availability'><span> In Stock </span></div>
+            <div id='deliveryBlockMessage'>FREE delivery <b>Friday</b></div>
+            <a id='sellerProfileTriggerId'>Acme Store</a>
+            <div id='productOverview_feature_div'>
+                <table>
+                    <tr><td><span>Brand</span></td><td><span>Acer</span></td></tr>
+                    <tr><td><span>Screen Size</span></td><td><span>15.6 Inches</span></td></tr>
+                </table>
+            </div>
+            <table id='productDetails_techSpec_section_1'>
+                <tr><th> Brand </th><td>Other</td></tr>
+                <tr><th> RAM </th><td>16 GB</td></tr>
+            </table>
+        </body>
+    </html>
+    """
+
+
+@pytest.fixture
+def sample_ebay_detail_html():
+    return """
+    <html>
+        <body>
+            <div class='x-item-condition-text'><span class='ux-textspans'>Used</span></div>
+            <div class='x-sellercard-atf__info__about-seller'><a><span>gadget_shop</span></a></div>
+            <div class='ux-labels-values--shipping'>
+                <div class='ux-labels-values__labels'>Shipping:</div>
+                <div class='ux-labels-values__values'>Free Standard Shipping</div>
+            </div>
+            <div id='qtyAvailability'><span class='ux-textspans'>More than 10 available</span></div>
+            <div class='ux-layout-section-evo__col'>
+                <div class='ux-labels-values__labels'>Brand</div>
+                <div class='ux-labels-values__values'>Sony</div>
+            </div>
+            <div class='ux-layout-section-evo__col'>
+                <div class='ux-labels-values__labels'>Screen Size</div>
+                <div class='ux-labels-values__values'>55 in</div>
+            </div>
+        </body>
+    </html>
+    """
+
+
+@pytest.fixture
+def sample_microcenter_detail_html():
+    return """
+    <html>
+        <body>
+            <div id='pnlInventory'><span class='inventoryCnt'>SOLD OUT</span></div>
+            <div id='tab-specs'>
+                <div class='spec-body'><div>Memory Size</div><div>16 GB</div></div>
+                <div class='spec-body'><div>Interface</div><div>PCIe 4.0</div></div>
+            </div>
+        </body>
+    </html>
+    """
@@ -0,0 +1,43 @@
+import pytest
+
+@pytest.fixture
+def ebay_config():
+    return {
+        "base_url": "https://www.ebay.com",
+        "categories": {"laptops": "/sch/i.html?_nkw=laptops"},
+        "max_pages": 1,
+        "delay": 0,
+    }
+
+@pytest.fixture
+def sample_ebay_results_html():
+    return """
+    <html>
+        <body>
+            <ul class='srp-results'>
+                <li class='s-item'>
+                    <div class='s-item__title'>Shop on eBay</div>
+                    <span class='s-item__price'>$20.00</span>
+                </li>
+                <li class='s-item'>
+                    <a class='s-item__link' href='https://www.ebay.com/itm/111'>
+                        <div class='s-item__title'><span role='heading'>ThinkPad T14 &ndash; 16GB</span></div>
+                    </a>
+                    <img class='s-item__image-img' src='https://i.ebayimg.com/111.jpg'/>
+                    <span class='s-item__price'>$1,049.50</span>
+                    <span class='SECONDARY_INFO'>Pre-Owned</span>
+                </li>
+                <li class='s-item'>
+                    <a class='s-item__link' href='https://www.ebay.com/itm/222'>
+                        <div class='s-item__title'>Dock</div>
+                    </a>
+                    <img class='s-item__image-img'/>
+                    <span class='s-item__price'>$30.00 to $45.00</span>
+                </li>
+                <li class='s-item'>
+                    <div class='s-item__title'>12 results for laptops</div>
+                </li>
+            </ul>
+        </body>
+    </html>
+    """
@@ -17,3 +17,33 @@ def sample_microcenter_product_html():
         </body>
     </html>
     """
+
+
+@pytest.fixture
+def sample_microcenter_results_html():
+    return """
+    <html>
+        <body>
+            <ul>
+                <li class='product_wrapper'>
+                    <div class='h2'><a href='/product/1/gpu'>GPU <b>16GB</b></a></div>
+                    <div class='image2'><img src='https://image.com/gpu.jpg' /></div>
+                    <div class='price_wrapper'>
+                        <div class='price'><span itemprop='price'>$1,099.99</span></div>
+                    </div>
+                </li>
+                <li class='product_wrapper'>
+                    <div class='h2'><a href='/product/2/ram'>RAM Kit</a></div>
+                    <div class='image2'><img /></div>
+                    <div class='price_wrapper'><div class='price'>Now $89.99 <script>track()</script></div></div>
+                </li>
+                <li class='product_wrapper'>
+                    <div class='h2'><a href='/product/3/no-price'>No Price</a></div>
+                </li>
+                <li class='product_wrapper'>
+                    <div class='price_wrapper'><div class='price'>$5.00</div></div>
+                </li>
+            </ul>
+        </body>
+    </html>
+    """
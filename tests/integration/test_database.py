@@ -2,6 +2,7 @@ import os
 import sqlite3
 import tempfile
 import uuid
+from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
@@ -24,6 +25,17 @@ def test_save_and_load_products_raw(in_memory_db, sample_products):
     assert len(df2) == 2
 
 
+def test_save_products_skips_same_product_key_under_another_url(in_memory_db, sample_products):
+    first = {**sample_products[0], "product_key": "amazon:B07W6JN8V6"}
+    again = {**first, "url": "https://example.com/acer-aspire-5?ref=sr_1_2", "category": "pcs"}
+    database.save_products_raw([first, again, sample_products[1]])
+    database.save_products([first, again])
+    raw = database.load_products_raw()
+    assert len(raw) == 2
+    assert raw.loc[raw["url"] == first["url"], "product_key"].item() == "amazon:B07W6JN8V6"
+    assert list(database.load_products()["category"]) == ["laptops"]
+
+
 def test_save_and_load_products(in_memory_db, sample_products):
     database.save_products(sample_products)
     df = database.load_products(as_dataframe=True)
@@ -104,3 +116,23 @@ def test_init_db_error(monkeypatch):
     monkeypatch.setattr("src.data.database._db_params", {}, raising=False)
     with pytest.raises(Exception):
         database.init_db_with_sql("schema.sql")
+
+
+def test_upsert_product_details_and_enrichment_targets(in_memory_db, sample_products):
+    database.save_products(sample_products)
+    acer, hp = (p["url"] for p in sample_products)
+    assert {t["url"] for t in database.load_enrichment_targets()} == {acer, hp}
+
+    rows = [{"url": acer, "source": "amazon", "seller": "Acer", "in_stock": True, "specs": {"RAM": "8 GB"},
+             "status": "ok"},
+            {"url": hp, "source": "amazon", "seller": "HP", "status": "ok",
+             "enriched_at": datetime.utcnow() - timedelta(days=10)}]
+    assert database.upsert_product_details(rows) == 2
+    assert database.load_enrichment_targets(max_age_hours=72) == [{"source": "amazon", "url": hp}]
+
+    database.upsert_product_details([{"url": acer, "source": "amazon", "seller": "Acer Store", "in_stock": False,
+                                      "specs": {"RAM": "16 GB"}, "status": "ok"}])
+    details = pd.read_sql("SELECT * FROM product_details ORDER BY url", in_memory_db)
+    assert len(details) == 2
+    assert details.loc[0, "seller"] == "Acer Store"
+    assert database.load_enrichment_targets(sources=["ebay"]) == []
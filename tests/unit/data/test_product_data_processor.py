@@ -16,6 +16,17 @@ def test_clean_and_validate_removes_invalid_and_duplicates(processor):
     assert (df['price'].isnull().sum() == 0)
 
 
+def test_clean_and_validate_drops_duplicate_product_keys():
+    df = pd.DataFrame([
+        {"title": "A", "price": 1, "url": "https://x.test/dp/B1?ref=1", "product_key": "amazon:B1"},
+        {"title": "A", "price": 1, "url": "https://x.test/dp/B1?ref=2", "product_key": "amazon:B1"},
+        {"title": "B", "price": 2, "url": "https://x.test/b", "product_key": None},
+        {"title": "C", "price": 3, "url": "https://x.test/c", "product_key": None},
+    ])
+    cleaned = ProductDataProcessor(df).clean_and_validate().get_df()
+    assert list(cleaned["title"]) == ["A", "B", "C"]
+
+
 def test_clean_and_validate_numeric_and_lowercase(processor):
     df = processor.clean_and_validate().get_df()
     assert df['price'].dtype in [float, np.float64]
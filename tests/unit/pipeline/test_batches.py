@@ -0,0 +1,47 @@
+import math
+
+from src.pipeline.batches import (
+    decode_products, encode_products, iter_encoded_chunks, iter_spilled_chunks, spill_chunks
+)
+
+
+def sample_products():
+    return [
+        {"title": "Laptop ü", "price": 999.99, "rating": 4.5, "review_count": 1200,
+         "url": "https://a.com/dp/1", "img_url": None, "source": "amazon", "category": "laptops"},
+        {"title": "Monitor", "price": None, "rating": -1, "review_count": -1,
+         "url": "https://a.com/dp/2", "img_url": "img.jpg", "source": "amazon", "category": "monitors"},
+        {"title": "", "price": float("nan"), "url": "u3", "extra": {"nested": True}},
+    ]
+
+
+def test_round_trip_preserves_values_types_and_missing_keys():
+    products = sample_products()
+    decoded = decode_products(encode_products(products))
+    assert decoded[0] == products[0]
+    assert decoded[1]["price"] is None
+    assert decoded[1]["rating"] == -1 and isinstance(decoded[1]["rating"], int)
+    assert "rating" not in decoded[2] and "source" not in decoded[2]
+    assert decoded[2]["title"] == ""
+    assert math.isnan(decoded[2]["price"])
+    assert decoded[2]["extra"] == {"nested": True}
+
+
+def test_empty_batch():
+    assert decode_products(encode_products([])) == []
+
+
+def test_columnar_blob_is_smaller_than_records_pickle():
+    import pickle
+    products = [dict(sample_products()[0], url=f"https://a.com/dp/{i}") for i in range(500)]
+    assert len(encode_products(products)) < len(pickle.dumps(products))
+
+
+def test_chunks_and_spill_files(tmp_path):
+    products = [{"title": f"p{i}", "price": float(i)} for i in range(7)]
+    chunks = list(iter_encoded_chunks(products, chunk_size=3))
+    assert len(chunks) == 3
+    path = spill_chunks(chunks, str(tmp_path))
+    restored = [p for chunk in iter_spilled_chunks(path) for p in decode_products(chunk)]
+    assert restored == products
+    assert not list(tmp_path.iterdir())
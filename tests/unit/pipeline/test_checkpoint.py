@@ -0,0 +1,86 @@
+import pytest
+
+from src.pipeline.checkpoint import CheckpointStore, get_checkpoint_store
+from src.utils.executor import threaded_page_executor, threaded_scrape_executor
+
+
+class PagedScraper:
+    """Three pages per category; fails on page `fail_on` when set."""
+    fail_on = None
+    started = []
+
+    def __init__(self, config):
+        self.category = config["category"]
+        PagedScraper.started.append(self.category)
+
+    def iter_pages(self, url, start_page=1):
+        for page in range(start_page, 4):
+            if page == self.fail_on:
+                raise RuntimeError("node preempted")
+            yield page, [{"url": f"{url}/{page}/{i}", "price": float(page)} for i in range(2)]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def reset_scraper():
+    PagedScraper.fail_on = None
+    PagedScraper.started = []
+
+
+def test_pages_are_read_back_in_order(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.record_page("shop", "laptops", 1, [{"url": "a"}], next_url="https://shop/p2")
+    store.record_page("shop", "laptops", 2, [{"url": "b"}, {"url": "c"}])
+    assert list(store.completed_pages("shop", "laptops")) == [(1, [{"url": "a"}]), (2, [{"url": "b"}, {"url": "c"}])]
+    assert store.state("shop", "laptops")["last_page"] == 2
+    assert store.state("shop", "laptops")["products"] == 3
+    assert not store.state("shop", "laptops")["done"]
+
+
+def test_truncated_line_and_unconfirmed_page_are_ignored(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.record_page("shop", "gpus", 1, [{"url": "a"}])
+    segment, _ = store._paths("shop", "gpus")
+    with open(segment, "a", encoding="utf-8") as f:
+        f.write('{"page": 2, "products": [{"url": "b"}]}\n{"page": 3, "prod')
+    assert list(store.completed_pages("shop", "gpus")) == [(1, [{"url": "a"}])]
+
+
+def test_interrupted_crawl_resumes_at_next_page(tmp_path):
+    jobs = {"laptops": "/l", "ram": "/r"}
+    PagedScraper.fail_on = 3
+    first = threaded_scrape_executor(PagedScraper, {}, jobs, checkpoint=CheckpointStore(str(tmp_path)),
+                                     source="shop")
+    assert len(first["laptops"]) == 4
+
+    PagedScraper.fail_on = None
+    resumed = threaded_scrape_executor(PagedScraper, {}, jobs,
+                                       checkpoint=CheckpointStore(str(tmp_path), resume=True), source="shop")
+    assert [p["url"] for p in resumed["laptops"]] == [f"/l/{page}/{i}" for page in (1, 2, 3) for i in range(2)]
+    assert CheckpointStore(str(tmp_path)).state("shop", "ram")["done"]
+
+
+def test_completed_categories_are_not_scraped_again(tmp_path):
+    jobs = {"laptops": "/l"}
+    threaded_scrape_executor(PagedScraper, {}, jobs, checkpoint=CheckpointStore(str(tmp_path)), source="shop")
+    PagedScraper.started = []
+    pages = list(threaded_page_executor(PagedScraper, {}, jobs,
+                                        checkpoint=CheckpointStore(str(tmp_path), resume=True), source="shop"))
+    assert [page for _, page, _ in pages] == [1, 2, 3]
+    assert PagedScraper.started == []
+
+
+def test_fresh_run_discards_old_checkpoint(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.record_page("shop", "laptops", 7, [{"url": "stale"}])
+    threaded_scrape_executor(PagedScraper, {}, {"laptops": "/l"}, checkpoint=store, source="shop")
+    assert [page for page, _ in store.completed_pages("shop", "laptops")] == [1, 2, 3]
+
+
+def test_registry_is_optional(tmp_path):
+    config = {"enabled": True, "dir": str(tmp_path), "resume": True}
+    assert get_checkpoint_store(config) is get_checkpoint_store(config)
+    assert get_checkpoint_store(config).resume
+    assert get_checkpoint_store({"enabled": False}) is None
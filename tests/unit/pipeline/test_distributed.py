@@ -0,0 +1,161 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import src.pipeline.distributed as distributed_mod
+from src.pipeline.distributed import (
+    Coordinator, DistributedWorker, FileResultStore, ScrapeJob, SQLiteJobQueue
+)
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "queue" / "jobs.sqlite"))
+
+
+@pytest.fixture
+def dummy_config():
+    return {
+        'amazon': {
+            'base_url': 'https://a.com',
+            'categories': {'laptops': '/s?k=laptops', 'gpus': '/s?k=gpu'},
+            'max_pages': 5,
+        },
+        'newegg': {
+            'base_url': 'https://n.com',
+            'categories': {'monitors': '/p/pl?d=monitors'},
+            'max_pages': 3,
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def patch_config_and_factory(monkeypatch, dummy_config):
+    class DummyCL:
+        def __init__(self, path): pass
+        def get_config(self, name): return dummy_config.get(name, {})
+
+    class FakePaged:
+        is_scrapy = False
+        closed = []
+
+        def __init__(self, config): self.config = config
+        def iter_pages(self, url, max_pages=None, start_page=1):
+            for page in range(start_page, max_pages + 1):
+                yield page, [{'title': f'{url}#{page}'}]
+        def close(self): FakePaged.closed.append(True)
+
+    class FakeScrapy:
+        is_scrapy = True
+
+    monkeypatch.setattr(distributed_mod, "ConfigLoader", DummyCL)
+    monkeypatch.setattr(distributed_mod.ScraperFactory, "_registry", {'amazon': FakePaged, 'newegg': FakeScrapy})
+    yield
+
+
+def test_coordinator_splits_page_ranges(job_queue):
+    jobs = Coordinator("dummy.yaml", job_queue).plan_jobs(pages_per_job=2)
+    amazon = [(j.category, j.start_page, j.end_page) for j in jobs if j.source == 'amazon']
+    assert ('laptops', 1, 2) in amazon and ('laptops', 3, 4) in amazon and ('laptops', 5, 5) in amazon
+    newegg = [(j.category, j.start_page, j.end_page) for j in jobs if j.source == 'newegg']
+    assert newegg == [('monitors', 1, 3)]
+
+
+def test_lease_is_exclusive_and_expires(job_queue):
+    job_queue.enqueue([ScrapeJob('amazon', 'laptops', '/s', 1, 2)])
+    job = job_queue.lease("w1", visibility_timeout=60)
+    assert job is not None and job.attempts == 1
+    assert job_queue.lease("w2", visibility_timeout=60) is None
+
+    job_queue.enqueue([ScrapeJob('amazon', 'gpus', '/g', 1, 1)])
+    short = job_queue.lease("w2", visibility_timeout=-1)
+    again = job_queue.lease("w3", visibility_timeout=60)
+    assert again.job_id == short.job_id
+    assert again.attempts == 2
+    assert not job_queue.complete(short.job_id, "w2")
+    assert job_queue.complete(again.job_id, "w3")
+
+
+def test_fail_requeues_until_max_attempts(job_queue):
+    job_queue.enqueue([ScrapeJob('amazon', 'laptops', '/s', 1, 1)])
+    job = job_queue.lease("w1", 60)
+    assert job_queue.fail(job.job_id, "w1", "boom", max_attempts=2) == "pending"
+    job = job_queue.lease("w1", 60)
+    assert job_queue.fail(job.job_id, "w1", "boom", max_attempts=2) == "failed"
+    assert job_queue.lease("w1", 60) is None
+    assert job_queue.stats() == {"failed": 1}
+
+
+def test_expired_lease_fails_after_max_attempts(job_queue):
+    job_queue.enqueue([ScrapeJob('amazon', 'laptops', '/s', 1, 1)])
+    assert job_queue.lease("w1", -1, max_attempts=2).attempts == 1
+    assert job_queue.lease("w2", -1, max_attempts=2).attempts == 2
+    # the second worker died too: the job is given up instead of leased forever
+    assert job_queue.lease("w3", 60, max_attempts=2) is None
+    assert job_queue.stats() == {"failed": 1}
+
+
+def test_scrapy_jobs_extend_their_lease_while_running(job_queue, tmp_path, monkeypatch):
+    def slow_crawl(source, config, urls):
+        time.sleep(0.35)
+        return [{'title': 'monitor'}], []
+
+    monkeypatch.setattr(distributed_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(distributed_mod, "_run_scrapy_job", slow_crawl)
+    extended = []
+    monkeypatch.setattr(job_queue, "extend", lambda *args: extended.append(args) or True)
+    job_queue.enqueue([ScrapeJob('newegg', 'monitors', '/p/pl?d=monitors', 1, 3)])
+    worker = DistributedWorker("dummy.yaml", job_queue, FileResultStore(str(tmp_path / "r")),
+                               worker_id="w1", visibility_timeout=0.3)
+    assert worker.run() == 1
+    assert extended
+
+
+def test_worker_runs_jobs_and_stores_results(job_queue, tmp_path):
+    store = FileResultStore(str(tmp_path / "results"))
+    job_queue.enqueue([
+        ScrapeJob('amazon', 'laptops', '/s?k=laptops', 1, 2),
+        ScrapeJob('amazon', 'laptops', '/s?k=laptops', 3, 3),
+    ])
+    worker = DistributedWorker("dummy.yaml", job_queue, store, worker_id="w1")
+    assert worker.run() == 2
+    products = sorted(store.iter_products(), key=lambda p: p['title'])
+    assert [p['title'] for p in products] == [
+        'https://a.com/s?k=laptops#1', 'https://a.com/s?k=laptops#2', 'https://a.com/s?k=laptops#3'
+    ]
+    assert all(p['source'] == 'amazon' and p['category'] == 'laptops' for p in products)
+    assert job_queue.stats() == {"done": 2}
+
+
+def test_seen_keys_are_committed_only_after_results_are_stored(job_queue, tmp_path, monkeypatch):
+    committed = []
+
+    class SeenPaged(distributed_mod.ScraperFactory._registry['amazon']):
+        def commit_seen(self): committed.append(self.config['category'])
+
+    monkeypatch.setitem(distributed_mod.ScraperFactory._registry, 'amazon', SeenPaged)
+    store = FileResultStore(str(tmp_path / "results"))
+    job_queue.enqueue([ScrapeJob('amazon', 'laptops', '/s', 1, 1)])
+    worker = DistributedWorker("dummy.yaml", job_queue, store, worker_id="w1", max_attempts=2)
+    write = store.write
+    failures = [OSError("disk full")]
+
+    def flaky_write(job, products):
+        if failures:
+            raise failures.pop()
+        return write(job, products)
+
+    monkeypatch.setattr(store, "write", flaky_write)
+    # the first attempt fails to store its results and commits nothing, the retry commits once
+    assert worker.run() == 1
+    assert committed == ['laptops']
+    assert job_queue.stats() == {"done": 1}
+
+
+def test_worker_marks_unregistered_source_failed(job_queue, tmp_path):
+    job_queue.enqueue([ScrapeJob('ghost', 'x', '/x', 1, 1)])
+    worker = DistributedWorker("dummy.yaml", job_queue, FileResultStore(str(tmp_path / "r")),
+                               worker_id="w1", max_attempts=1)
+    assert worker.run() == 0
+    assert job_queue.stats() == {"failed": 1}
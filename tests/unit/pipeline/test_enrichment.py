@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock
+
+import requests
+
+from src.pipeline.enrichment import EnrichmentCrawler, interleave
+from tests.fixtures.scraper.detail_html import sample_ebay_detail_html
+
+CONFIG = {
+    "ebay": {"base_url": "https://enrich.ebay.test", "enrichment": {"concurrency": {"initial": 2, "max": 2}}},
+    "microcenter": {"base_url": "https://enrich.microcenter.test", "enrichment": {"enabled": False}},
+    "database": {"host": "localhost"},
+}
+
+
+def _response(status=200, text=""):
+    return MagicMock(status_code=status, text=text, headers={})
+
+
+def test_interleave_round_robins_sources():
+    targets = [{"source": "a", "url": 1}, {"source": "a", "url": 2}, {"source": "a", "url": 3},
+               {"source": "b", "url": 4}]
+    assert [t["url"] for t in interleave(targets)] == [1, 4, 2, 3]
+
+
+def test_run_fetches_parses_and_bulk_saves(sample_ebay_detail_html):
+    saved = []
+    crawler = EnrichmentCrawler(CONFIG, max_workers=2, batch_size=2, save=lambda rows: saved.append(rows) or len(rows))
+    assert crawler.enabled_sources() == ["ebay"]
+    site = crawler._site("ebay")
+    pages = {
+        "https://enrich.ebay.test/itm/1": _response(text=sample_ebay_detail_html),
+        "https://enrich.ebay.test/itm/2": _response(text=sample_ebay_detail_html),
+        "https://enrich.ebay.test/itm/3": _response(status=404),
+        "https://enrich.ebay.test/itm/4": _response(text="<html><body>Checking your browser</body></html>"),
+    }
+
+    def get(url, timeout=None):
+        if url.endswith("/5"):
+            raise requests.ConnectionError("reset")
+        return pages[url]
+
+    site.session.get = MagicMock(side_effect=get)
+    targets = [{"source": "ebay", "url": f"/itm/{i}"} for i in range(1, 6)]
+    targets.append({"source": "microcenter", "url": "/product/1"})
+
+    stats = crawler.run(targets)
+
+    assert stats == {"ok": 2, "gone": 1, "empty": 1, "error": 1, "saved": 3}
+    assert [len(batch) for batch in saved] == [2, 1]
+    rows = {row["url"]: row for batch in saved for row in batch}
+    assert rows["/itm/1"]["seller"] == "gadget_shop"
+    assert rows["/itm/1"]["specs"] == {"Brand": "Sony", "Screen Size": "55 in"}
+    assert rows["/itm/1"]["status"] == "ok"
+    assert rows["/itm/3"]["status"] == "gone"
+    assert site.session.get.call_count == 5
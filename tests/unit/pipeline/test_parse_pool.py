@@ -0,0 +1,129 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from src.pipeline.parse_pool import ParsePool, close_parse_pool, get_parse_pool, parse_page_task
+from src.pipeline.batches import decode_products, encode_products
+from src.scrapers.parser_backend import get_backend
+from src.scrapers.static_scraper import MicroCenterStaticScraper, parse_page
+from tests.fixtures.scraper.microcenter_configs import microcenter_config
+from tests.fixtures.scraper.microcenter_html import sample_microcenter_results_html
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParsePool(max_workers=2)
+    yield pool
+    pool.close()
+
+
+def test_task_returns_the_page_parser_products(sample_microcenter_results_html):
+    expected = parse_page(sample_microcenter_results_html, get_backend("lxml"), True)
+    batch = parse_page_task("microcenter", sample_microcenter_results_html.encode("utf-8"),
+                            {"parser": "lxml", "partial_parse": True}, "gpus")
+    products = decode_products(batch)
+    assert [p["title"] for p in products] == [p["title"] for p in expected]
+    assert [p["price"] for p in products] == [1099.99, 89.99]
+    assert {p["category"] for p in products} == {"gpus"}
+
+
+def test_scraper_parses_in_the_pool(pool, microcenter_config, sample_microcenter_results_html):
+    scraper = MicroCenterStaticScraper({**microcenter_config, "parser": "lxml", "category": "gpus"}, parse_pool=pool)
+    products = scraper.parse(sample_microcenter_results_html)
+    assert [p["url"] for p in products] == ["https://www.microcenter.com/product/1/gpu",
+                                            "https://www.microcenter.com/product/2/ram"]
+    scraper.close()
+
+
+def test_submit_blocks_when_max_pending_pages_are_queued():
+    pool = ParsePool.__new__(ParsePool)
+    pool.max_pending = 1
+    pool.pages = 0
+    pool._slots = threading.BoundedSemaphore(1)
+    futures = []
+
+    class Executor:
+        def submit(self, *args):
+            futures.append(Future())
+            return futures[-1]
+
+    pool._executor = Executor()
+    pool.submit("microcenter", "<html/>")
+    second = threading.Thread(target=pool.submit, args=("microcenter", "<html/>"))
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()
+    futures[0].set_result(b"")
+    second.join(1)
+    assert not second.is_alive()
+    assert pool.pages == 2
+
+
+def test_pages_are_fetched_while_earlier_pages_are_parsed():
+    pool = ParsePool.__new__(ParsePool)
+    pool.max_pending = 8
+    pool.window = 2
+    pool.pages = 0
+    pool._slots = threading.BoundedSemaphore(8)
+    futures = []
+    fetched = []
+
+    class Executor:
+        def submit(self, *args):
+            futures.append(Future())
+            return futures[-1]
+
+    def pages():
+        for page in (1, 2, 3):
+            fetched.append(page)
+            yield page, "<html/>"
+
+    pool._executor = Executor()
+    parsed = []
+    consumer = threading.Thread(target=lambda: parsed.extend(pool.iter_parse("microcenter", pages())))
+    consumer.start()
+    consumer.join(0.2)
+    # page 2 was fetched while page 1 is parsing, page 3 waits for the window
+    assert consumer.is_alive()
+    assert fetched == [1, 2]
+    futures[0].set_result(encode_products([{"title": "one"}]))
+    deadline = time.monotonic() + 1
+    while len(futures) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fetched == [1, 2, 3]
+    futures[2].set_result(encode_products([{"title": "three"}]))
+    futures[1].set_result(encode_products([]))
+    consumer.join(1)
+    assert [(page, [p["title"] for p in products]) for page, products in parsed] == \
+        [(1, ["one"]), (2, []), (3, ["three"])]
+
+
+def test_scraper_stops_at_the_first_empty_page_parsed_in_the_pool(pool, microcenter_config,
+                                                                  sample_microcenter_results_html):
+    scraper = MicroCenterStaticScraper({**microcenter_config, "parser": "lxml", "delay": 0}, parse_pool=pool)
+    bodies = iter([sample_microcenter_results_html, sample_microcenter_results_html, "<html></html>",
+                   sample_microcenter_results_html])
+    scraper.fetch = lambda url: next(bodies)
+    walked = scraper._walk_pages("https://www.microcenter.com/gpus", max_pages=5)
+    pages = [(page, len(products)) for page, products in walked]
+    assert pages == [(1, 2), (2, 2), (3, 0)]
+    scraper.close()
+
+
+def test_pool_is_optional():
+    assert get_parse_pool({"enabled": False}) is None
+    assert get_parse_pool(None) is None
+
+
+def test_process_pool_is_shut_down_and_restarted():
+    pool = get_parse_pool({"enabled": True, "workers": 1})
+    assert get_parse_pool({"enabled": True}) is pool
+    close_parse_pool()
+    with pytest.raises(RuntimeError):
+        pool.submit("microcenter", "<html/>")
+    again = get_parse_pool({"enabled": True, "workers": 1})
+    assert again is not pool
+    close_parse_pool()
+    close_parse_pool()
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+import src.pipeline.replay as replay_mod
+from src.pipeline.replay import parse_archived_page, replay_archive
+from src.scrapers.page_archive import PageArchive
+from tests.fixtures.scraper.amazon_html import sample_amazon_product_html
+from tests.fixtures.scraper.microcenter_html import sample_microcenter_results_html
+
+NEWEGG_HTML = """
+<html><body>
+    <div class="item-cell">
+        <a class="item-title" href="https://www.newegg.com/p/1">Monitor</a>
+        <li class="price-current"><strong>199</strong><sup>.99</sup></li>
+    </div>
+</body></html>
+"""
+
+
+@pytest.fixture
+def archive_dir(tmp_path, sample_amazon_product_html, sample_microcenter_results_html):
+    archive = PageArchive(str(tmp_path / "archive"))
+    archive.write(sample_amazon_product_html, url="https://a/1", source="amazon", category="laptops", page=1)
+    archive.write(sample_microcenter_results_html, url="https://m/1", source="microcenter", category="gpus", page=1)
+    archive.write(NEWEGG_HTML, url="https://n/1", source="newegg", category="monitors", page=3)
+    archive.write("<html></html>", url="https://x/1", source="unknown-shop", category="x", page=1)
+    return str(tmp_path / "archive")
+
+
+@patch.object(replay_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+def test_replay_reparses_every_archived_page(archive_dir):
+    products = replay_archive(archive_dir, max_workers=2, pages_per_task=1)
+    by_source = {}
+    for product in products:
+        by_source.setdefault(product["source"], []).append(product)
+
+    assert [p["title"] for p in by_source["amazon"]] == ["Test Product"]
+    assert len(by_source["microcenter"]) == 2 and by_source["microcenter"][0]["category"] == "gpus"
+    assert by_source["newegg"] == [{
+        "title": "Monitor", "price": 199.99, "rating": None, "review_count": None,
+        "url": "https://www.newegg.com/p/1", "img_url": None, "category": "monitors", "source": "newegg",
+    }]
+    assert "unknown-shop" not in by_source
+
+
+@patch.object(replay_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+def test_replay_filters_by_source(archive_dir):
+    products = replay_archive(archive_dir, source="microcenter")
+    assert {p["source"] for p in products} == {"microcenter"}
+
+
+def test_parse_archived_page_uses_configured_backend(sample_microcenter_results_html):
+    entry = {"source": "microcenter", "category": "gpus"}
+    soup = parse_archived_page(entry, sample_microcenter_results_html, {"parser": "soup"})
+    fast = parse_archived_page(entry, sample_microcenter_results_html, {"parser": "lxml", "partial_parse": True})
+    assert soup == fast
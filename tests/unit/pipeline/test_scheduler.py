@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+from src.pipeline.scheduler import CrawlPlanEntry, RecrawlScheduler, apply_plan, plan_summary
+from src.utils.executor import job_config
+
+HOUR = 3600
+
+
+class DummyCL:
+    def __init__(self, config): self.config = config
+    def get_config(self, name): return self.config.get(name, {})
+
+
+@pytest.fixture
+def scrapers_config():
+    return DummyCL({
+        'amazon': {
+            'base_url': 'https://a.com',
+            'categories': {'laptops': '/s?k=laptops', 'gpus': '/s?k=gpu'},
+            'max_pages': 4,
+        },
+    })
+
+
+def page(prefix, n, price=10):
+    return [{'url': f'{prefix}/{i}', 'price': price} for i in range(n)]
+
+
+def crawl(scheduler, now, pages):
+    for category, category_pages in pages.items():
+        for number, products in enumerate(category_pages, start=1):
+            scheduler.record_batch('amazon', category, number, products)
+    scheduler.finish_run(now=now)
+
+
+def test_without_history_everything_is_due_at_full_depth(tmp_path, scrapers_config):
+    plan = RecrawlScheduler(str(tmp_path / "state.json")).plan(scrapers_config, now=0)
+    assert [(e.category, e.due, e.max_pages) for e in plan] == [('laptops', True, 4), ('gpus', True, 4)]
+    assert plan_summary(plan)['savings_pct'] == 0.0
+
+
+def test_stable_category_is_deferred_and_crawled_shallower(tmp_path, scrapers_config):
+    state = str(tmp_path / "state" / "recrawl.json")
+    scheduler = RecrawlScheduler(state, max_interval_hours=48)
+    stable = [page('l1', 5), page('l2', 5), page('l3', 5), page('l4', 5)]
+    crawl(scheduler, 0, {'laptops': stable, 'gpus': [page('g1', 5), page('g2', 5)]})
+    # second run: laptops unchanged, gpus page 1 reprices completely
+    crawl(scheduler, HOUR, {'laptops': stable, 'gpus': [page('g1', 5, price=9), page('g2', 5)]})
+
+    reloaded = RecrawlScheduler(state, max_interval_hours=48)
+    plan = {e.category: e for e in reloaded.plan(scrapers_config, now=2 * HOUR)}
+    assert plan['laptops'].volatility == 0.0 and not plan['laptops'].due
+    assert plan['laptops'].max_pages == 1
+    assert plan['gpus'].volatility == 0.5 and plan['gpus'].max_pages == 2
+
+    later = {e.category: e for e in reloaded.plan(scrapers_config, now=HOUR + 49 * HOUR)}
+    assert later['laptops'].due and later['laptops'].max_pages == 1
+
+
+def test_change_rate_counts_new_and_repriced_products():
+    previous = {'a': 1, 'b': 2}
+    assert RecrawlScheduler.change_rate(previous, {'a': 1, 'b': 3, 'c': 4}) == pytest.approx(2 / 3)
+    assert RecrawlScheduler.change_rate(previous, {}) == 0.0
+
+
+def test_state_file_is_json(tmp_path):
+    state = tmp_path / "state.json"
+    scheduler = RecrawlScheduler(str(state))
+    scheduler.record_products([{'source': 'amazon', 'category': 'laptops', 'url': 'u', 'price': 1}])
+    scheduler.finish_run(now=5)
+    data = json.loads(state.read_text())
+    assert data['categories']['amazon/laptops']['last_crawled'] == 5
+
+
+def test_apply_plan_keeps_due_categories_with_their_depth(scrapers_config):
+    config = scrapers_config.get_config('amazon')
+    plan = [
+        CrawlPlanEntry('amazon', 'laptops', True, 2, 4, 0, 1.0, ''),
+        CrawlPlanEntry('amazon', 'gpus', False, 4, 4, 72, 0.0, ''),
+    ]
+    planned = apply_plan('amazon', config, plan)
+    assert planned['categories'] == {'laptops': '/s?k=laptops'}
+    assert job_config(planned, 'laptops')['max_pages'] == 2
+    assert config['categories'].keys() == {'laptops', 'gpus'}
+    assert apply_plan('amazon', config, plan[1:]) is None
+    assert plan_summary(plan) == {
+        'categories': 2, 'due': 1, 'full_requests': 8, 'expected_requests': 2,
+        'saved_requests': 6, 'savings_pct': 75.0,
+    }
@@ -1,8 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import patch, MagicMock, call
 
 import src.pipeline.scraper_orchestrator as orchestrator_mod
+from src.pipeline.batches import encode_products
+from src.pipeline.entrypoints import run_scrapers
 from src.pipeline.scraper_orchestrator import ScraperOrchestrator
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.seen_filter import get_seen_filter
 
 @pytest.fixture
 def dummy_config():
@@ -23,7 +29,7 @@ def fake_registry():
     class FakeScrapy:
         is_scrapy = True
 
-        def __init__(self, config):
+        def __init__(self, config, checkpoint=None):
             self.config = config
 
         def scrape(self, urls):
@@ -71,7 +77,7 @@ def test_run_scraper_scrapy_success(mock_logger):
 def test_run_scraper_scrapy_failure(mock_logger):
     class BrokenScrapy:
         is_scrapy = True
-        def __init__(self, config): pass
+        def __init__(self, config, checkpoint=None): pass
         def scrape(self, urls): raise RuntimeError("fail")
 
     orchestrator_mod.ScraperFactory._registry["amazon"] = BrokenScrapy
@@ -107,9 +113,9 @@ def test_run_scraper_not_registered(mock_logger, mock_executor):
 def test_run_all_success(mock_logger, mock_as_completed, mock_executor):
     orch = ScraperOrchestrator("dummy.yaml")
     fake_future1 = MagicMock()
-    fake_future1.result.return_value = [{"name": "A"}]
+    fake_future1.result.return_value = [encode_products([{"name": "A"}])], []
     fake_future2 = MagicMock()
-    fake_future2.result.return_value = [{"name": "B"}]
+    fake_future2.result.return_value = [encode_products([{"name": "B"}])], []
     mock_executor.return_value.__enter__.return_value = mock_executor
     mock_executor.submit.side_effect = [fake_future1, fake_future2]
     mock_as_completed.return_value = [fake_future1, fake_future2]
@@ -117,6 +123,23 @@ def test_run_all_success(mock_logger, mock_as_completed, mock_executor):
     products = orch.run_all(max_workers=2)
     assert products == [{"name": "A"}, {"name": "B"}]
 
+@patch.object(orchestrator_mod, "ProcessPoolExecutor")
+@patch.object(orchestrator_mod, "as_completed")
+@patch.object(orchestrator_mod, "logger")
+def test_run_all_drops_products_found_under_several_categories(mock_logger, mock_as_completed, mock_executor):
+    orch = ScraperOrchestrator("dummy.yaml")
+    laptops = {"source": "amazon", "category": "laptops", "url": "https://www.amazon.com/Acer/dp/B07W6JN8V6/ref=sr_1"}
+    pcs = {"source": "amazon", "category": "pcs", "url": "https://www.amazon.com/dp/B07W6JN8V6?th=1"}
+    fake_future = MagicMock()
+    fake_future.result.return_value = [encode_products([laptops]), encode_products([pcs])], []
+    mock_executor.return_value.__enter__.return_value = mock_executor
+    mock_executor.submit.return_value = fake_future
+    mock_as_completed.return_value = [fake_future]
+
+    products = orch.run_all(max_workers=1)
+    assert [(p["category"], p["product_key"]) for p in products] == [("laptops", "amazon:B07W6JN8V6")]
+    assert len(orch.run_all(max_workers=1, dedupe=False)) == 2
+
 @patch.object(orchestrator_mod, "ProcessPoolExecutor")
 @patch.object(orchestrator_mod, "as_completed")
 @patch.object(orchestrator_mod, "logger")
@@ -130,3 +153,114 @@ def test_run_all_future_raises(mock_logger, mock_as_completed, mock_executor):
     products = orch.run_all(max_workers=1)
     assert products == []
     assert any("Scraper failed" in str(c) for c in mock_logger.error.call_args_list)
+
+@patch.object(orchestrator_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+@patch.object(orchestrator_mod, "threaded_page_executor")
+@patch.object(orchestrator_mod, "logger")
+def test_iter_products_streams_tagged_batches(mock_logger, mock_page_executor, fake_registry):
+    class StreamingScrapy:
+        is_scrapy = True
+        def __init__(self, config, checkpoint=None): pass
+        def scrape(self, urls, on_page=None):
+            on_page("monitors", 1, [{"name": "Y"}])
+            return []
+
+    orchestrator_mod.ScraperFactory._registry["amazon"] = fake_registry["newegg"]
+    orchestrator_mod.ScraperFactory._registry["newegg"] = StreamingScrapy
+    mock_page_executor.return_value = iter([
+        ("laptops", 1, [{"name": "A"}]),
+        ("laptops", 2, [{"name": "B"}]),
+        ("pcs", 1, [{"name": "C"}]),
+    ])
+    orch = ScraperOrchestrator("dummy.yaml")
+    batches = list(orch.iter_products(max_workers=2, queue_size=2))
+
+    assert len(batches) == 4
+    by_key = {(b["source"], b["category"], b["page"]): b["products"] for b in batches}
+    assert by_key[("amazon", "laptops", 2)] == [{"name": "B", "source": "amazon", "category": "laptops"}]
+    assert by_key[("newegg", "monitors", 1)] == [{"name": "Y", "source": "newegg", "category": "monitors"}]
+
+
+@patch.object(orchestrator_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+@patch.object(orchestrator_mod, "logger")
+def test_iter_products_survives_failing_scraper(mock_logger):
+    class BrokenScrapy:
+        is_scrapy = True
+        def __init__(self, config, checkpoint=None): pass
+        def scrape(self, urls, on_page=None): raise RuntimeError("fail")
+
+    orchestrator_mod.ScraperFactory._registry["amazon"] = BrokenScrapy
+    orchestrator_mod.ScraperFactory._registry.pop("newegg", None)
+    orch = ScraperOrchestrator("dummy.yaml")
+    assert list(orch.iter_products(max_workers=1)) == []
+    assert any("failed" in str(c) for c in mock_logger.error.call_args_list)
+
+
+@patch.object(orchestrator_mod, "ProcessPoolExecutor")
+@patch.object(orchestrator_mod, "as_completed")
+@patch.object(orchestrator_mod, "logger")
+def test_run_all_submits_top_level_task_and_reads_spill_files(mock_logger, mock_as_completed, mock_executor, tmp_path):
+    orch = ScraperOrchestrator("dummy.yaml")
+    spilled = orchestrator_mod.spill_chunks([encode_products([{"name": "A"}]), encode_products([{"name": "B"}])],
+                                            str(tmp_path))
+    fake_future = MagicMock()
+    fake_future.result.return_value = spilled, []
+    mock_executor.return_value.__enter__.return_value = mock_executor
+    mock_executor.submit.return_value = fake_future
+    mock_as_completed.return_value = [fake_future]
+
+    products = orch.run_all(max_workers=1, spill_dir=str(tmp_path))
+    assert products == [{"name": "A"}, {"name": "B"}]
+    fn, name, config = mock_executor.submit.call_args_list[0][0][:3]
+    assert fn is orchestrator_mod.scrape_source_task
+    assert isinstance(config, dict)
+    assert not list(tmp_path.iterdir())
+
+
+@patch.object(orchestrator_mod, "ProcessPoolExecutor")
+@patch.object(orchestrator_mod, "as_completed")
+@patch.object(orchestrator_mod, "logger")
+def test_run_all_with_plan_skips_sources_that_are_not_due(mock_logger, mock_as_completed, mock_executor):
+    from src.pipeline.scheduler import CrawlPlanEntry
+    orch = ScraperOrchestrator("dummy.yaml")
+    mock_executor.return_value.__enter__.return_value = mock_executor
+    mock_as_completed.return_value = []
+    plan = [
+        CrawlPlanEntry('amazon', 'pcs', True, 1, 1, 0, 1.0, ''),
+        CrawlPlanEntry('newegg', 'monitors', False, 1, 1, 72, 0.0, ''),
+    ]
+
+    orch.run_all(max_workers=1, plan=plan)
+    assert mock_executor.submit.call_count == 1
+    _, name, config = mock_executor.submit.call_args[0][:3]
+    assert name == 'amazon' and config['categories'] == {'pcs': 'cat2'}
+
+
+@patch.object(orchestrator_mod, "ProcessPoolExecutor", ThreadPoolExecutor)
+def test_seen_keys_are_committed_only_after_products_are_persisted(dummy_config, tmp_path):
+    class SeenScraper(BaseScraper):
+        is_scrapy = False
+        def __init__(self, config): self.seen = get_seen_filter("amazon", config["seen_filter"])
+        def fetch(self, url): pass
+        def parse(self, content): pass
+        def scrape(self, url):
+            pages = self.skip_seen(iter([(1, [{"url": f"https://a.com/{url}/p1", "price": 1.0}])]))
+            return [item for _, items in pages for item in items]
+        def close(self): pass
+
+    orchestrator_mod.ScraperFactory._registry["amazon"] = SeenScraper
+    orchestrator_mod.ScraperFactory._registry.pop("newegg", None)
+    dummy_config["amazon"]["seen_filter"] = {"enabled": True, "dir": str(tmp_path)}
+    bloom = tmp_path / "amazon.bloom"
+
+    def failing_store(products):
+        raise OSError("database unavailable")
+
+    with pytest.raises(OSError):
+        run_scrapers("dummy.yaml", max_workers=1, checkpoint_dir=None, persist=failing_store)
+    assert not bloom.exists()
+
+    stored = []
+    run_scrapers("dummy.yaml", max_workers=1, checkpoint_dir=None, persist=stored.extend)
+    assert len(stored) == 2
+    assert bloom.exists()
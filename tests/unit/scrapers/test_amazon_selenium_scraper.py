@@ -5,14 +5,14 @@ from tests.fixtures.scraper.amazon_configs import amazon_config
 from tests.fixtures.scraper.amazon_html import sample_amazon_product_html
 
 
-@patch("src.scrapers.selenium.amazon_scraper.webdriver.Chrome")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
 def test_driver_initialized_with_user_agent(mock_chrome, amazon_config):
     scraper = AmazonSeleniumScraper(amazon_config)
     assert scraper.driver is mock_chrome.return_value
     scraper.close()
 
 
-@patch("src.scrapers.selenium.amazon_scraper.webdriver.Chrome")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
 def test_fetch_success_and_waits_for_products(mock_chrome, amazon_config):
     mock_driver = MagicMock()
     mock_driver.page_source = "<html><body>SomeContent</body></html>"
@@ -28,7 +28,7 @@ def test_fetch_success_and_waits_for_products(mock_chrome, amazon_config):
     scraper.close()
 
 
-@patch("src.scrapers.selenium.amazon_scraper.webdriver.Chrome")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
 def test_parse_returns_all_products(amazon_config, sample_amazon_product_html):
     scraper = AmazonSeleniumScraper(amazon_config)
     products = scraper.parse(sample_amazon_product_html)
@@ -38,7 +38,7 @@ def test_parse_returns_all_products(amazon_config, sample_amazon_product_html):
     scraper.close()
 
 
-@patch("src.scrapers.selenium.amazon_scraper.webdriver.Chrome")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
 def test_scrape_category_handles_pagination_and_next(mock_chrome, amazon_config):
     mock_driver = MagicMock()
     mock_driver.page_source = """
@@ -69,10 +69,11 @@ def test_scrape_category_handles_pagination_and_next(mock_chrome, amazon_config)
     patch.stopall()
 
 
-@patch("src.scrapers.selenium.amazon_scraper.webdriver.Chrome")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
 def test_close_quits_driver(mock_chrome, amazon_config):
     mock_driver = MagicMock()
     mock_chrome.return_value = mock_driver
     scraper = AmazonSeleniumScraper(amazon_config)
+    scraper.fetch("https://www.amazon.com/s?k=laptops")
     scraper.close()
     mock_driver.quit.assert_called()
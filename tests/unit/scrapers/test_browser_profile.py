@@ -0,0 +1,81 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.scrapers.selenium.amazon_scraper import AmazonSeleniumScraper
+from src.scrapers.selenium.browser import (
+    CacheSlots,
+    apply_network_blocking,
+    build_chrome_options,
+    resolve_profile,
+)
+from tests.fixtures.scraper.amazon_configs import amazon_config
+
+
+def test_default_profile_is_lightweight():
+    profile = resolve_profile(None)
+    options = build_chrome_options("UA", profile)
+    assert options.page_load_strategy == "eager"
+    assert "--headless" in options.arguments
+    assert "user-agent=UA" in options.arguments
+    assert "--disable-gpu" in options.arguments
+    assert "--disable-extensions" in options.arguments
+    assert options.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+
+
+def test_disabled_profile_gives_plain_browser():
+    profile = resolve_profile({"enabled": False})
+    options = build_chrome_options("UA", profile)
+    assert options.page_load_strategy == "normal"
+    assert "--disable-gpu" not in options.arguments
+    assert "prefs" not in options.experimental_options
+    assert apply_network_blocking(MagicMock(), profile) == []
+
+
+def test_unknown_resource_type_is_rejected():
+    with pytest.raises(ValueError):
+        resolve_profile({"block": ["images", "videos"]})
+
+
+def test_network_blocking_sends_patterns_over_cdp():
+    driver = MagicMock()
+    patterns = apply_network_blocking(driver, resolve_profile({"block": ["fonts", "stylesheets"]}))
+    assert "*.woff2" in patterns and "*.css" in patterns and "*.png" not in patterns
+    driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    driver.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": patterns})
+
+
+def test_cache_dir_is_passed_to_chrome(tmp_path):
+    options = build_chrome_options("UA", resolve_profile({"disk_cache_mb": 10}), cache_dir=str(tmp_path))
+    assert f"--disk-cache-dir={tmp_path}" in options.arguments
+    assert f"--disk-cache-size={10 * 1024 * 1024}" in options.arguments
+
+
+def test_cache_slots_are_leased_exclusively_and_reused(tmp_path):
+    slots = CacheSlots(str(tmp_path))
+    first = slots.acquire()
+    second = slots.acquire()
+    assert first != second
+    slots.release(first)
+    assert slots.acquire() == first
+
+
+def test_cache_slot_of_dead_process_is_taken_over(tmp_path):
+    slots = CacheSlots(str(tmp_path))
+    with open(os.path.join(tmp_path, "slot-0.lock"), "w") as f:
+        f.write("999999999")
+    assert slots.acquire().endswith("slot-0")
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_scraper_builds_driver_from_profile(mock_chrome, amazon_config, tmp_path):
+    config = {**amazon_config, "browser_profile": {"disk_cache_dir": str(tmp_path)}}
+    scraper = AmazonSeleniumScraper(config)
+    assert scraper.driver is mock_chrome.return_value
+    options = mock_chrome.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+    assert any(arg.startswith(f"--disk-cache-dir={tmp_path}") for arg in options.arguments)
+    mock_chrome.return_value.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    scraper.close()
+    assert not os.path.exists(os.path.join(tmp_path, "slot-0.lock"))
@@ -0,0 +1,44 @@
+import pytest
+
+from src.scrapers.canonical import ProductDeduper, extract_item_id, product_key
+
+
+@pytest.mark.parametrize("source, url, item", [
+    ("amazon", "https://www.amazon.com/Acer-Aspire-Laptop/dp/B07W6JN8V6/ref=sr_1_3?keywords=laptop", "B07W6JN8V6"),
+    ("amazon", "https://www.amazon.com/gp/product/b07w6jn8v6?psc=1", "B07W6JN8V6"),
+    ("amazon", "https://www.amazon.com/sspa/click?ie=UTF8&spc=abc&url=%2FAcer-Aspire%2Fdp%2FB07W6JN8V6%2Fref%3Dsr_1_1_sspa",
+     "B07W6JN8V6"),
+    ("ebay", "https://www.ebay.com/itm/256789012345?hash=item3bc&_trkparms=x", "256789012345"),
+    ("ebay", "https://www.ebay.com/itm/Sony-55-TV/256789012345", "256789012345"),
+    ("newegg", "https://www.newegg.com/asus-rog/p/N82E16824236123?Item=N82E16824236123&cm_sp=Homepage",
+     "N82E16824236123"),
+    ("newegg", "https://www.newegg.com/p/1FT-0004-00A12?Item=9SIA", "1FT-0004-00A12"),
+    ("microcenter", "https://www.microcenter.com/product/671234/samsung-990-pro?storeid=131", "671234"),
+    ("microcenter", "https://www.microcenter.com/search/search_results.aspx?N=4294966995", None),
+])
+def test_extract_item_id(source, url, item):
+    assert extract_item_id(source, url) == item
+
+
+def test_product_key_falls_back_to_clean_url():
+    assert product_key("amazon", "/dp/B07W6JN8V6?tag=x") == "amazon:B07W6JN8V6"
+    assert product_key("ebay", None) is None
+    assert product_key("microcenter", "https://www.microcenter.com/site/deal?utm_source=mail") == \
+        "microcenter:" + product_key("microcenter", "https://www.microcenter.com/site/deal").split(":", 1)[1]
+
+
+def test_deduper_keeps_first_occurrence_across_batches():
+    deduper = ProductDeduper()
+    first = deduper.filter([
+        {"source": "amazon", "category": "laptops", "url": "https://www.amazon.com/Acer/dp/B07W6JN8V6/ref=sr_1"},
+        {"source": "amazon", "category": "laptops", "url": "https://www.amazon.com/HP/dp/B08ABCDEF1"},
+        {"source": "amazon", "category": "laptops", "title": "no url"},
+    ])
+    second = deduper.filter([
+        {"source": "amazon", "category": "pcs", "url": "https://www.amazon.com/gp/product/B07W6JN8V6?th=1"},
+        {"source": "ebay", "category": "pcs", "url": "https://www.ebay.com/itm/B07W6JN8V6"},
+    ])
+    assert len(first) == 3
+    assert first[0]["product_key"] == "amazon:B07W6JN8V6"
+    assert [p["source"] for p in second] == ["ebay"]
+    assert deduper.dropped == 1
@@ -0,0 +1,46 @@
+import pytest
+
+from src.scrapers.details import extract_details, stock_state
+from src.scrapers.parser_backend import get_backend
+from tests.fixtures.scraper.detail_html import sample_amazon_detail_html, sample_ebay_detail_html, \
+    sample_microcenter_detail_html
+
+
+@pytest.mark.parametrize("parser", ["lxml", "soup"])
+def test_amazon_details(parser, sample_amazon_detail_html):
+    details = extract_details("amazon", sample_amazon_detail_html, get_backend(parser))
+    assert details["seller"] == "Acme Store"
+    assert details["shipping"] == "FREE delivery Friday"
+    assert details["availability"] == "In Stock"
+    assert details["in_stock"] is True
+    # the overview table wins over the tech spec table, which only adds new keys
+    assert details["specs"] == {"Brand": "Acer", "Screen Size": "15.6 Inches", "RAM": "16 GB"}
+
+
+@pytest.mark.parametrize("parser", ["lxml", "soup"])
+def test_ebay_details(parser, sample_ebay_detail_html):
+    details = extract_details("ebay", sample_ebay_detail_html, get_backend(parser))
+    assert details == {
+        "seller": "gadget_shop",
+        "shipping": "Free Standard Shipping",
+        "condition": "Used",
+        "availability": "More than 10 available",
+        "in_stock": True,
+        "specs": {"Brand": "Sony", "Screen Size": "55 in"},
+    }
+
+
+def test_microcenter_details(sample_microcenter_detail_html):
+    details = extract_details("microcenter", sample_microcenter_detail_html)
+    assert details["in_stock"] is False
+    assert details["seller"] == "Micro Center"
+    assert details["specs"] == {"Memory Size": "16 GB", "Interface": "PCIe 4.0"}
+
+
+def test_missing_fields_and_unknown_sources():
+    details = extract_details("newegg", "<html><body></body></html>")
+    assert details["seller"] is None and details["availability"] is None and details["specs"] == {}
+    assert stock_state("Currently unavailable.") is False
+    assert stock_state("Ships in 2 weeks") is None
+    with pytest.raises(ValueError):
+        extract_details("walmart", "<html/>")
@@ -0,0 +1,137 @@
+import threading
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from src.scrapers.selenium.browser import CacheSlots, build_chrome_options, launch_chrome, resolve_profile
+from src.scrapers.selenium.driver_manager import DriverManager, close_driver_managers
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from tests.fixtures.scraper.ebay_html import ebay_config
+
+
+def _factory(launched):
+    def launch(profile_dir):
+        driver = MagicMock(name=f"driver-{len(launched)}")
+        driver.profile_dir = profile_dir
+        launched.append(driver)
+        return driver
+    return launch
+
+
+def _wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_drivers_are_prespawned_and_reused():
+    launched = []
+    manager = DriverManager("site", _factory(launched), prespawn=1, max_idle=2)
+    manager.replenish()
+    assert _wait_for(lambda: manager.stats()["idle"] == 1)
+
+    lease = manager.acquire()
+    assert lease.driver is launched[0]
+    assert manager.stats()["warm"] == 1
+    manager.release(lease)
+    assert _wait_for(lambda: manager.stats()["idle"] == 2)
+
+    again = manager.acquire()
+    assert again.driver in launched
+    assert not any(d.quit.called for d in launched)
+    manager.close()
+    assert all(d.quit.called for d in launched if d is not again.driver)
+
+
+def test_drivers_are_recycled_on_page_budget_not_on_errors():
+    launched = []
+    manager = DriverManager("site", _factory(launched), prespawn=0, max_pages=3)
+    lease = manager.acquire()
+    first = lease.driver
+    lease = manager.page_done(lease)
+    lease = manager.page_done(lease, swap=False)
+    assert lease.driver is first
+    lease = manager.page_done(lease)
+    assert lease.driver is not first
+    assert _wait_for(lambda: first.quit.called)
+    assert manager.stats()["recycled:pages"] == 1
+
+    # a page that failed to load leaves a live driver: it is handed back, not quit
+    manager.release(lease)
+    assert not lease.driver.quit.called
+
+
+def test_drivers_are_recycled_on_memory_budget():
+    launched = []
+    manager = DriverManager("site", _factory(launched), prespawn=0, max_pages=0, max_heap_mb=100, check_every=2)
+    lease = manager.acquire()
+    lease.driver.execute_script.return_value = 300 * 1024 * 1024
+    lease = manager.page_done(lease)
+    assert lease.driver is launched[0]
+    lease = manager.page_done(lease)
+    assert lease.driver is launched[1]
+    assert manager.stats()["recycled:memory"] == 1
+
+
+def test_every_driver_leases_its_own_profile(tmp_path):
+    launched = []
+    manager = DriverManager("site", _factory(launched), profile_slots=CacheSlots(str(tmp_path)), prespawn=0)
+    first, second = manager.acquire(), manager.acquire()
+    assert first.profile_dir != second.profile_dir
+    replacement = manager.replace(first)
+    assert replacement.profile_dir not in (first.profile_dir, second.profile_dir)
+    # the recycled driver's profile is free again once it has quit
+    assert _wait_for(lambda: not (tmp_path / "slot-0.lock").exists())
+    assert manager.acquire().profile_dir == first.profile_dir
+
+    options = build_chrome_options("UA", resolve_profile(), user_data_dir=second.profile_dir)
+    assert f"--user-data-dir={second.profile_dir}" in options.arguments
+
+
+
+def test_hung_idle_driver_does_not_block_other_threads():
+    launched = []
+    manager = DriverManager("site", _factory(launched), prespawn=0)
+    hung = manager.acquire()
+    answer = threading.Event()
+    type(hung.driver).current_url = PropertyMock(side_effect=lambda: answer.wait(5))
+    manager._idle.append(hung)
+
+    waiter = threading.Thread(target=manager.acquire)
+    waiter.start()
+    assert _wait_for(lambda: not manager._idle)
+    started = time.monotonic()
+    manager.release(manager.acquire())
+    assert time.monotonic() - started < 1
+    answer.set()
+    waiter.join(timeout=2)
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_managed_driver_factory_does_not_hold_the_scraper(mock_chrome, ebay_config):
+    config = {**ebay_config, "driver_manager": {"enabled": True, "prespawn": 0}}
+    try:
+        scraper = EbaySeleniumScraper(config)
+        factory = scraper.driver_manager.factory
+        assert factory.func is launch_chrome
+        assert factory.args == (list(scraper.user_agents), scraper.browser_profile)
+        scraper.close()
+    finally:
+        close_driver_managers()
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_category_scrapers_hand_drivers_to_each_other(mock_chrome, ebay_config, tmp_path):
+    mock_chrome.side_effect = lambda options: MagicMock()
+    config = {**ebay_config, "driver_manager": {"enabled": True, "prespawn": 0,
+                                                "profile_dir": str(tmp_path / "profiles")}}
+    try:
+        first = EbaySeleniumScraper({**config, "category": "tv"})
+        driver = first.driver
+        first.close()
+        second = EbaySeleniumScraper({**config, "category": "phones"})
+        assert second.driver is driver
+        assert mock_chrome.call_count == 1
+        assert not driver.quit.called
+        second.close()
+    finally:
+        close_driver_managers()
+    assert driver.quit.called
@@ -0,0 +1,117 @@
+import io
+from unittest.mock import patch
+
+import pytest
+import requests
+from requests import Response
+from scrapy.http import HtmlResponse, Request
+from scrapy.settings import Settings
+
+from src.scrapers.http_cache import HttpCache, mount_cache
+from src.scrapers.scrapy_crawler.newegg_crawler.httpcache import HttpCacheStorage, TtlRevalidatePolicy
+
+URL = "https://www.microcenter.com/category/1/gpus"
+
+
+def make_response(request, status, body=b"", headers=None):
+    response = Response()
+    response.status_code = status
+    response._content = body
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    response.url = request.url
+    response.request = request
+    return response
+
+
+@pytest.fixture
+def session_with_cache(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), ttl=60)
+    session = requests.Session()
+    mount_cache(session, cache)
+    return session, cache
+
+
+def test_miss_then_fresh_hit_skips_network(session_with_cache):
+    session, cache = session_with_cache
+    sent = []
+
+    def fake_send(adapter, request, **kwargs):
+        sent.append(dict(request.headers))
+        return make_response(request, 200, b"<html>gpus</html>",
+                             {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8", "Content-Encoding": "gzip"})
+
+    with patch("requests.adapters.HTTPAdapter.send", fake_send):
+        first = session.get(URL)
+        second = session.get(URL)
+
+    assert len(sent) == 1
+    assert first.text == second.text == "<html>gpus</html>"
+    assert second.headers["X-Cache"] == "HIT"
+    assert "Content-Encoding" not in second.headers
+    assert cache.stats() == {"hits": 1, "revalidated": 0, "misses": 1, "hit_ratio": 0.5,
+                             "bytes_saved": 17, "bytes_downloaded": 17}
+
+
+def test_stale_entry_is_revalidated_with_validators(session_with_cache):
+    session, cache = session_with_cache
+    cache.store(URL, 200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"cached body")
+    cache.ttl = 0
+    sent = []
+
+    def fake_send(adapter, request, **kwargs):
+        sent.append(dict(request.headers))
+        return make_response(request, 304)
+
+    with patch("requests.adapters.HTTPAdapter.send", fake_send):
+        response = session.get(URL)
+
+    assert sent[0]["If-None-Match"] == '"v1"'
+    assert sent[0]["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert response.status_code == 200 and response.content == b"cached body"
+    assert response.headers["X-Cache"] == "REVALIDATED"
+    cache.ttl = 60
+    assert cache.is_fresh(cache.get(URL))
+    assert cache.stats()["bytes_saved"] == len(b"cached body")
+
+
+def test_changed_page_replaces_entry(session_with_cache):
+    session, cache = session_with_cache
+    cache.ttl = 0
+    bodies = iter([b"old", b"new"])
+
+    def fake_send(adapter, request, **kwargs):
+        return make_response(request, 200, next(bodies), {"ETag": '"x"'})
+
+    with patch("requests.adapters.HTTPAdapter.send", fake_send):
+        session.get(URL)
+        assert session.get(URL).content == b"new"
+    assert cache.read_body(URL) == b"new"
+    assert cache.stats()["misses"] == 2
+
+
+def test_scrapy_storage_and_policy_share_the_cache(tmp_path):
+    settings = Settings({"HTTPCACHE_DIR": str(tmp_path / "scrapy-cache"), "HTTP_CACHE_TTL": 60})
+    storage, policy = HttpCacheStorage(settings), TtlRevalidatePolicy(settings)
+    url = "https://www.newegg.com/p/pl?d=gpu"
+    request = Request(url)
+    assert storage.retrieve_response(None, request) is None
+
+    response = HtmlResponse(url, status=200, headers={"ETag": '"n1"'}, body=b"<html>ok</html>")
+    assert policy.should_cache_response(response, request)
+    storage.store_response(None, request, response)
+
+    cached = storage.retrieve_response(None, Request(url))
+    assert cached.body == b"<html>ok</html>" and isinstance(cached, HtmlResponse)
+
+    fresh_request = Request(url)
+    storage.retrieve_response(None, fresh_request)
+    assert policy.is_cached_response_fresh(cached, fresh_request)
+
+    stale_request = Request(url)
+    storage.retrieve_response(None, stale_request)
+    stale_request.meta["cache_timestamp"] -= 3600
+    assert not policy.is_cached_response_fresh(cached, stale_request)
+    assert stale_request.headers[b"If-None-Match"] == b'"n1"'
+    assert policy.is_cached_response_valid(cached, HtmlResponse(url, status=304), stale_request)
+    assert storage.cache.stats()["revalidated"] == 1
@@ -0,0 +1,86 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.scrapers.http_cache import CachingAdapter, HttpCache
+from src.scrapers.http_session import acquire_session, build_session, release_session
+from src.scrapers.static_scraper import MicroCenterStaticScraper
+from tests.fixtures.scraper.microcenter_configs import microcenter_config
+
+
+@pytest.fixture
+def flaky_server():
+    """Answers 503 to the first request of every path, then 200."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = 200 if self.path in seen else 503
+            seen.append(self.path)
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", seen
+    server.shutdown()
+
+
+def test_session_is_pooled_and_retrying(tmp_path):
+    session = build_session(pool_size=16, retries=4, backoff=0.1)
+    adapter = session.get_adapter("https://www.microcenter.com/")
+    assert adapter is session.get_adapter("http://www.microcenter.com/")
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 4
+    assert adapter.max_retries.connect == 4
+    assert not adapter.max_retries.status_forcelist
+    assert not adapter.max_retries.respect_retry_after_header
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+    cached = build_session(pool_size=4, cache=HttpCache(str(tmp_path)))
+    adapter = cached.get_adapter("https://www.microcenter.com/")
+    assert isinstance(adapter, CachingAdapter)
+    assert adapter._pool_maxsize == 4
+
+
+def test_error_statuses_reach_the_caller(flaky_server):
+    base_url, seen = flaky_server
+    session = build_session(retries=2, backoff=0)
+    assert session.get(f"{base_url}/page").status_code == 503
+    assert session.get(f"{base_url}/page").status_code == 200
+    assert seen == ["/page", "/page"]
+    session.close()
+
+
+def test_static_fetch_backs_off_and_retries_throttled_pages(flaky_server, microcenter_config, monkeypatch):
+    base_url, seen = flaky_server
+    pauses = []
+    monkeypatch.setattr("src.scrapers.static_scraper.time.sleep", pauses.append)
+    scraper = MicroCenterStaticScraper({**microcenter_config, "base_url": base_url, "max_retries": 3,
+                                        "resilience": {"failure_threshold": 10, "backoff_cap": 4}})
+    errors = scraper.concurrency.snapshot()["errors"]
+
+    assert scraper.fetch(f"{base_url}/category") == "ok"
+    assert seen == ["/category", "/category"]
+    assert len(pauses) == 1 and 0 <= pauses[0] <= 4
+    # the throttled attempt reached the concurrency controller on its own
+    assert scraper.concurrency.snapshot()["errors"] == errors + 1
+    scraper.close()
+def test_category_scrapers_share_one_session(microcenter_config):
+    first = MicroCenterStaticScraper({**microcenter_config, "category": "laptops"})
+    second = MicroCenterStaticScraper({**microcenter_config, "category": "gpus"})
+    assert first.session is second.session
+    first.close()
+    assert acquire_session("microcenter") is second.session
+    release_session(second.session)
+    second.close()
+    fresh = acquire_session("microcenter")
+    assert fresh is not second.session
+    release_session(fresh)
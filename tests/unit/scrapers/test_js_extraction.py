@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from src.scrapers.normalize import normalize_product
+from src.scrapers.selenium import amazon_scraper, ebay_selenium_scraper
+from src.scrapers.selenium.amazon_scraper import AmazonSeleniumScraper
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from tests.fixtures.scraper.amazon_configs import amazon_config
+from tests.fixtures.scraper.ebay_html import ebay_config, sample_ebay_results_html
+
+
+def test_amazon_record_is_normalized_like_parse_product():
+    record = {
+        "title": "Laptop & Sleeve",
+        "href": "/dp/B0AAAA?ref=sr_1",
+        "price": "$1,299.00",
+        "rating": "4.6",
+        "review_count": "1,234",
+        "img_url": "https://m.media-amazon.com/a.jpg",
+    }
+    assert normalize_product(amazon_scraper.product_from_record(record)) == {
+        "title": "Laptop & Sleeve",
+        "price": 1299.0,
+        "rating": 4.6,
+        "url": "https://www.amazon.com/dp/B0AAAA?ref=sr_1",
+        "review_count": 1234,
+        "img_url": "https://m.media-amazon.com/a.jpg",
+    }
+
+
+def test_ebay_records_drop_placeholder_cards():
+    driver = MagicMock()
+    driver.execute_script.return_value = [
+        {"title": "Shop on eBay", "url": None, "price": "$20.00", "img_url": None},
+        {"title": "", "url": None, "price": None, "img_url": None},
+        {"title": "ThinkPad T14", "url": "https://www.ebay.com/itm/111", "price": "$1,049.50", "img_url": "x.jpg"},
+    ]
+    products = ebay_selenium_scraper.extract_products(driver)
+    assert [p["title"] for p in products] == ["Shop on eBay", "ThinkPad T14"]
+    assert products[1]["price"] == 1049.5
+    assert products[1]["rating"] == -1
+    script, selector = driver.execute_script.call_args.args
+    assert selector == ebay_selenium_scraper.CARD_SELECTOR
+    assert "querySelectorAll(arguments[0])" in script
+
+
+def test_extraction_failure_returns_none():
+    driver = MagicMock()
+    driver.execute_script.side_effect = Exception("javascript error")
+    assert amazon_scraper.extract_products(driver) is None
+    driver.execute_script.side_effect = None
+    driver.execute_script.return_value = None
+    assert amazon_scraper.extract_products(driver) is None
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_js_mode_skips_page_source(mock_chrome, amazon_config):
+    driver = mock_chrome.return_value
+    page_source = PropertyMock(return_value="<html></html>")
+    type(driver).page_source = page_source
+    driver.execute_script.return_value = [{"title": "Test Product", "href": "/dp/B1", "price": "$5.00"}]
+    scraper = AmazonSeleniumScraper({**amazon_config, "extraction": "js"})
+
+    products = scraper._scrape_loaded(1)
+    scraper.close()
+
+    assert products[0]["url"] == "https://www.amazon.com/dp/B1"
+    assert products[0]["price"] == 5.0
+    page_source.assert_not_called()
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_js_mode_falls_back_to_page_source(mock_chrome, ebay_config, sample_ebay_results_html):
+    driver = mock_chrome.return_value
+    driver.page_source = sample_ebay_results_html
+    driver.execute_script.side_effect = Exception("javascript error")
+    scraper = EbaySeleniumScraper({**ebay_config, "extraction": "js", "parser": "soup"})
+
+    products = scraper._scrape_loaded(1)
+    scraper.close()
+
+    assert "ThinkPad T14 – 16GB" in [p["title"] for p in products]
+
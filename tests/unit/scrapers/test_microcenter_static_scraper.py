@@ -11,9 +11,11 @@ def test_parse_returns_all_products(microcenter_config, sample_microcenter_produ
     assert len(products) == 1
     assert products[0]['title'] == "Sample Product"
     assert products[0]['price'] == 999.99
+    assert products[0]['rating'] == -1 and isinstance(products[0]['rating'], int)
+    assert products[0]['review_count'] == -1
     scraper.close()
 
-@patch("src.scrapers.static_scraper.requests.Session")
+@patch("src.scrapers.http_session.requests.Session")
 def test_fetch_success_and_headers(mock_session, microcenter_config):
     mock_resp = MagicMock()
     mock_resp.status_code = 200
@@ -25,15 +27,19 @@ def test_fetch_success_and_headers(mock_session, microcenter_config):
     assert "works" in html
     scraper.close()
 
-@patch("src.scrapers.static_scraper.requests.Session")
-def test_fetch_retries_and_fails(mock_session, microcenter_config):
+@patch("src.scrapers.static_scraper.time.sleep")
+@patch("src.scrapers.http_session.requests.Session")
+def test_fetch_retries_and_fails(mock_session, mock_sleep, microcenter_config):
     mock_resp = MagicMock()
     mock_resp.status_code = 500
+    mock_resp.headers = {}
     mock_session.return_value.get.return_value = mock_resp
 
-    scraper = MicroCenterStaticScraper(microcenter_config)
-    with pytest.raises(RuntimeError, match="Failed to fetch page after"):
+    scraper = MicroCenterStaticScraper({**microcenter_config, "max_retries": 3})
+    with pytest.raises(RuntimeError, match="Failed to fetch page after 3 attempts"):
         scraper.fetch("https://www.microcenter.com/search_results.aspx?N=4294967288")
+    assert mock_session.return_value.get.call_count == 3
+    assert mock_sleep.call_count == 2
     scraper.close()
 
 def test_parse_product_handles_missing_fields(microcenter_config):
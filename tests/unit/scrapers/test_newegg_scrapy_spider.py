@@ -27,7 +27,7 @@ def test_parse_price_invalid():
 
 
 def test_parse_rating():
-    assert parse_rating('rating-5') == 5
+    assert parse_rating('rating-5') == 5 and isinstance(parse_rating('rating-5'), int)
     assert parse_rating('rating-10 xyz') == 10
     assert parse_rating('notarating') is None
     assert parse_rating(None) is None
@@ -144,3 +144,16 @@ def test_scraper_fetch_and_scrape(monkeypatch):
     assert {"title": "Dummy"} in results
     mock_process.crawl.assert_called_once()
     mock_process.start.assert_called_once()
+
+
+def test_scraper_hands_the_runner_checkpoint_store_to_the_spider(monkeypatch):
+    config = {"base_url": "http://example.com", "categories": {"laptops": "/cat/laptops"}, "delay": 0}
+    store = MagicMock()
+    mock_process = MagicMock()
+    monkeypatch.setattr(
+        "src.scrapers.scrapy_crawler.newegg_crawler.spriders.newegg_scrapy.CrawlerProcess",
+        lambda settings: mock_process
+    )
+    NeweggScrapyScraper(config, checkpoint=store).scrape([])
+    assert mock_process.crawl.call_args.kwargs["checkpoint"] is store
+    assert NeweggSpider(start_urls=[], config={"checkpoint": {"enabled": True}}, results=[]).checkpoint is None
@@ -0,0 +1,71 @@
+import pytest
+
+from src.scrapers.normalize import (
+    normalize_product,
+    normalize_products,
+    parse_count_text,
+    parse_price_text,
+    parse_rating_text,
+)
+from src.scrapers.scrapy_crawler.newegg_crawler.spriders.newegg_scrapy import RATING_CLASS
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("$1,299.00", 1299.0),
+    ("€45.10", 45.1),
+    ("1.299,00 €", 1299.0),
+    ("12,50 €", 12.5),
+    ("1.299.000", 1299000.0),
+    ("CHF 1'299.90", 1299.9),
+    ("EUR 1 299,00", 1299.0),
+    ("1 299 999 Ft", 1299999.0),
+    ("$10.00 to $20.00", 10.0),
+    ("$10 - $20", 10.0),
+    ("US $5", 5.0),
+    ("$12.99 ($0.50/oz)", 12.99),
+    (" 199 .49", 199.0),
+    (19.99, 19.99),
+    (float("nan"), None),
+])
+def test_prices(raw, expected):
+    assert parse_price_text(raw) == (pytest.approx(expected) if expected is not None else None)
+
+
+@pytest.mark.parametrize("raw", ["abc", "", None, "Save %"])
+def test_unparseable_prices_are_none(raw):
+    assert parse_price_text(raw) is None
+
+
+def test_ratings_and_counts():
+    ratings = ["4.6 out of 5 stars", "4,5", "3.9", -1, None]
+    assert [parse_rating_text(v) for v in ratings] == [4.6, 4.5, 3.9, -1, None]
+    assert parse_rating_text("item-rating-v2 rating-4", RATING_CLASS) == 4.0
+    counts = ["(1,234)", "87", "1.2K", "2M", -1, "new", "1 234 ratings"]
+    assert [parse_count_text(v) for v in counts] == [1234, 87, 1200, 2000000, -1, None, 1234]
+
+
+def test_products_are_normalized_in_place():
+    products = [
+        {"title": "a", "price": "$1,049.50", "rating": "4.6", "review_count": "(1,234)"},
+        {"title": "b", "price": None, "review_count": -1},
+        {"title": "c", "price": "see price in cart"},
+    ]
+    assert normalize_products(products) is products
+    assert products[0] == {"title": "a", "price": 1049.5, "rating": 4.6, "review_count": 1234}
+    assert isinstance(products[0]["review_count"], int)
+    assert products[1] == {"title": "b", "price": None, "review_count": -1}
+    assert products[2]["price"] is None
+    assert "rating" not in products[1]
+
+
+def test_site_conventions_for_rating_type_and_unreadable_counts():
+    newegg = normalize_product({"rating": "rating-4"}, rating_pattern=RATING_CLASS, rating_type=int)
+    assert newegg["rating"] == 4 and isinstance(newegg["rating"], int)
+    amazon = normalize_products([{"review_count": "n/a"}, {"review_count": None}], unparsed_count=0)
+    assert [p["review_count"] for p in amazon] == [0, None]
+
+
+def test_normalize_product_returns_a_copy():
+    raw = {"price": "$5"}
+    assert normalize_product(raw) == {"price": 5.0}
+    assert raw == {"price": "$5"}
@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+from src.scrapers.page_archive import PageArchive, get_archive
+from src.scrapers.static_scraper import MicroCenterStaticScraper
+from tests.fixtures.scraper.microcenter_configs import microcenter_config
+from tests.fixtures.scraper.microcenter_html import sample_microcenter_product_html
+
+
+def test_write_and_read_back_by_offset(tmp_path):
+    archive = PageArchive(str(tmp_path))
+    first = archive.write("<html>one</html>", url="u1", source="amazon", category="laptops", page=1)
+    second = archive.write("<html>two ü</html>", url="u2", source="ebay", category="gpus", page=2)
+    assert first["segment"] == second["segment"] and second["offset"] == first["length"]
+
+    assert archive.read(second) == "<html>two ü</html>"
+    assert [(e["url"], html) for e, html in archive.iter_pages(source="amazon")] == [("u1", "<html>one</html>")]
+    assert [e["page"] for e in archive.iter_index(category="gpus")] == [2]
+
+
+def test_segments_roll_over(tmp_path):
+    archive = PageArchive(str(tmp_path), segment_max_bytes=1)
+    for i in range(3):
+        archive.write(f"<p>{i}</p>", url=f"u{i}", source="microcenter")
+    assert len(archive.segments()) == 3
+    assert [html for _, html in archive.iter_pages()] == ["<p>0</p>", "<p>1</p>", "<p>2</p>"]
+
+
+def test_get_archive_is_disabled_by_default(tmp_path):
+    assert get_archive(None) is None
+    assert get_archive({"enabled": False}) is None
+    config = {"enabled": True, "dir": str(tmp_path)}
+    assert get_archive(config) is get_archive(config)
+
+
+def test_scraper_archives_fetched_pages_with_category(tmp_path, microcenter_config, sample_microcenter_product_html):
+    config = {**microcenter_config, "category": "laptops", "archive": {"enabled": True, "dir": str(tmp_path)}}
+    scraper = MicroCenterStaticScraper(config)
+    scraper.fetch = MagicMock(return_value=sample_microcenter_product_html)
+    pages = list(scraper.iter_pages("https://www.microcenter.com/category/1", max_pages=1))
+    scraper.close()
+
+    assert len(pages[0][1]) == 1
+    (entry, html), = PageArchive(str(tmp_path)).iter_pages()
+    assert (entry["source"], entry["category"], entry["page"]) == ("microcenter", "laptops", 1)
+    assert html == sample_microcenter_product_html
@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from src.scrapers.selenium.page_state import (
+    BLOCK,
+    EMPTY,
+    ERROR,
+    RESULTS,
+    PageStateClassifier,
+    until_ready_or_dead_end,
+)
+from tests.fixtures.scraper.ebay_html import ebay_config
+
+
+def _classifier():
+    return PageStateClassifier(
+        "li.s-item",
+        block_selectors=["form[action*='captcha']"],
+        block_urls=["/splashui/captcha"],
+        block_phrases=["Please verify you are a human"],
+        empty_selectors=[".srp-save-null-search"],
+    )
+
+
+def _driver(url="https://www.ebay.com/sch/i.html?_nkw=tv", **probe):
+    driver = MagicMock(current_url=url)
+    driver.execute_script.return_value = {"cards": 0, "block": False, "empty": False, "phrase": None, **probe}
+    return driver
+
+
+def test_classifies_each_state_from_one_probe():
+    classifier = _classifier()
+    assert classifier.classify(_driver(cards=48)) == RESULTS
+    assert classifier.classify(_driver(block=True)) == BLOCK
+    assert classifier.classify(_driver(phrase="block")) == BLOCK
+    assert classifier.classify(_driver(empty=True)) == EMPTY
+    assert classifier.classify(_driver()) == ERROR
+    assert classifier.stats() == {RESULTS: 1, BLOCK: 2, EMPTY: 1, ERROR: 1}
+
+
+def test_block_url_short_circuits_the_probe():
+    driver = _driver(url="https://www.ebay.com/splashui/captcha?ap=1", cards=10)
+    assert _classifier().probe(driver) == BLOCK
+    driver.execute_script.assert_not_called()
+
+
+def test_probe_passes_lower_case_phrases_and_never_reads_page_source():
+    driver = _driver(cards=3)
+    page_source = PropertyMock()
+    type(driver).page_source = page_source
+    _classifier().probe(driver)
+    args = driver.execute_script.call_args.args
+    assert args[1:] == ("li.s-item", ["form[action*='captcha']"], [".srp-save-null-search"],
+                        ["please verify you are a human"], [])
+    page_source.assert_not_called()
+
+
+def test_failed_probe_is_an_error():
+    driver = _driver()
+    driver.execute_script.side_effect = Exception("no such window")
+    assert _classifier().probe(driver) == ERROR
+
+
+def test_wait_ends_early_on_block_page():
+    classifier = _classifier()
+    condition = until_ready_or_dead_end(lambda driver: False, classifier, every=0)
+    assert condition(_driver(block=True)) == BLOCK
+    assert condition.state == BLOCK
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_captcha_check_uses_the_classifier(mock_chrome, ebay_config):
+    mock_chrome.return_value = _driver(url="https://www.ebay.com/splashui/captcha?ap=1")
+    scraper = EbaySeleniumScraper(ebay_config)
+    assert scraper.is_captcha_page()
+    scraper.close()
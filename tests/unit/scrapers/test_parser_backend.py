@@ -0,0 +1,124 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.scrapers.parser_backend import get_backend, LxmlBackend, SoupBackend
+from src.scrapers.selenium.amazon_scraper import AmazonSeleniumScraper
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from src.scrapers.static_scraper import MicroCenterStaticScraper
+from tests.fixtures.scraper.amazon_configs import amazon_config
+from tests.fixtures.scraper.amazon_html import sample_amazon_product_html, sample_amazon_results_html
+from tests.fixtures.scraper.ebay_html import ebay_config, sample_ebay_results_html
+from tests.fixtures.scraper.microcenter_configs import microcenter_config
+from tests.fixtures.scraper.microcenter_html import sample_microcenter_product_html, sample_microcenter_results_html
+
+
+def parse_with(scraper_cls, config, html, backend):
+    scraper = scraper_cls({**config, "parser": backend})
+    try:
+        return scraper.parse(html)
+    finally:
+        scraper.close()
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+@pytest.mark.parametrize("fixture", ["sample_amazon_product_html", "sample_amazon_results_html"])
+def test_amazon_backends_produce_identical_products(mock_chrome, fixture, amazon_config, request):
+    html = request.getfixturevalue(fixture)
+    soup = parse_with(AmazonSeleniumScraper, amazon_config, html, "soup")
+    fast = parse_with(AmazonSeleniumScraper, amazon_config, html, "lxml")
+    assert fast == soup
+    assert soup
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_amazon_lxml_results_page(mock_chrome, amazon_config, sample_amazon_results_html):
+    products = parse_with(AmazonSeleniumScraper, amazon_config, sample_amazon_results_html, "lxml")
+    assert len(products) == 4
+    assert products[0] == {
+        'title': 'Laptop & Sleeve', 'price': 1299.0, 'rating': 4.6, 'url': 'https://www.amazon.com/dp/B0AAAA?ref=sr_1',
+        'review_count': 1234, 'img_url': 'https://m.media-amazon.com/a.jpg',
+    }
+    assert products[1]['title'] == 'Monitor27"' and products[1]['price'] == 199.49
+    assert products[1]['url'] == 'https://www.amazon.com/dp/B0BBBB'
+    assert products[2]['price'] == 45.10
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_ebay_backends_produce_identical_products(mock_chrome, ebay_config, sample_ebay_results_html):
+    soup = parse_with(EbaySeleniumScraper, ebay_config, sample_ebay_results_html, "soup")
+    fast = parse_with(EbaySeleniumScraper, ebay_config, sample_ebay_results_html, "lxml")
+    assert fast == soup
+    assert [p['title'] for p in fast] == ['Shop on eBay', 'ThinkPad T14 – 16GB', 'Dock']
+
+
+@pytest.mark.parametrize("fixture", ["sample_microcenter_product_html", "sample_microcenter_results_html"])
+def test_microcenter_backends_produce_identical_products(fixture, microcenter_config, request):
+    html = request.getfixturevalue(fixture)
+    soup = parse_with(MicroCenterStaticScraper, microcenter_config, html, "soup")
+    fast = parse_with(MicroCenterStaticScraper, microcenter_config, html, "lxml")
+    assert fast == soup
+    assert soup
+
+
+def test_lxml_text_matches_get_text():
+    html = "<div id='x'> a <!-- c --> b<script>var s=1</script><style>.a{}</style><b> t &amp; </b></div>"
+    soup, fast = SoupBackend(), LxmlBackend()
+    for strip in (True, False):
+        expected = soup.text(soup.select_one(soup.document(html), "#x"), strip=strip)
+        assert fast.text(fast.select_one(fast.document(html), "#x"), strip=strip) == expected
+
+
+def test_lxml_select_is_descendant_only():
+    backend = get_backend("lxml")
+    card = backend.select_one(backend.document("<div class='c'><div class='c'>inner</div></div>"), "div.c")
+    assert [backend.text(n) for n in backend.select(card, "div.c")] == ["inner"]
+    assert backend.select_one(card, "span") is None
+
+
+def test_get_backend_rejects_unknown_names():
+    assert get_backend(None).name == "lxml"
+    with pytest.raises(ValueError):
+        get_backend("html5lib")
+
+
+@pytest.mark.parametrize("backend", ["soup", "lxml"])
+def test_partial_cards_match_full_parse(backend, microcenter_config, sample_microcenter_results_html,
+                                        ebay_config, sample_ebay_results_html):
+    full = parse_with(MicroCenterStaticScraper, microcenter_config, sample_microcenter_results_html, backend)
+    partial = parse_with(MicroCenterStaticScraper, {**microcenter_config, "partial_parse": True},
+                         sample_microcenter_results_html, backend)
+    assert partial == full
+
+    with patch("src.scrapers.selenium.browser.webdriver.Chrome"):
+        full = parse_with(EbaySeleniumScraper, ebay_config, sample_ebay_results_html, backend)
+        partial = parse_with(EbaySeleniumScraper, {**ebay_config, "partial_parse": True},
+                             sample_ebay_results_html, backend)
+    assert partial == full
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+@pytest.mark.parametrize("backend", ["soup", "lxml"])
+def test_partial_amazon_cards_do_not_borrow_prices_from_neighbours(mock_chrome, backend, amazon_config,
+                                                                   sample_amazon_results_html):
+    full = parse_with(AmazonSeleniumScraper, amazon_config, sample_amazon_results_html, backend)
+    partial = parse_with(AmazonSeleniumScraper, {**amazon_config, "partial_parse": True},
+                         sample_amazon_results_html, backend)
+    assert partial[:3] == full[:3]
+    # a card without any price used to fall back to the first price on the whole results list
+    assert full[3]['price'] == 1299.0
+    assert partial[3]['price'] is None
+
+
+def test_iter_cards_streams_across_chunk_boundaries():
+    backend = get_backend("lxml")
+    html = "<html><body>" + "".join(f"<li class='s-item x'><span>{i}</span></li><li>skip</li>" for i in range(50)) \
+           + "</body></html>"
+    cards = list(backend.iter_cards(html, "li.s-item", chunk_size=7))
+    assert [backend.text(c) for c in cards] == [str(i) for i in range(50)]
+    assert all(backend.parent(c) is None for c in cards)
+
+
+def test_partial_cards_reject_complex_selectors():
+    with pytest.raises(ValueError):
+        get_backend("lxml").cards("<html></html>", "ul li.s-item", partial=True)
@@ -0,0 +1,105 @@
+from src.scrapers.base_scraper import BaseScraper
+from src.scrapers.seen_filter import SeenUrlFilter, get_seen_filter, reset_seen_runs, url_key
+
+
+class PagedScraper(BaseScraper):
+    def __init__(self, pages, seen):
+        self.pages = pages
+        self.seen = seen
+        self.fetched = []
+
+    def fetch(self, url):
+        pass
+
+    def parse(self, content):
+        pass
+
+    def iter_pages(self, url):
+        yield from self.skip_seen(self._walk_pages())
+
+    def _walk_pages(self):
+        for page, products in enumerate(self.pages, start=1):
+            self.fetched.append(page)
+            yield page, products
+
+
+def _page(*ids, price=10.0):
+    return [{"url": f"https://shop.test/p/{i}?qid=1700{i}&sr=8-{i}", "price": price} for i in ids]
+
+
+def test_url_key_drops_tracking_parts():
+    assert url_key("https://www.amazon.com/Laptop/dp/B0X/ref=sr_1_3?crid=AB&qid=17&th=1#reviews") == \
+        "https://www.amazon.com/Laptop/dp/B0X?th=1"
+    assert url_key("https://www.ebay.com/itm/123?hash=item1c&_trksid=p2") == "https://www.ebay.com/itm/123"
+
+
+def test_duplicates_across_categories_are_dropped(tmp_path):
+    seen = SeenUrlFilter(str(tmp_path / "shop.bloom"))
+    fresh, exhausted = seen.session().filter_page(_page(1, 2, 3))
+    assert len(fresh) == 3 and not exhausted
+    fresh, exhausted = seen.session().filter_page(_page(3, 4))
+    assert [p["url"] for p in fresh] == [_page(4)[0]["url"]]
+    assert not exhausted
+    assert seen.stats()["dropped_duplicates"] == 1
+
+    seen.reset_run()
+    fresh, _ = seen.session().filter_page(_page(3, 4))
+    assert len(fresh) == 2
+
+
+def test_next_run_stops_on_a_page_of_known_unchanged_products(tmp_path):
+    path = str(tmp_path / "shop.bloom")
+    pages = [_page(1, 2), _page(3, 4), _page(5, 6)]
+    first = PagedScraper(pages, SeenUrlFilter(path))
+    assert [p for p, _ in first.iter_pages("x")] == [1, 2, 3]
+    first.commit_seen()
+
+    pages[0] = _page(0, 1, 2)  # a new product on top, the rest unchanged
+    scraper = PagedScraper(pages, SeenUrlFilter(path))
+    assert [(p, len(items)) for p, items in scraper.iter_pages("x")] == [(1, 3), (2, 2)]
+    assert scraper.fetched == [1, 2]
+
+
+def test_price_change_is_not_known(tmp_path):
+    path = str(tmp_path / "shop.bloom")
+    session = SeenUrlFilter(path).session()
+    session.filter_page(_page(1, 2))
+    session.commit()
+    fresh, exhausted = SeenUrlFilter(path).session().filter_page(_page(1, 2, price=8.0))
+    assert len(fresh) == 2 and not exhausted
+
+
+def test_uncommitted_pages_leave_the_filter_untouched(tmp_path):
+    path = str(tmp_path / "shop.bloom")
+    pages = [_page(1, 2), _page(3, 4)]
+    failed = PagedScraper(pages, SeenUrlFilter(path))
+    assert [p for p, _ in failed.iter_pages("x")] == [1, 2]
+    failed.seen.save()  # nothing was committed, so nothing is written
+    assert not (tmp_path / "shop.bloom").exists()
+    assert "https://shop.test/p/1|10.0" not in failed.seen
+
+    # a retry in the same process, after the run was reset, scrapes every page again
+    failed.seen.reset_run()
+    retry = PagedScraper(pages, failed.seen)
+    assert [(p, len(items)) for p, items in retry.iter_pages("x")] == [(1, 2), (2, 2)]
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "shop.bloom"
+    path.write_bytes(b"garbage")
+    seen = SeenUrlFilter(str(path), capacity=1000)
+    assert "https://shop.test/p/1|10.0" not in seen
+    assert not seen.add("https://shop.test/p/1|10.0")
+    assert seen.add("https://shop.test/p/1|10.0")
+
+
+def test_registry_is_per_source_and_optional(tmp_path):
+    config = {"enabled": True, "dir": str(tmp_path)}
+    assert get_seen_filter("shop", config) is get_seen_filter("shop", config)
+    assert get_seen_filter("other", config) is not get_seen_filter("shop", config)
+    assert get_seen_filter("shop", {"enabled": False}) is None
+
+    get_seen_filter("shop", config).session().filter_page(_page(1))
+    reset_seen_runs()
+    fresh, _ = get_seen_filter("shop", config).session().filter_page(_page(1))
+    assert len(fresh) == 1
@@ -0,0 +1,77 @@
+from parsel import Selector
+
+from src.scrapers.scrapy_crawler.newegg_crawler.selector_resolver import SelectorResolver
+from src.scrapers.scrapy_crawler.newegg_crawler.spriders.newegg_scrapy import FIELD_SELECTORS, new_resolver, parse_page
+
+OLD_LAYOUT_CARD = """
+<div class="item-cell">
+    <a class="item-title" href="/p/{n}">Item {n}</a>
+    <li class="price-current"><strong>1,00{n}</strong><sup>.99</sup></li>
+    <a class="item-rating rating-4"></a><span class="item-rating-num">(1{n})</span>
+    <a class="item-img"><img data-src="/img/{n}.jpg"/></a>
+</div>
+"""
+NEW_LAYOUT_CARD = """
+<div data-testid="product-item">
+    <h3><a href="/p/{n}">Item {n}</a></h3>
+    <div class="price"><span class="price-main">{n}9</span><span class="price-decimal">50</span></div>
+    <img src="/img/{n}.png"/>
+</div>
+"""
+
+
+def naive_parse(html):
+    """The pre-resolver behaviour: every candidate in order, for every card."""
+    page = Selector(text=html)
+    cards = []
+    for selector in FIELD_SELECTORS["cards"]:
+        cards = page.css(selector)
+        if cards:
+            break
+    titles = []
+    for card in cards:
+        title = next((v for v in (card.css(s).get() for s in FIELD_SELECTORS["title"]) if v), None)
+        titles.append(title.strip() if title else None)
+    return titles
+
+
+def test_resolver_matches_first_match_semantics():
+    html = "<html><body>" + "".join(OLD_LAYOUT_CARD.format(n=n) for n in range(5)) + "</body></html>"
+    items = parse_page(html, "laptops", new_resolver())
+    assert [i["title"] for i in items] == naive_parse(html)
+    assert items[0]["price"] == 1000.99
+    assert items[0]["img_url"] == "/img/0.jpg"
+    assert items[0]["review_count"] == 10
+
+
+def test_layout_change_is_detected_and_remembered():
+    resolver = new_resolver()
+    old_html = "<html><body>" + "".join(OLD_LAYOUT_CARD.format(n=n) for n in range(3)) + "</body></html>"
+    new_html = "<html><body>" + "".join(NEW_LAYOUT_CARD.format(n=n) for n in range(4)) + "</body></html>"
+
+    parse_page(old_html, "gpus", resolver)
+    assert resolver.winners["cards"] == 0
+    items = parse_page(new_html, "gpus", resolver)
+
+    assert [i["title"] for i in items] == ["Item 0", "Item 1", "Item 2", "Item 3"]
+    assert items[1]["price"] == 19.5
+    assert items[1]["url"] == "/p/1"
+    assert resolver.selectors["title"][resolver.winners["title"]] == "h3 a::text"
+
+
+def test_single_odd_card_does_not_flip_the_winner():
+    resolver = SelectorResolver("test", {"price": [".a::text", ".b::text"]}, switch_after=3)
+    for _ in range(5):
+        assert resolver.first(Selector(text="<p class='a'>1</p>"), "price") == "1"
+    assert resolver.first(Selector(text="<p class='b'>2</p>"), "price") == "2"
+    assert resolver.winners["price"] == 0
+    for _ in range(3):
+        resolver.first(Selector(text="<p class='b'>2</p>"), "price")
+    assert resolver.winners["price"] == 1
+    assert resolver.stats["hit"] >= 4
+
+
+def test_missing_field_returns_none():
+    resolver = SelectorResolver("test", {"price": [".a::text", ".b::text"]})
+    assert resolver.first(Selector(text="<p class='c'>3</p>"), "price") is None
+    assert resolver.select(Selector(text="<p/>"), "price") == []
@@ -0,0 +1,209 @@
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.scrapers.selenium.driver_manager import DriverManager, close_driver_managers
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from src.scrapers.selenium.pagination import DriverPool, iter_fan_out, page_url, url_pagination_detected
+from tests.fixtures.scraper.ebay_html import ebay_config
+
+
+def test_page_url_sets_or_replaces_page_param():
+    assert page_url("https://www.amazon.com/s?k=laptops", "page", 3) == "https://www.amazon.com/s?k=laptops&page=3"
+    assert page_url("https://www.ebay.com/sch/i.html?_pgn=2&_nkw=tv", "_pgn", 5) == \
+        "https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=5"
+
+
+def test_url_pagination_detected_from_link_hrefs():
+    driver = MagicMock()
+    driver.execute_script.return_value = ["https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=2", ""]
+    assert url_pagination_detected(driver, "a.pagination__item", "_pgn")
+    driver.execute_script.return_value = ["javascript:void(0)"]
+    assert not url_pagination_detected(driver, "a.pagination__item", "_pgn")
+
+
+def test_fan_out_yields_in_page_order_and_runs_in_parallel():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def fetch(page):
+        with lock:
+            running.append(page)
+            peak.append(len(running))
+        time.sleep(0.05 if page == 2 else 0.01)
+        with lock:
+            running.remove(page)
+        return [{"title": f"p{page}"}]
+
+    pages = list(iter_fan_out(fetch, range(2, 8), workers=3))
+    assert [p for p, _ in pages] == [2, 3, 4, 5, 6, 7]
+    assert max(peak) > 1
+
+
+def test_fan_out_stops_at_first_empty_page_and_skips_failures():
+    requested = []
+
+    def fetch(page):
+        requested.append(page)
+        if page == 3:
+            raise RuntimeError("boom")
+        return [] if page == 5 else [{"title": "x"}]
+
+    pages = [p for p, _ in iter_fan_out(fetch, range(2, 50), workers=2)]
+    assert pages == [2, 4]
+    assert max(requested) < 10
+
+
+def test_fan_out_resolves_pages_handed_to_the_parse_pool():
+    parsed = {}
+    fetched_while_parsing = []
+
+    def fetch(page):
+        parsed[page] = Future()
+        if page != 2:
+            parsed[page].set_result([] if page == 4 else [{"title": f"p{page}"}])
+        return parsed[page]
+
+    def finish_page_2():
+        fetched_while_parsing.extend(sorted(parsed))
+        parsed[2].set_result([{"title": "p2"}])
+
+    timer = threading.Timer(0.2, finish_page_2)
+    timer.start()
+    pages = [(p, products[0]["title"]) for p, products in iter_fan_out(fetch, range(2, 50), workers=2)]
+    timer.join()
+    assert pages == [(2, "p2"), (3, "p3")]
+    # the second worker fetched page 3 while page 2 was still being parsed
+    assert fetched_while_parsing == [2, 3]
+
+
+def test_driver_pool_reuses_and_replaces_broken_drivers():
+    factory = MagicMock(side_effect=lambda cache_dir: MagicMock())
+    pool = DriverPool(factory, size=2)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    first.broken = True
+    pool.release(first)
+    first.driver.quit.assert_called_once()
+    second = pool.acquire()
+    assert second is not first
+    pool.release(second)
+    pool.close()
+    second.driver.quit.assert_called_once()
+    assert factory.call_count == 2
+
+
+def test_driver_pool_wakes_waiter_when_broken_driver_frees_a_slot():
+    pool = DriverPool(lambda cache_dir: MagicMock(), size=1)
+    first = pool.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    assert not acquired
+    first.broken = True
+    pool.release(first)
+    waiter.join(timeout=2)
+    assert acquired and acquired[0] is not first
+
+
+def test_driver_pool_frees_cache_slot_when_driver_fails_to_start():
+    slots = MagicMock()
+    slots.acquire.return_value = "/cache/slot-0"
+    pool = DriverPool(MagicMock(side_effect=RuntimeError("chrome crashed")), size=1, cache_slots=slots)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            pool.acquire()
+    assert slots.release.call_count == 2
+
+
+def test_driver_pool_leases_drivers_from_the_manager():
+    factory = MagicMock(side_effect=lambda profile_dir: MagicMock())
+    manager = DriverManager("site", factory, prespawn=0, max_idle=2, max_pages=2)
+    pool = DriverPool(MagicMock(), size=2, driver_manager=manager)
+    first = pool.acquire()
+    assert first.lease is not None and first.driver is first.lease.driver
+    driver = first.driver
+    pool.page_done(first)
+    assert first.driver is driver
+    pool.page_done(first)  # over the page budget: swapped for another managed driver
+    assert first.driver is not driver
+    pool.release(first)
+    broken = pool.acquire()
+    broken.broken = True
+    pool.release(broken)
+    assert manager.stats()["recycled:broken"] == 1
+    kept = pool.acquire()
+    pool.release(kept)
+    pool.close()
+    # handed back warm instead of quit
+    assert not kept.driver.quit.called
+    assert manager.stats()["idle"] == 1
+    pool.factory.assert_not_called()
+    manager.close()
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_managed_scraper_pools_managed_drivers(mock_chrome, ebay_config):
+    config = {**ebay_config, "driver_manager": {"enabled": True, "prespawn": 0}}
+    try:
+        scraper = EbaySeleniumScraper(config)
+        assert scraper.driver_pool().driver_manager is scraper.driver_manager
+        scraper.close()
+    finally:
+        close_driver_managers()
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_ebay_fans_out_page_urls_on_pooled_drivers(mock_chrome, ebay_config):
+    visited = []
+    drivers = []
+
+    def new_driver(options):
+        driver = MagicMock()
+        driver.execute_script.return_value = ["https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=2"]
+        driver.get.side_effect = lambda url: (visited.append(url), setattr(driver, "current_url", url))
+        drivers.append(driver)
+        return driver
+
+    mock_chrome.side_effect = new_driver
+    scraper = EbaySeleniumScraper({**ebay_config, "max_pages": 4, "pagination": {"pool_size": 2}})
+    scraper.wait_for_products = MagicMock(return_value=True)
+    scraper.parse = MagicMock(return_value=[{"title": "x"}])
+
+    pages = [page for page, _ in scraper.iter_pages("https://www.ebay.com/sch/i.html?_nkw=tv")]
+    scraper.close()
+
+    assert pages == [1, 2, 3, 4]
+    assert sorted(visited) == sorted([
+        "https://www.ebay.com/sch/i.html?_nkw=tv",
+        "https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=2",
+        "https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=3",
+        "https://www.ebay.com/sch/i.html?_nkw=tv&_pgn=4",
+    ])
+    assert len(drivers) <= 3
+    assert all(d.quit.called for d in drivers)
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_ebay_falls_back_to_clicking_next(mock_chrome, ebay_config):
+    driver = mock_chrome.return_value
+    driver.execute_script.return_value = []
+    scraper = EbaySeleniumScraper({**ebay_config, "max_pages": 3})
+    scraper.wait_for_products = MagicMock(return_value=True)
+    scraper.parse = MagicMock(return_value=[{"title": "x"}])
+    clicks = iter([True, False])
+    in_flight = []
+    scraper._click_next = MagicMock(side_effect=lambda: in_flight.append(scraper.concurrency.in_flight) or next(clicks))
+
+    pages = [page for page, _ in scraper.iter_pages("https://www.ebay.com/sch/i.html?_nkw=tv")]
+    scraper.close()
+
+    assert pages == [1, 2]
+    # the click fires the page request, so it runs inside an in-flight slot
+    assert in_flight == [1, 1]
+    driver.get.assert_called_once_with("https://www.ebay.com/sch/i.html?_nkw=tv")
+    assert scraper._pool is None
@@ -0,0 +1,70 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common import StaleElementReferenceException
+
+from src.scrapers.selenium.waits import Politeness, page_changed, ready_condition, results_stable
+
+
+def _driver_with_counts(*counts):
+    driver = MagicMock()
+    driver.execute_script.side_effect = list(counts)
+    return driver
+
+
+def test_results_stable_waits_for_count_to_settle():
+    condition = results_stable("li.s-item", settle=0)
+    driver = _driver_with_counts(0, 12, 30, 30)
+    assert condition(driver) is False  # first observation
+    assert condition(driver) is False  # still growing
+    assert condition(driver) is False
+    assert condition(driver) == 30
+
+
+def test_results_stable_never_ready_on_empty_page():
+    condition = results_stable("li.s-item", settle=0)
+    driver = _driver_with_counts(0, 0, 0)
+    assert not any(condition(driver) for _ in range(3))
+
+
+def test_network_idle_requires_quiet_network_and_results():
+    condition = ready_condition("li.s-item", {"ready": "network_idle", "idle": 0, "settle": 0})
+    driver = MagicMock()
+    driver.execute_script.side_effect = [
+        [5, "interactive"], 10,
+        [9, "complete"], 10,
+        [9, "complete"], 10,
+    ]
+    assert condition(driver) is False
+    assert condition(driver) is False
+    assert condition(driver) == 10
+
+
+def test_unknown_readiness_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        ready_condition("li.s-item", {"ready": "sleep"})
+
+
+def test_page_changed_when_marker_goes_stale():
+    marker = MagicMock()
+    condition = page_changed(marker, "https://x/?page=1")
+    assert condition(MagicMock()) is False
+    marker.is_enabled.side_effect = StaleElementReferenceException()
+    assert condition(MagicMock()) is True
+
+
+def test_page_changed_falls_back_to_url():
+    driver = MagicMock(current_url="https://x/?page=1")
+    condition = page_changed(None, "https://x/?page=1")
+    assert condition(driver) is False
+    driver.current_url = "https://x/?page=2"
+    assert condition(driver) is True
+
+
+@patch("src.scrapers.selenium.waits.time.sleep")
+def test_politeness_only_sleeps_the_remaining_interval(mock_sleep):
+    politeness = Politeness(delay=2)
+    with patch("src.scrapers.selenium.waits.time.monotonic", side_effect=[100.0, 100.0, 101.5, 102.0]):
+        assert politeness.wait() == 0.0
+        assert politeness.wait() == pytest.approx(0.5)
+    mock_sleep.assert_called_once_with(pytest.approx(0.5))
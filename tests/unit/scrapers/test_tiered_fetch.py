@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper, parse_page
+from src.scrapers.selenium.tiered_fetch import TieredFetcher
+from tests.fixtures.scraper.ebay_html import ebay_config, sample_ebay_results_html
+
+
+def _response(html, status=200, url="https://www.ebay.com/sch/i.html?_nkw=tv"):
+    return MagicMock(status_code=status, text=html, url=url)
+
+
+def _fetcher(**kwargs):
+    options = dict(block_urls=["/splashui/captcha"], block_phrases=["Please verify you are a human"],
+                   empty_phrases=["no exact matches found"], min_cards=2)
+    options.update(kwargs)
+    return TieredFetcher("ebay", parse_page, **options)
+
+
+def test_check_accepts_server_rendered_pages(sample_ebay_results_html):
+    products, reason = _fetcher().check(200, "https://www.ebay.com/sch/i.html", sample_ebay_results_html)
+    assert reason is None
+    assert products == parse_page(sample_ebay_results_html)
+    assert len(products) == 3
+
+
+def test_check_escalates_incomplete_pages(sample_ebay_results_html):
+    fetcher = _fetcher()
+    assert fetcher.check(503, "https://x", sample_ebay_results_html) == (None, "status_503")
+    assert fetcher.check(200, "https://www.ebay.com/splashui/captcha?ap=1", "<html/>") == (None, "blocked")
+    assert fetcher.check(200, "https://x", "<p>Please verify you are a human</p>") == (None, "blocked")
+    assert fetcher.check(200, "https://x", "<ul></ul>") == (None, "few_cards")
+    assert _fetcher(min_priced=1).check(200, "https://x", sample_ebay_results_html.replace(
+        "<span class='s-item__price'>$30.00 to $45.00</span>", "")) == (None, "no_prices")
+    assert fetcher.check(200, "https://x", "<p>No exact matches found</p>") == ([], None)
+
+
+def test_fetch_records_tier_hit_rates(sample_ebay_results_html):
+    fetcher = _fetcher()
+    fetcher.session.get = MagicMock(side_effect=[_response(sample_ebay_results_html), _response("", status=429)])
+    browser = MagicMock(return_value=[{"title": "from browser"}])
+
+    assert len(fetcher.fetch("https://www.ebay.com/sch/i.html?_pgn=1", browser)) == 3
+    assert fetcher.fetch("https://www.ebay.com/sch/i.html?_pgn=2", browser) == [{"title": "from browser"}]
+    browser.assert_called_once()
+    assert fetcher.stats() == {"http": 1, "browser": 1, "escalated:status_429": 1, "http_rate": 0.5}
+
+
+def test_http_tier_is_skipped_after_repeated_escalations():
+    fetcher = _fetcher(give_up_after=2)
+    fetcher.session.get = MagicMock(return_value=_response("<html/>", status=403))
+    for _ in range(4):
+        fetcher.fetch("https://x", lambda: [])
+    assert fetcher.session.get.call_count == 2
+    assert fetcher.stats()["browser"] == 4
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_scraper_pages_over_http_without_a_driver_pool(mock_chrome, ebay_config, sample_ebay_results_html):
+    config = {**ebay_config, "max_pages": 3, "tiered_fetch": {"enabled": True, "min_cards": 2}}
+    scraper = EbaySeleniumScraper(config)
+    scraper.tiered.session.get = MagicMock(side_effect=[
+        _response(sample_ebay_results_html), _response(sample_ebay_results_html), _response("<ul></ul>")])
+    scraper._scrape_page_url = MagicMock(return_value=[])
+
+    pages = [(page, len(items)) for page, items in scraper.iter_pages("https://www.ebay.com/sch/i.html?_nkw=tv")]
+
+    assert pages == [(1, 3), (2, 3)]
+    assert scraper.tiered.session.get.call_args_list[1].args[0].endswith("_pgn=2")
+    scraper._scrape_page_url.assert_called_once()
+    assert scraper._pool is None
+    scraper.close()
+    mock_chrome.assert_not_called()
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+import src.utils.concurrency as concurrency_mod
+from src.utils.concurrency import AdaptiveConcurrencyController, get_controller
+
+
+def test_additive_increase_on_healthy_responses():
+    ctrl = AdaptiveConcurrencyController("site", initial=2, max_limit=4)
+    for _ in range(20):
+        ctrl.record(0.1, status=200)
+    assert ctrl.current_limit == 4
+    assert ctrl.successes == 20
+
+
+@pytest.mark.parametrize("status,error", [(429, False), (503, False), (None, True)])
+def test_multiplicative_decrease_on_congestion(status, error):
+    ctrl = AdaptiveConcurrencyController("site", initial=8, max_limit=8)
+    ctrl.record(0.1, status=status, error=error)
+    assert ctrl.current_limit == 4
+    assert ctrl.errors == 1
+
+
+def test_slow_responses_count_as_congestion():
+    ctrl = AdaptiveConcurrencyController("site", initial=8, max_limit=8, latency_target=1.0)
+    ctrl.record(5.0, status=200)
+    assert ctrl.current_limit == 4
+
+
+def test_limit_never_drops_below_min():
+    ctrl = AdaptiveConcurrencyController("site", initial=2, min_limit=1)
+    for _ in range(5):
+        ctrl._last_decrease = 0.0
+        ctrl.record(0.0, status=500)
+    assert ctrl.current_limit == 1
+
+
+def test_request_context_records_exceptions_and_releases_slot():
+    ctrl = AdaptiveConcurrencyController("site", initial=4, max_limit=4)
+    with pytest.raises(RuntimeError):
+        with ctrl.request():
+            assert ctrl.in_flight == 1
+            raise RuntimeError("timeout")
+    assert ctrl.in_flight == 0
+    assert ctrl.errors == 1
+    assert ctrl.current_limit == 2
+
+
+def test_acquire_blocks_at_limit():
+    ctrl = AdaptiveConcurrencyController("site", initial=1, max_limit=1)
+    ctrl.acquire()
+    acquired = threading.Event()
+
+    def second():
+        ctrl.acquire()
+        acquired.set()
+
+    t = threading.Thread(target=second)
+    t.start()
+    assert not acquired.wait(0.1)
+    ctrl.release()
+    assert acquired.wait(1)
+    t.join()
+
+
+def test_get_controller_is_shared_per_source(monkeypatch):
+    monkeypatch.setattr(concurrency_mod, "_controllers", {})
+    first = get_controller("amazon", {"initial": 3, "max": 6})
+    assert get_controller("amazon") is first
+    assert first.current_limit == 3
+    assert first.max_limit == 6
+    assert get_controller("ebay") is not first
@@ -0,0 +1,135 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.scrapers.scrapy_crawler.newegg_crawler.middlewares import CircuitBreakerMiddleware
+from src.scrapers.selenium.ebay_selenium_scraper import EbaySeleniumScraper
+from src.utils.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, backoff_delay, get_breaker, \
+    parse_retry_after
+from tests.fixtures.scraper.ebay_html import ebay_config
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(3, base=1.0, cap=5.0) for _ in range(200)]
+    assert all(0 <= d <= 5.0 for d in delays)
+    assert len(set(delays)) > 100
+    assert all(backoff_delay(1, base=1.0, cap=60, retry_after=10) >= 10 for _ in range(20))
+    assert backoff_delay(1, base=1.0, cap=5, retry_after=3600) == 5
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(b"7") == 7.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=30), usegmt=True), now=now) == 30.0
+    assert parse_retry_after(format_datetime(now - timedelta(seconds=30), usegmt=True), now=now) == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_breaker_opens_when_failures_spike():
+    breaker = CircuitBreaker("site", failure_threshold=3, cooldown=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.admit() == 0
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.admit() == pytest.approx(30, abs=1)
+    assert breaker.snapshot()["trips"] == 1
+
+
+def test_breaker_lets_one_probe_through_after_cooldown():
+    breaker = CircuitBreaker("site", failure_threshold=1, cooldown=0.05, max_cooldown=1)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.admit() == 0
+    assert breaker.state == HALF_OPEN
+    assert breaker.admit() > 0  # the probe is still in flight
+
+    breaker.record_failure()
+    assert breaker.state == OPEN and breaker.cooldown == 0.1
+
+    time.sleep(0.11)
+    assert breaker.admit() == 0
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.cooldown == 0.05
+    assert breaker.admit() == 0
+
+
+def test_retry_after_pauses_the_domain_without_tripping():
+    breaker = CircuitBreaker("site", failure_threshold=5)
+    breaker.record_failure(retry_after=20)
+    assert breaker.state == CLOSED
+    assert breaker.admit() == pytest.approx(20, abs=1)
+
+
+def test_open_breaker_pauses_every_worker():
+    breaker = CircuitBreaker("site", failure_threshold=1, cooldown=0.2)
+    breaker.record_failure()
+    waited = []
+    workers = [threading.Thread(target=lambda: waited.append(breaker.wait())) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.25)
+    breaker.record_success()
+    for worker in workers:
+        worker.join(2)
+    assert len(waited) == 3
+    assert all(w >= 0.15 for w in waited)
+
+
+def test_breakers_are_shared_per_domain():
+    breaker = get_breaker("https://shop.example.org/s?k=1", {"failure_threshold": 2})
+    assert get_breaker("shop.example.org") is breaker
+    assert get_breaker("http://shop.example.org/other") is breaker
+    assert breaker.failure_threshold == 2
+    assert get_breaker("https://other.example.org/") is not breaker
+
+
+@patch("src.scrapers.selenium.ebay_selenium_scraper.time.sleep")
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_selenium_fetch_backs_off_and_keeps_a_live_driver(mock_chrome, mock_sleep, ebay_config):
+    config = {**ebay_config, "base_url": "https://fetch.example.org",
+              "resilience": {"failure_threshold": 10, "backoff_cap": 4}}
+    scraper = EbaySeleniumScraper(config)
+    driver = scraper.driver
+    driver.get.side_effect = [TimeoutError("slow"), None]
+    scraper.wait_for_products = MagicMock(return_value=True)
+    scraper.is_captcha_page = MagicMock(return_value=False)
+
+    assert scraper.fetch("https://fetch.example.org/sch", retries=2) is driver.page_source
+    assert scraper.driver is driver
+    assert mock_chrome.call_count == 1
+    assert 0 <= mock_sleep.call_args.args[0] <= 4
+    assert scraper.breaker.state == CLOSED
+
+
+@patch("src.scrapers.selenium.browser.webdriver.Chrome")
+def test_selenium_page_load_errors_count_against_the_domain(mock_chrome, ebay_config):
+    config = {**ebay_config, "base_url": "https://load.example.org", "resilience": {"failure_threshold": 1}}
+    scraper = EbaySeleniumScraper(config)
+    scraper.driver.get.side_effect = TimeoutError("slow")
+    errors = scraper.concurrency.snapshot()["errors"]
+
+    with pytest.raises(TimeoutError):
+        scraper._load("https://load.example.org/sch")
+    assert scraper.breaker.state == OPEN
+    assert scraper.concurrency.snapshot()["errors"] == errors + 1
+    scraper.close()
+
+
+def test_scrapy_middleware_records_responses():
+    middleware = CircuitBreakerMiddleware()
+    spider = MagicMock(config={"resilience": {"failure_threshold": 2}})
+    request = MagicMock(url="https://scrapy.example.org/p/pl?d=gpu")
+    response = MagicMock(status=429, headers={"Retry-After": b"15"})
+
+    assert middleware.process_response(request, response, spider) is response
+    breaker = get_breaker(request.url)
+    assert breaker.admit() == pytest.approx(15, abs=1)
+    middleware.process_exception(request, TimeoutError(), spider)
+    assert breaker.state == OPEN